@@ -1,12 +1,37 @@
-from fastapi import FastAPI, Body
+# Thread budget must be in place before numpy/torch create their pools
+from runtime_config import configure_runtime, runtime_settings
+configure_runtime()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Body, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import Optional
-from core import recommend_issues, cache, clear_profile_embeddings_cache, clear_reference_embeddings_cache
+from typing import List, Optional
+import os
+from core import recommend_issues, cache, issue_cache, result_windows, profile_cache_stats, shadow_scorer, repo_health, repo_catalog, issue_index, clear_profile_embeddings_cache, clear_reference_embeddings_cache
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.encoders import jsonable_encoder
+from fastapi.middleware.gzip import GZipMiddleware
+from fast_json import FastJSONResponse, select_fields
+from result_windows import RESULT_WINDOW_PAGES
+from deadlines import Deadline, RECOMMEND_DEADLINE_MS
+from repo_health import CircuitOpenError, GITHUB_CIRCUIT
+from warmup import WarmUp, WARMUP_ENABLED, default_steps
+
 
+warmup = WarmUp()
 
-app = FastAPI(title="GitHub Issues Recommendation API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global warmup
+    if WARMUP_ENABLED:
+        # Runs in the background so /health and /ready answer while models load
+        warmup = WarmUp(default_steps())
+        warmup.start()
+    else:
+        warmup.run()  # nothing to do, ready at once
+    yield
+
+app = FastAPI(title="GitHub Issues Recommendation API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,34 +41,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses for clients that send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("RESPONSE_GZIP_MIN_SIZE", "1000")))
+
 class RecommendRequest(BaseModel):
     language: Optional[str] = "all"
     per_page: Optional[int] = 20
     top_n: Optional[int] = 100
     student_profile: Optional[str] = None
-    model: Optional[str] = "intfloat/multilingual-e5-base"
+    model: Optional[str] = "intfloat/multilingual-e5-base"  # candidate for shadow scoring; results always come from the serving model
     use_phi: Optional[bool] = False  # Whether to use Phi predictor instead of embeddings
+    rerank: Optional[bool] = None  # Cross-encoder rerank of the top candidates (default: RERANK_ENABLED)
+    cursor: Optional[str] = None  # next_cursor from a previous response; other fields except per_page/fields are ignored
+    fields: Optional[List[str]] = None  # e.g. ["title", "repo", "url", "similarity"]; default: all fields
+    deadline_ms: Optional[float] = None  # latency budget; partial results are returned when it runs out (default: RECOMMEND_DEADLINE_MS)
 
 @app.post("/recommend")
 def recommend(req: RecommendRequest):
-    issues = recommend_issues(
-        per_page=req.per_page,
-        top_n=req.top_n,
-        student_profile=req.student_profile,
-        # model_name="",
-        use_phi=True,
-    )
-    return {"recommendations": jsonable_encoder(issues)}
+    if req.cursor:
+        page = result_windows.read(req.cursor, req.per_page)
+        if page is None:
+            raise HTTPException(status_code=410, detail="Cursor expired or invalid, start a new recommendation")
+        issues, next_cursor, partial = page
+        return FastJSONResponse({"recommendations": select_fields(issues, req.fields), "next_cursor": next_cursor,
+                                 "partial": partial})
+
+    deadline = Deadline(RECOMMEND_DEADLINE_MS if req.deadline_ms is None else req.deadline_ms)
+    # Only one page of issues is fetched; extra ranked candidates fill the window for later pages
+    try:
+        issues = recommend_issues(
+            per_page=req.per_page,
+            window=req.per_page * RESULT_WINDOW_PAGES,
+            top_n=req.top_n,
+            student_profile=req.student_profile,
+            use_phi=True,
+            rerank=req.rerank,
+            shadow_model=req.model,
+            deadline=deadline,
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"GitHub is unavailable, retry later ({e})")
+    issues, next_cursor = result_windows.open(issues, req.per_page, deadline.partial)
+    return FastJSONResponse({"recommendations": select_fields(issues, req.fields), "next_cursor": next_cursor,
+                             "partial": deadline.partial})
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "runtime": runtime_settings()}
+
+@app.get("/ready")
+def ready():
+    """Warm-up progress; 200 only once models and reference matrices are loaded."""
+    snapshot = warmup.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+@app.get("/shadow/stats")
+def shadow_stats():
+    """Encode latency per embedding model and ranking agreement of the shadow candidate."""
+    return shadow_scorer.snapshot()
 
 @app.delete("/cache/clear")
 def clear_cache():
     """Clear all cached data (issues and profile embeddings)."""
     try:
         cache.clear()
+        issue_cache.clear_memory()
         return {"status": "All cache cleared successfully"}
     except Exception as e:
         return {"status": "Failed to clear cache", "error": str(e)}
@@ -71,13 +133,20 @@ def cache_stats():
     """Get detailed cache statistics."""
     try:
         total_items = len(cache)
-        profile_items = len([k for k in cache.keys() if isinstance(k, str) and k.startswith("profile_embedding_")])
-        issue_items = len([k for k in cache.keys() if isinstance(k, str) and k.startswith("issues_")])
+        keys = [k for k in cache.iterkeys() if isinstance(k, str)]
+        profile_items = len([k for k in keys if k.startswith("profile_embedding_")])
+        issue_items = len([k for k in keys if k.startswith("issues_")])
         
         return {
             "total_cache_size": total_items,
             "profile_embeddings_cached": profile_items,
             "issue_caches": issue_items,
+            "issue_cache_hits": issue_cache.stats,
+            "profile_embeddings": profile_cache_stats.snapshot(),
+            "repo_health": repo_health.snapshot(),
+            "github_circuit": GITHUB_CIRCUIT.snapshot(),
+            "repo_catalog": repo_catalog.stats(),
+            "issue_index": issue_index.stats(),
             "cache_location": "/tmp/github_issues_cache"
         }
     except Exception as e:
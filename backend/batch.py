@@ -0,0 +1,177 @@
+"""
+Offline batch scoring: recommendations for many profiles in one run.
+
+    python main.py batch profiles.jsonl --output recommendations.jsonl --processes 4
+
+Profiles are read lazily from a JSONL file (one {"id", "profile", optional
+"language" and "per_page"} object per line) or from a directory (one profile
+per file, id = file name without extension), and streamed through the pipeline
+in batches. Each process loads the embedding model once and encodes the
+uncached profiles of a batch in a single call before ranking them one by one.
+Issue corpora are shared between profiles: the first profile of a language and
+level fills the issue cache and the issue index, and the following ones are
+answered from them. With --processes N, batches are scored by N worker
+processes, each with its own share of the CPU; results are still written in
+input order, one JSON line per profile.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "32"))  # profiles encoded together per model call
+BATCH_MAX_PENDING = 2  # batches queued per worker process
+
+_options: Dict = {}
+
+
+def read_profiles(source: str) -> Iterator[Dict]:
+    """Yield {"id", "profile", ...} records from a JSONL file or a directory of profile files."""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if not os.path.isfile(path) or name.startswith("."):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                yield {"id": os.path.splitext(name)[0], "profile": f.read().strip()}
+        return
+
+    with open(source, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"id": str(line_number), "error": f"Invalid JSON: {e}"}
+                continue
+            if isinstance(record, str):
+                record = {"profile": record}
+            elif not isinstance(record, dict):
+                yield {"id": str(line_number), "error": "Expected an object or string"}
+                continue
+            record.setdefault("id", str(line_number))
+            yield record
+
+
+def batched(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Consecutive lists of up to size records, read lazily."""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def requested_processes(argv: List[str]) -> int:
+    """Worker processes asked for on a batch command line (1 otherwise), before full parsing."""
+    if argv[:1] != ["batch"]:
+        return 1
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--processes", "-j", type=int, default=1)
+    args, _ = parser.parse_known_args(argv[1:])
+    return max(1, args.processes)
+
+
+def init_worker(options: Dict) -> None:
+    """Set the scoring options of this process and load the model once."""
+    from core import create_embedding_model
+
+    _options.clear()
+    _options.update(options)
+    try:
+        create_embedding_model(options["model_name"])
+    except Exception as e:
+        # An initializer that raises makes the pool restart workers forever; score_batch reports it per profile
+        print(f"⚠️ Failed to load model {options['model_name']}: {e}")
+
+
+def score_batch(batch: List[Dict]) -> List[Dict]:
+    """Recommendations for one batch of profile records, in order."""
+    from core import create_embedding_model, precompute_student_embeddings, recommend_issues
+
+    model_name = _options["model_name"]
+    texts = [record["profile"] for record in batch if record.get("profile") and "error" not in record]
+    try:
+        if texts:
+            precompute_student_embeddings(texts, create_embedding_model(model_name), model_name)
+    except Exception as e:
+        # Each profile is still encoded on its own below
+        print(f"⚠️ Batch encoding failed: {e}")
+
+    results = []
+    for record in batch:
+        if "error" in record:
+            results.append({"id": record["id"], "error": record["error"]})
+            continue
+        if not record.get("profile"):
+            results.append({"id": record["id"], "error": "Empty profile"})
+            continue
+        try:
+            recommendations = recommend_issues(
+                language=record.get("language", _options["language"]),
+                per_page=int(record.get("per_page", _options["per_page"])),
+                top_n=_options["top_n"],
+                student_profile=record["profile"],
+                model_name=model_name,
+            )
+            results.append({"id": record["id"], "recommendations": recommendations})
+        except Exception as e:
+            print(f"⚠️ Failed to score profile {record['id']}: {e}")
+            results.append({"id": record["id"], "error": str(e)})
+    return results
+
+
+def score_profiles(records: Iterable[Dict], options: Dict, processes: int = 1,
+                   batch_size: int = BATCH_SIZE) -> Iterator[Dict]:
+    """Stream results for records in input order, scoring batches in this process or in a worker pool."""
+    batches = batched(records, batch_size)
+    if processes <= 1:
+        init_worker(options)
+        for batch in batches:
+            yield from score_batch(batch)
+        return
+
+    # spawn: workers start without the parent's threads and load their own model
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes, initializer=init_worker, initargs=(options,)) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.apply_async(score_batch, (batch,)))
+            # Only a few batches in flight, so large inputs are never read into memory at once
+            if len(pending) >= processes * BATCH_MAX_PENDING:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="main.py batch", description="Score many student profiles and write recommendations as JSONL.")
+    parser.add_argument("input", help="JSONL file of {\"id\", \"profile\"} objects, or a directory with one profile per file")
+    parser.add_argument("--output", "-o", required=True, help="JSONL file to write one result per profile to")
+    parser.add_argument("--language", "-l", default="all", help="Programming language when a profile does not set one (default: detect)")
+    parser.add_argument("--per-page", "-n", type=int, default=20, help="Issues per profile when a profile does not set per_page (default: 20)")
+    parser.add_argument("--top-n", type=int, default=100, help="Number of top repositories by stars to search (default: 100)")
+    parser.add_argument("--model", "-m", type=str, default="all-MiniLM-L6-v2", help="SentenceTransformer model name (default: all-MiniLM-L6-v2)")
+    parser.add_argument("--processes", "-j", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"Profiles encoded together (default: {BATCH_SIZE})")
+    args = parser.parse_args(argv)
+
+    from fast_json import dumps
+
+    options = {"language": args.language, "per_page": args.per_page, "top_n": args.top_n, "model_name": args.model}
+    start = time.time()
+    scored = failed = 0
+    with open(args.output, "wb") as out:
+        for result in score_profiles(read_profiles(args.input), options, max(1, args.processes), max(1, args.batch_size)):
+            out.write(dumps(result) + b"\n")
+            scored += 1
+            failed += "error" in result
+    print(f"✅ Scored {scored} profiles ({failed} failed) in {time.time() - start:.1f}s -> {args.output}")
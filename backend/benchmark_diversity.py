@@ -0,0 +1,75 @@
+"""
+Benchmark: diversity-aware selection (MMR + per-repo quota) at corpus scale.
+
+Times plain top-k, MMR over a relevance pool (what recommend_issues uses) and
+exact MMR over the whole corpus, on random normalized embeddings with
+clustered near-duplicates, and reports how many repos / near-duplicates the
+selected page contains.
+
+    python benchmark_diversity.py --n 10000 --k 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from diversity import diverse_top_k, normalize_rows
+from reranker import recall_top_k
+
+
+def make_corpus(n: int, dim: int, repos: int, seed: int = 0):
+    """Random embeddings where every 5 issues are near-duplicates of each other."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n // 5 + 1, dim)).astype(np.float32)
+    embeddings = normalize_rows(np.repeat(centers, 5, axis=0)[:n] + 0.05 * rng.standard_normal((n, dim)).astype(np.float32))
+    relevance = (embeddings @ normalize_rows(rng.standard_normal((1, dim)))[0]).astype(np.float32)
+    # Popular repos contribute most issues, like the greedy per-repo fill does
+    repo_of = np.minimum(rng.zipf(1.5, n), repos) - 1
+    return embeddings, relevance, repo_of
+
+
+def _page_stats(picks, embeddings, repo_of):
+    chosen = embeddings[list(picks)]
+    sims = chosen @ chosen.T
+    near_dupes = int(((sims > 0.9).sum() - len(picks)) // 2)
+    return len({int(repo_of[i]) for i in picks}), near_dupes
+
+
+def time_it(fn, repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MMR selection.")
+    parser.add_argument("--n", type=int, default=10_000, help="Corpus size")
+    parser.add_argument("--k", type=int, default=20, help="Page size")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--repos", type=int, default=200, help="Distinct repositories")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    embeddings, relevance, repo_of = make_corpus(args.n, args.dim, args.repos)
+    group_of = lambda i: int(repo_of[i])
+
+    runs = {
+        "top-k (no diversity)": lambda: recall_top_k(relevance, args.k),
+        "MMR, pooled (default)": lambda: diverse_top_k(embeddings, relevance, args.k, group_of=group_of,
+                                                       normalized=True),
+        "MMR, full corpus": lambda: diverse_top_k(embeddings, relevance, args.k, group_of=group_of,
+                                                  pool_factor=0, normalized=True),
+    }
+
+    print(f"n={args.n}, k={args.k}, dim={args.dim}, repos={args.repos}")
+    print(f"{'selection':<24} {'ms/call':>8} {'repos':>6} {'near-dupe pairs':>16}")
+    for name, fn in runs.items():
+        ms = time_it(fn, args.repeat)
+        repos, dupes = _page_stats(fn(), embeddings, repo_of)
+        print(f"{name:<24} {ms:>8.2f} {repos:>6} {dupes:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: substring keyword scanning vs the compiled language detector.
+
+Times both approaches on short profiles and on long pasted résumés, and shows
+profiles where plain substring matching picks the wrong language.
+"""
+import time
+from typing import Dict, List
+
+from language_detector import DEFAULT_DETECTOR, LANGUAGE_KEYWORDS
+
+RESUME_PARAGRAPH = (
+    "Software engineer with a good track record of shipping its features on time. "
+    "Built React dashboards and a Node.js backend, wrote unit tests, reviewed pull requests "
+    "and mentored interns. Comfortable with Docker, CI pipelines and cloud deployments. "
+    "Enjoys going to hackathons and contributing to documentation for open source projects. "
+)
+
+PROFILES = {
+    "short": "I am a beginner learning Python and Django, looking for good first issues.",
+    "resume_10x": RESUME_PARAGRAPH * 10,
+    "resume_100x": RESUME_PARAGRAPH * 100,
+}
+
+# Profiles that substring matching gets wrong ("go" in "good", "ts" in "its")
+TRICKY_PROFILES = [
+    ("A Swift fan who reads about its internals and goes to meetups", "swift"),
+    ("Going through my first Rust book, it has been a good experience", "rust"),
+    ("Ruby developer who is going to learn more about testing", "ruby"),
+]
+
+
+def substring_detect(profile_text: str) -> str:
+    """The previous approach: `kw in text` for every keyword of every language."""
+    text = profile_text.lower()
+    scores: Dict[str, int] = {
+        lang: sum(1 for kw in keywords if kw in text)
+        for lang, keywords in LANGUAGE_KEYWORDS.items()
+    }
+    if max(scores.values()) == 0:
+        return "all"
+    return max(scores, key=scores.get)
+
+
+def time_it(fn, texts: List[str], repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeats * len(texts))
+
+
+def main():
+    print("=" * 60)
+    print("LANGUAGE DETECTION BENCHMARK")
+    print("=" * 60)
+    for name, profile in PROFILES.items():
+        repeats = 2000 if name == "short" else 200
+        old = time_it(substring_detect, [profile], repeats)
+        new = time_it(DEFAULT_DETECTOR.detect, [profile], repeats)
+        print(f"{name:<12} {len(profile):>7} chars | substring: {old * 1e6:8.1f} µs | "
+              f"compiled: {new * 1e6:8.1f} µs | {old / new:5.1f}x")
+
+    batch = [PROFILES["resume_10x"]] * 1000
+    start = time.perf_counter()
+    DEFAULT_DETECTOR.detect_batch(batch)
+    print(f"\nBatch of {len(batch)} résumés: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print("\nAccuracy on tricky profiles:")
+    for profile, expected in TRICKY_PROFILES:
+        old = substring_detect(profile)
+        new = DEFAULT_DETECTOR.detect(profile)
+        print(f"  expected={expected:<10} substring={old:<10} compiled={new:<10} | {profile[:50]}...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: request throughput under different CPU thread settings.
+
+Each setting runs in a fresh subprocess (thread pools can only be sized before
+first use), with `--concurrency` request threads encoding profiles in parallel
+the way uvicorn's thread pool does. Compares the library defaults (every pool
+sized to all cores) with the budget chosen by runtime_config.
+
+    python benchmark_threads.py --concurrency 4
+    python benchmark_threads.py --synthetic   # torch matmuls, no model download
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+WORKER = r"""
+import json, os, sys, time
+from concurrent.futures import ThreadPoolExecutor
+mode, model_name, concurrency, requests_per_thread, threads = sys.argv[1:6]
+concurrency, requests_per_thread, threads = int(concurrency), int(requests_per_thread), int(threads)
+
+if threads:
+    from runtime_config import configure_runtime
+    configure_runtime(workers=1, concurrency=concurrency, intra_threads=threads)
+
+import torch
+if threads:
+    from runtime_config import configure_torch
+    configure_torch()
+
+if mode == "synthetic":
+    a = torch.randn(384, 1536)
+    def work():
+        x = torch.randn(64, 384)
+        for _ in range(20):
+            x = torch.tanh(x @ a) @ a.T
+        return x
+else:
+    from core import create_embedding_model
+    model = create_embedding_model(model_name)
+    text = open("sample_profile.txt", encoding="utf-8").read()
+    def work():
+        return model.encode([text] * 8, show_progress_bar=False)
+
+work()  # warm-up
+start = time.perf_counter()
+with ThreadPoolExecutor(max_workers=concurrency) as pool:
+    for f in [pool.submit(work) for _ in range(concurrency * requests_per_thread)]:
+        f.result()
+elapsed = time.perf_counter() - start
+print(json.dumps({"torch_threads": torch.get_num_threads(), "elapsed": elapsed,
+                  "throughput": concurrency * requests_per_thread / elapsed}))
+"""
+
+
+def run_setting(mode: str, model: str, concurrency: int, requests_per_thread: int,
+                threads: int) -> Optional[Dict]:
+    """Run one setting in a subprocess; threads=0 keeps the library defaults."""
+    env = dict(os.environ)
+    if threads == 0:
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "TOKENIZERS_PARALLELISM"):
+            env.pop(var, None)
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER, mode, model, str(concurrency), str(requests_per_thread), str(threads)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"⚠️ Setting threads={threads} failed: {result.stderr.strip().splitlines()[-1:]}")
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark throughput at different thread settings.")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Concurrent request threads")
+    parser.add_argument("--requests", "-r", type=int, default=5, help="Requests per thread")
+    parser.add_argument("--model", "-m", default="all-MiniLM-L6-v2", help="SentenceTransformer model name")
+    parser.add_argument("--synthetic", action="store_true", help="Use a torch matmul workload instead of a model")
+    args = parser.parse_args()
+
+    from runtime_config import available_cores, thread_budget
+
+    cores = len(available_cores())
+    budget = thread_budget(cores, workers=1, concurrency=args.concurrency)
+    settings: List[int] = [0] + sorted({1, budget, max(1, cores // 2), cores})
+    mode = "synthetic" if args.synthetic else "model"
+
+    print(f"{cores} cores, {args.concurrency} concurrent requests, workload: {mode}")
+    print(f"{'setting':<24} {'torch threads':>13} {'time (s)':>9} {'req/s':>8}")
+    for threads in settings:
+        result = run_setting(mode, args.model, args.concurrency, args.requests, threads)
+        if result is None:
+            continue
+        label = "library default" if threads == 0 else f"{threads} threads" + (" (budget)" if threads == budget else "")
+        print(f"{label:<24} {result['torch_threads']:>13} {result['elapsed']:>9.2f} {result['throughput']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Precomputed recommendation artifacts per (language, experience level) cohort.
+
+Most requests fall into a few cohorts that share the same issue set. For each
+cohort an artifact stores the L2-normalized issue embedding matrix (.npy, loaded
+with mmap) next to the issue metadata as IssueTable columns (.json); issue
+bodies live in a separate file that is only read when a body is needed. Serving a request then only needs
+the profile embedding and one matrix-vector product. Rebuilds reuse rows for
+issues whose text is unchanged, so only new or edited issues are re-encoded.
+
+Artifacts are built and refreshed by a scheduled job (e.g. cron, more often
+than COHORT_MAX_AGE), not by the request path:
+    python cohort_artifacts.py --languages python javascript --levels beginner intermediate
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from issue_records import IssueTable
+
+COHORT_DIR = os.getenv("COHORT_ARTIFACT_DIR", "/tmp/github_issues_cache/cohorts")
+COHORT_MAX_AGE = int(os.getenv("COHORT_MAX_AGE", str(24 * 3600)))  # seconds
+COHORT_CORPUS_SIZE = int(os.getenv("COHORT_CORPUS_SIZE", "500"))
+
+
+def issue_text(issue: Dict) -> str:
+    """Text that gets embedded for an issue (same as generate_issue_embeddings)."""
+    return f"{issue.get('title', '').strip()} {(issue.get('body') or '').strip()}"
+
+
+def _text_hash(issue: Dict) -> str:
+    return hashlib.sha256(issue_text(issue).encode()).hexdigest()
+
+
+def _slug(language: str, level: str, model_name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_.+#-]+", "_", f"{language}__{level}__{model_name}")
+
+
+class CohortArtifact:
+    """Ready-to-score issue matrix and metadata for one cohort."""
+
+    def __init__(self, meta: Dict, embeddings: np.ndarray, issues: IssueTable):
+        self.language = meta["language"]
+        self.level = meta["level"]
+        self.model_name = meta["model_name"]
+        self.built_at = meta["built_at"]
+        self.issues = issues
+        self.hashes: List[str] = meta["hashes"]
+        self.embeddings = embeddings
+        # Ranking signal columns, built from the issues on first use
+        self.features = None
+
+    def is_stale(self, max_age: int = COHORT_MAX_AGE) -> bool:
+        return time.time() - self.built_at > max_age
+
+    def score(self, profile_embedding: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the profile against every issue in the cohort."""
+        vec = np.asarray(profile_embedding, dtype=np.float32)
+        vec = vec / (np.linalg.norm(vec) or 1.0)
+        return self.embeddings @ vec
+
+
+def _paths(directory: str, language: str, level: str, model_name: str) -> Tuple[str, str]:
+    base = os.path.join(directory, _slug(language, level, model_name))
+    return base + ".npy", base + ".json"
+
+
+def _bodies_path(json_path: str) -> str:
+    return json_path[:-len(".json")] + ".bodies.json"
+
+
+def _body_loader(json_path: str):
+    def load() -> Optional[List[str]]:
+        try:
+            with open(_bodies_path(json_path), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Failed to load cohort issue bodies: {e}")
+            return None
+    return load
+
+
+def load_cohort_artifact(language: str, level: str, model_name: str,
+                         directory: str = COHORT_DIR) -> Optional[CohortArtifact]:
+    """Load an artifact with its matrix memory-mapped, or None if it does not exist."""
+    npy_path, json_path = _paths(directory, language, level, model_name)
+    if not (os.path.exists(npy_path) and os.path.exists(json_path)):
+        return None
+    with open(json_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return CohortArtifact(meta, np.load(npy_path, mmap_mode="r"), IssueTable.from_columns(meta["issues"], _body_loader(json_path)))
+
+
+def build_cohort_artifact(
+        language: str,
+        level: str,
+        issues: List[Dict],
+        model,
+        model_name: str,
+        directory: str = COHORT_DIR,
+    ) -> CohortArtifact:
+    """
+    Write the artifact for a cohort, re-encoding only issues whose text changed
+    since the previous build.
+    """
+    os.makedirs(directory, exist_ok=True)
+    hashes = [_text_hash(issue) for issue in issues]
+
+    previous = load_cohort_artifact(language, level, model_name, directory)
+    reusable = {}
+    if previous is not None:
+        reusable = {h: i for i, h in enumerate(previous.hashes)}
+
+    missing = [i for i, h in enumerate(hashes) if h not in reusable]
+    dim = None
+    fresh = None
+    if missing:
+        fresh = np.asarray(model.encode([issue_text(issues[i]) for i in missing], show_progress_bar=False),
+                           dtype=np.float32)
+        fresh /= np.maximum(np.linalg.norm(fresh, axis=1, keepdims=True), 1e-12)
+        dim = fresh.shape[1]
+    elif previous is not None:
+        dim = previous.embeddings.shape[1]
+
+    matrix = np.zeros((len(issues), dim or 0), dtype=np.float32)
+    for row, i in enumerate(missing):
+        matrix[i] = fresh[row]
+    for i, h in enumerate(hashes):
+        if h in reusable:
+            matrix[i] = previous.embeddings[reusable[h]]
+
+    table = IssueTable.from_dicts(issues)
+    meta = {
+        "language": language,
+        "level": level,
+        "model_name": model_name,
+        "built_at": time.time(),
+        "issues": table.to_columns(),
+        "hashes": hashes,
+    }
+    npy_path, json_path = _paths(directory, language, level, model_name)
+    bodies_path = _bodies_path(json_path)
+    # Write to temp files and rename so readers never see a half-written artifact;
+    # the metadata goes last because its mtime is what triggers a reload
+    with open(npy_path + ".tmp", "wb") as f:
+        np.save(f, matrix)
+    with open(bodies_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(table.bodies(), f)
+    with open(json_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(npy_path + ".tmp", npy_path)
+    os.replace(bodies_path + ".tmp", bodies_path)
+    os.replace(json_path + ".tmp", json_path)
+
+    print(f"📦 Built cohort artifact {language}/{level} ({len(issues)} issues, {len(missing)} encoded)")
+    return CohortArtifact(meta, np.load(npy_path, mmap_mode="r"), table)
+
+
+class CohortRegistry:
+    """Process-wide map of loaded artifacts, reloaded when a rebuild replaces the files."""
+
+    def __init__(self, directory: str = COHORT_DIR):
+        self.directory = directory
+        self._artifacts: Dict[Tuple[str, str, str], Tuple[float, CohortArtifact]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, language: str, level: str, model_name: str) -> Optional[CohortArtifact]:
+        """Fresh, non-empty artifact for the cohort, or None if missing or stale."""
+        npy_path, json_path = _paths(self.directory, language, level, model_name)
+        try:
+            mtime = os.path.getmtime(json_path)
+        except OSError:
+            return None
+
+        key = (language, level, model_name)
+        with self._lock:
+            entry = self._artifacts.get(key)
+            if entry is None or entry[0] != mtime:
+                try:
+                    artifact = load_cohort_artifact(language, level, model_name, self.directory)
+                except Exception as e:
+                    print(f"⚠️ Failed to load cohort artifact {language}/{level}: {e}")
+                    return None
+                if artifact is None:
+                    return None
+                entry = (mtime, artifact)
+                self._artifacts[key] = entry
+
+        artifact = entry[1]
+        if not artifact.issues or artifact.is_stale():
+            return None
+        return artifact
+
+    def load_all(self) -> int:
+        """Memory-map every artifact in the directory (e.g. at startup). Returns the count."""
+        if not os.path.isdir(self.directory):
+            return 0
+        loaded = 0
+        for name in os.listdir(self.directory):
+            # Only metadata files; issue bodies are stored next to them as .bodies.json
+            if not name.endswith(".json") or name.endswith(".bodies.json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except Exception:
+                continue
+            if self.get(meta["language"], meta["level"], meta["model_name"]) is not None:
+                loaded += 1
+        return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or refresh precomputed cohort artifacts.")
+    parser.add_argument("--languages", nargs="+", default=["python", "javascript", "typescript", "java", "go"])
+    parser.add_argument("--levels", nargs="+", default=["beginner", "intermediate", "advanced"])
+    parser.add_argument("--model", "-m", default="all-MiniLM-L6-v2", help="SentenceTransformer model name")
+    parser.add_argument("--corpus-size", type=int, default=COHORT_CORPUS_SIZE, help="Issues per cohort")
+    parser.add_argument("--top-n", type=int, default=100, help="Number of top repositories to search")
+    args = parser.parse_args()
+
+    from core import create_embedding_model, fetch_github_issues
+
+    model = create_embedding_model(args.model)
+    for language in args.languages:
+        for level in args.levels:
+            issues = fetch_github_issues(language, args.corpus_size, args.top_n, level)
+            build_cohort_artifact(language, level, issues, model, args.model)
+
+
+if __name__ == "__main__":
+    main()
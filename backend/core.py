@@ -1,23 +1,146 @@
 import requests
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Iterator, Tuple, Optional, Union, TYPE_CHECKING
 import os
 import time
 import json
 import hashlib
 import pickle
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
 from dotenv import load_dotenv
 import diskcache as dc
 from phi_predictor import predict_experience_level as phi_predict_experience
+from phi_predictor import predict_experience_score as phi_predict_experience_score
+from phi_predictor import experience_level_from_score as phi_level_from_score
+from phi_predictor import PHI_LANGUAGES
 from phi_predictor import predict_programming_language as phi_predict_language
+from issue_cache import TieredIssueCache
+from issue_sync import IssueStore, sync_repo_issues
+from github_pagination import fetch_pages, MAX_PAGES_PER_REPO, REPO_TIME_BUDGET
+from github_graphql import fetch_issues_graphql, MAX_ISSUES_PER_REPO
+from label_matcher import LabelMatcher
+from language_detector import DEFAULT_DETECTOR as LANGUAGE_DETECTOR, LANGUAGE_KEYWORDS
+from cohort_artifacts import CohortRegistry
+from profile_index import NearDuplicateIndex, ProfileCacheStats, normalize_profile_text, INDEX_KEY_PREFIX
+from profile_chunking import chunk_words_for_model, encode_profile_chunks, split_profile
+from runtime_config import configure_torch
+from reranker import CrossEncoderReranker, recall_top_k
+from issue_features import IssueFeatures, blend_scores, issue_signals
+from issue_records import IssueTable
+from diversity import diverse_top_k
+from result_windows import ResultWindowStore
+from shadow_scoring import ShadowScorer
+from deadlines import Deadline
+from repo_health import RepoHealth, CircuitOpenError, NEGATIVE_CACHE_STATUSES
+from repo_catalog import RepoCatalog
+from issue_index import IssueIndex
+
+# torch / sentence_transformers are imported on first model load, not at import time
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 load_dotenv()
 
-# Initialize disk cache
-cache = dc.Cache('/tmp/github_issues_cache')
+CACHE_DIR = '/tmp/github_issues_cache'
 CACHE_TTL = 3600  # 1 hour in seconds
 
+class _LazyDiskCache:
+    """diskcache.Cache that opens its directory on first use instead of at import."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._cache = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> dc.Cache:
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = dc.Cache(self.directory)
+        return self._cache
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __len__(self):
+        return len(self._get())
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __contains__(self, key):
+        return key in self._get()
+
+    def __getitem__(self, key):
+        return self._get()[key]
+
+    def __setitem__(self, key, value):
+        self._get()[key] = value
+
+    def __delitem__(self, key):
+        del self._get()[key]
+
+# Initialize disk cache (opened lazily)
+cache = _LazyDiskCache(CACHE_DIR)
+
+# In-process LRU over the disk cache for fetched issue lists
+issue_cache = TieredIssueCache(cache, ttl=CACHE_TTL)
+
+# Persistent per-repo issue store used by incremental sync mode
+issue_store = IssueStore(cache)
+
+# Ranked /recommend results kept briefly so later pages are served from the cache
+result_windows = ResultWindowStore(cache)
+INCREMENTAL_SYNC = os.getenv("GITHUB_INCREMENTAL_SYNC", "0") == "1"
+
+# Repos skipped on cold fetches after an error status or an empty result for a level
+repo_health = RepoHealth(cache)
+
+# Crawled repository catalog (repo_catalog.py); replaces the live search when it has matching repos
+REPO_CATALOG_ENABLED = os.getenv("REPO_CATALOG_ENABLED", "1") == "1"
+repo_catalog = RepoCatalog()
+
+# Issue fetch backend: "rest" (search + per-repo /issues) or "graphql" (batched queries)
+FETCH_BACKEND = os.getenv("GITHUB_FETCH_BACKEND", "rest")
+ISSUE_EMBEDDING_TTL = 7 * 24 * 3600  # 1 week in seconds
+ISSUE_ENCODE_BATCH = 64  # issues encoded between deadline checks
+
+# Precomputed per-(language, level) issue matrices, memory-mapped on first use
+cohort_registry = CohortRegistry()
+
+# SQLite/FTS5 index of fetched issues; answers requests locally with hybrid BM25 + cosine retrieval
+ISSUE_INDEX_ENABLED = os.getenv("ISSUE_INDEX_ENABLED", "1") == "1"
+HYBRID_POOL_SIZE = int(os.getenv("HYBRID_POOL_SIZE", "200"))  # fused candidates passed on to ranking
+# Issues older than the issue cache TTL are not served from the index either (seconds since last fetched)
+issue_index = IssueIndex(max_age=int(os.getenv("ISSUE_INDEX_MAX_AGE", str(CACHE_TTL))))
+
+# Near-duplicate profile lookup: reuse the embedding of an almost identical earlier profile
+PROFILE_NEAR_DUPLICATES = os.getenv("PROFILE_NEAR_DUPLICATES", "1") == "1"
+profile_index = NearDuplicateIndex(cache, max_distance=int(os.getenv("PROFILE_NEAR_DUPLICATE_DISTANCE", "7")))
+profile_cache_stats = ProfileCacheStats()
+
+# Detected language/level, level scores and embedding memoized per (profile, detector version, model)
+PROFILE_ANALYSIS_TTL = int(os.getenv("PROFILE_ANALYSIS_TTL", str(7 * 24 * 3600)))  # 1 week in seconds
+
+# Split profiles longer than the model's sequence limit into pooled, individually cached chunks
+PROFILE_CHUNKING = os.getenv("PROFILE_CHUNKING", "1") == "1"
+PROFILE_CHUNK_TTL = 7 * 24 * 3600  # 1 week in seconds
+
+# Diversity-aware selection (MMR + per-repo quota) over the ranked pool
+DIVERSITY_ENABLED = os.getenv("DIVERSITY_ENABLED", "1") == "1"
+
+# Optional second ranking stage: cross-encoder over the top bi-encoder candidates
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "0") == "1"
+reranker = CrossEncoderReranker(
+    os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+    cache,
+    top_k=int(os.getenv("RERANK_TOP_K", "50")),
+    budget_ms=float(os.getenv("RERANK_BUDGET_MS", "300")),
+)
+
+# Candidate embedding model scored on a sample of requests in the background (SHADOW_SAMPLE_RATE)
+shadow_scorer = ShadowScorer(model_loader=lambda name: create_embedding_model(name))
+
 
 EXPERIENCE_LEVEL_REFERENCES = {
     'beginner': [
@@ -131,6 +254,13 @@ EXPERIENCE_LEVEL_REFERENCES = {
     ],
 }
 
+# Labels common enough to be worth a server-side labels= query before scanning unfiltered pages
+SERVER_SIDE_LABELS = {
+    'beginner': ['good first issue'],
+    'intermediate': ['help wanted'],
+    'advanced': [],
+}
+
 # Map experience levels to GitHub issue labels
 EXPERIENCE_LEVEL_LABELS = {
     'beginner': [
@@ -212,13 +342,52 @@ EXPERIENCE_LEVEL_LABELS = {
     ],
 }
 
-def extract_experience_level_embeddings(profile_text: str, model: SentenceTransformer, use_phi: bool = False) -> str:
+# Word-prefix rules applied to normalized labels ("E-easy" -> "e easy")
+LABEL_PREFIX_RULES = {
+    'beginner': [
+        'good first', 'first timers', 'first time', 'beginner', 'starter', 'newcomer',
+        'e easy', 'd easy', 'difficulty easy', 'difficulty beginner', 'difficulty low',
+        'level beginner', 'level easy', 'complexity low', 'effort low', 'size xs',
+    ],
+    'intermediate': [
+        'e medium', 'd medium', 'difficulty medium', 'difficulty intermediate',
+        'level intermediate', 'level medium', 'complexity medium', 'effort medium',
+    ],
+    'advanced': [
+        'e hard', 'd hard', 'difficulty hard', 'difficulty advanced', 'difficulty expert',
+        'level advanced', 'level hard', 'complexity high', 'effort high', 'e expert',
+    ],
+}
+
+# Regex rules for label shapes that prefixes cannot express
+LABEL_PATTERN_RULES = {
+    'beginner': [r'\bgood (?:first|1st) (?:issue|bug|pr|contribution)s?\b', r'\beasy (?:pick|fix)\b'],
+    'intermediate': [],
+    'advanced': [r'\b(?:hard|expert) (?:issue|problem|bug)s?\b'],
+}
+
+# Compiled once and shared by every fetch path
+LABEL_MATCHER = LabelMatcher(
+    EXPERIENCE_LEVEL_LABELS,
+    prefixes=LABEL_PREFIX_RULES,
+    patterns=LABEL_PATTERN_RULES,
+    aliases_path=os.getenv("LABEL_ALIASES_PATH", os.path.join(CACHE_DIR, "label_aliases.json")),
+    learn=os.getenv("LABEL_ALIAS_LEARNING", "0") == "1",
+)
+
+def extract_experience_level_embeddings(
+        profile_text: str,
+        model: 'SentenceTransformer',
+        use_phi: bool = False,
+        model_name: str = 'all-MiniLM-L6-v2',
+    ) -> str:
     """
     Extract experience level from student profile.
     Args:
         profile_text: The user's profile text
         model: The SentenceTransformer model (used if use_phi is False)
         use_phi: If True, use the Phi predictor instead of embeddings
+        model_name: Name of the model (keys the cached profile chunk embeddings)
     Returns:
         Experience level as string ('beginner', 'intermediate', 'advanced', or 'any')
     """
@@ -228,46 +397,38 @@ def extract_experience_level_embeddings(profile_text: str, model: SentenceTransf
         return "any"
     
     try:
-        import torch
-        
         # Get or generate cached student profile embedding
-        student_embedding = get_or_create_student_embedding(profile_text, model)
-        
-        # Convert student embedding to tensor if needed and move to CPU
-        if isinstance(student_embedding, np.ndarray):
-            student_embedding = torch.from_numpy(student_embedding).float().cpu()
-        else:
-            student_embedding = student_embedding.cpu()
-        
-        # Find the best matching experience level
-        best_level = 'any'
-        best_score = -1
-        
-        for level, references in EXPERIENCE_LEVEL_REFERENCES.items():
-            # Get cached or create reference embeddings for this level
-            ref_embeddings = get_or_create_reference_embeddings(level, references, model)
-            
-            # Average similarity across all reference examples
-            level_scores = []
-            for ref_embedding in ref_embeddings:
-                # Ensure both embeddings are on the same device (CPU)
-                ref_embedding = ref_embedding.cpu() if hasattr(ref_embedding, 'cpu') else ref_embedding
-                similarity = util.pytorch_cos_sim(student_embedding, ref_embedding)
-                level_scores.append(similarity.item())
-            
-            avg_similarity = np.mean(level_scores)
-            
-            if avg_similarity > best_score:
-                best_score = avg_similarity
-                best_level = level
-        
-        print(f"✅ Detected experience level: {best_level} (similarity score: {best_score:.4f})")
-        return best_level
+        student_embedding = get_or_create_student_embedding(profile_text, model, model_name)
+        return _best_experience_level(experience_level_scores(student_embedding, model, model_name))
     
     except Exception as e:
         print(f"⚠️ Error in experience level extraction: {e}")
         return "any"  # ← Safer fallback: no filtering
 
+def experience_level_scores(
+        student_embedding: np.ndarray,
+        model: 'SentenceTransformer',
+        model_name: str = 'all-MiniLM-L6-v2',
+    ) -> Dict[str, float]:
+    """Average cosine similarity of a profile embedding to each level's reference examples."""
+    student_embedding = np.asarray(student_embedding, dtype=np.float32)
+    student_embedding = student_embedding / (np.linalg.norm(student_embedding) or 1.0)
+    scores = {}
+    for level, references in EXPERIENCE_LEVEL_REFERENCES.items():
+        # Get cached or create reference embeddings for this level
+        ref_matrix = np.vstack(get_or_create_reference_embeddings(level, references, model, model_name)).astype(np.float32)
+        ref_matrix /= np.linalg.norm(ref_matrix, axis=1, keepdims=True)
+        scores[level] = float(np.mean(ref_matrix @ student_embedding))
+    return scores
+
+def _best_experience_level(scores: Dict[str, float]) -> str:
+    """Level with the highest reference similarity ('any' when there are no scores)."""
+    if not scores:
+        return "any"
+    best_level = max(scores, key=scores.get)
+    print(f"✅ Detected experience level: {best_level} (similarity score: {scores[best_level]:.4f})")
+    return best_level
+
 
 def _auth_headers() -> Dict[str, str]:
     token = os.getenv("GITHUB_TOKEN")
@@ -293,126 +454,182 @@ def extract_language_from_profile(profile_text: str, use_phi: bool = False) -> s
     if not profile_text:
         return "all"
     
-    profile_text = profile_text.lower()
-
-    #Define a list of popular programming languages
-    languages = {
-        'python': ['python', 'django', 'flask', 'fastapi', 'pytorch', 'tensorflow', 'pandas', 'numpy'],
-        'javascript': ['javascript', 'js', 'react', 'vue', 'angular', 'node.js', 'nodejs', 'express'],
-        'typescript': ['typescript', 'ts'],
-        'java': ['java', 'spring', 'spring boot', 'maven', 'gradle'],
-        'go': ['golang', 'go'],
-        'rust': ['rust'],
-        'ruby': ['ruby', 'rails', 'ruby on rails'],
-        'php': ['php', 'laravel', 'symfony'],
-        'c++': ['c++', 'cpp'],
-        'csharp': ['c#', 'csharp', '.net', 'dotnet', 'asp.net'],
-        'swift': ['swift', 'ios', 'swiftui'],
-        'kotlin': ['kotlin', 'android'],
-    }
+    # Single-pass weighted keyword scan with token boundaries
+    return LANGUAGE_DETECTOR.detect(profile_text, default="all")
 
-    # Count occurrences of each language keyword in the profile text
-    scores = {}
-    for lang, keywords in languages.items():
-        scores[lang] = sum(1 for kw in keywords if kw in profile_text)
+def extract_languages_from_profiles(profile_texts: List[str]) -> List[str]:
+    """Batch version of extract_language_from_profile (keyword detection only)."""
+    return LANGUAGE_DETECTOR.detect_batch(profile_texts, default="all")
 
-    # Store the language with the highest score
-    max_score = max(scores.values())
-    
-    # If no language keywords are found, return "all"
-    if max_score == 0:
-        return "all"
-    # Return the language with the highest score
-    return max(scores, key=scores.get)
-
-
-def fetch_top_repositories(language: Optional[str], top_n: int = 100) -> List[Tuple[str, str, int]]:
+def fetch_top_repositories(language: Optional[str], top_n: int = 100,
+                           deadline: Optional[Deadline] = None) -> List[Tuple[str, str, int]]:
+    """Fetch the top_n most starred repositories, paging through search results (max 1000)."""
     url = "https://api.github.com/search/repositories"
     headers = _auth_headers()
     q = "stars:>0"
     if language:
         q += f" language:{language}"
+    top_n = max(1, min(int(top_n), 1000))
+    per_page = min(top_n, 100)
     params = {
         "q": q,
-        "per_page": max(1, min(int(top_n), 100)),
+        "per_page": per_page,
         "sort": "stars",
         "order": "desc",
     }
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
-    resp.raise_for_status()
-    items = resp.json().get("items", [])
+    max_pages = -(-top_n // per_page)
+    time_budget = REPO_TIME_BUDGET * max_pages
+    if deadline is not None:
+        time_budget = deadline.clamp(time_budget)
+    pages = fetch_pages(url, headers, params, max_pages=max_pages, time_budget=time_budget)
+    if deadline is not None and len(pages) < max_pages and deadline.expired():
+        deadline.mark_partial(f"read {len(pages)} of {max_pages} repository search pages")
     repos: List[Tuple[str, str, int]] = []
-    for it in items:
-        full = it.get("full_name", "")
-        if "/" not in full:
-            continue
-        owner, repo = full.split("/", 1)
-        repos.append((owner, repo, int(it.get("stargazers_count", 0))))
-    return repos
+    for page in pages:
+        for it in page.get("items", []):
+            full = it.get("full_name", "")
+            if "/" not in full:
+                continue
+            owner, repo = full.split("/", 1)
+            repos.append((owner, repo, int(it.get("stargazers_count", 0))))
+    return repos[:top_n]
 
 def fetch_repo_good_first_issues(
         owner: str,
         repo: str, 
         limit: int, 
-        experience_level: str
+        experience_level: str,
+        max_pages: int = MAX_PAGES_PER_REPO,
+        time_budget: float = REPO_TIME_BUDGET,
+        stars: int = 0
     ) -> List[Dict]:
-    """Fetch issues filtered by experience level labels."""
+    """
+    Fetch issues filtered by experience level labels.
+    Labels GitHub can filter server-side (SERVER_SIDE_LABELS) are queried first;
+    remaining pages of the budget scan unfiltered issues and match labels locally.
+    """
     url = f"https://api.github.com/repos/{owner}/{repo}/issues"
     headers = _auth_headers()
-    params = {
+    base_params = {
         "state": "open",
         "sort": "updated",
         "direction": "desc",
-        "per_page": max(1, min(int(limit), 100)),
     }
-    r = requests.get(url, headers=headers, params=params, timeout=30)
-    r.raise_for_status()
+    started = time.monotonic()
+    pages_left = max_pages
+    issues: List[Dict] = []
+    seen = set()
 
-    issues = []
+    def collect(pages: List[List[Dict]]) -> None:
+        for page in pages:
+            for item in page:
+                if "pull_request" in item or item.get("html_url") in seen:
+                    continue
+                # Check label intersection for specific experience levels ("any" accepts all)
+                label_names = [l.get("name", "") for l in item.get("labels", [])]
+                if _labels_match_level(label_names, experience_level):
+                    seen.add(item.get("html_url"))
+                    issues.append({
+                        "title": item.get("title", ""),
+                        "body": item.get("body", ""),
+                        "url": item.get("html_url", ""),
+                        "repo": f"{owner}/{repo}",
+                        "labels": label_names,
+                        **issue_signals(stars, item.get("updated_at"), item.get("comments", 0),
+                                        _label_strength(label_names, experience_level)),
+                    })
+                if len(issues) >= limit:
+                    return
 
-    # Special handling for "any" - fetch all issues without label filtering
-    if experience_level == "any":
-        wanted = None  # No filtering applied
-    else:
-        wanted = set(EXPERIENCE_LEVEL_LABELS.get(experience_level, []))
+    # GitHub's labels= filter ANDs its values, so each server-side label is its own query
+    for label in SERVER_SIDE_LABELS.get(experience_level, []):
+        if len(issues) >= limit or pages_left <= 0:
+            break
+        params = {**base_params, "labels": label, "per_page": max(1, min(int(limit), 100))}
+        pages = fetch_pages(url, headers, params, max_pages=pages_left,
+                            time_budget=time_budget - (time.monotonic() - started))
+        pages_left -= len(pages)
+        collect(pages)
 
-    for item in r.json():
-        if "pull_request" in item:
-            continue
-        
-        # If wanted is None, accept all issues (no label filtering for "any")
-        if wanted is None:
+    if len(issues) < limit and pages_left > 0:
+        if experience_level == "any":
+            # Every issue matches, so only request as many pages as the limit needs
+            per_page = max(1, min(int(limit), 100))
+            pages_left = min(pages_left, -(-int(limit) // per_page))
+        else:
+            per_page = 100
+        params = {**base_params, "per_page": per_page}
+        pages = fetch_pages(url, headers, params, max_pages=pages_left,
+                            time_budget=time_budget - (time.monotonic() - started))
+        collect(pages)
+
+    return issues[:limit]
+
+def _labels_match_level(label_names: List[str], experience_level: str) -> bool:
+    """Check whether any label belongs to the experience level ("any" matches everything)."""
+    return LABEL_MATCHER.matches(label_names, experience_level)
+
+def _label_strength(label_names: List[str], experience_level: str) -> float:
+    """0-1 strength of the level signal: one matching label gives 0.5, two or more give 1."""
+    matching = sum(
+        1 for name in label_names
+        if (experience_level in LABEL_MATCHER.classify(name)) or (experience_level == "any" and LABEL_MATCHER.classify(name))
+    )
+    return min(1.0, matching / 2)
+
+def fetch_repo_issues_incremental(
+        owner: str,
+        repo: str,
+        limit: int,
+        experience_level: str,
+        stars: int = 0,
+        time_budget: float = REPO_TIME_BUDGET
+    ) -> List[Dict]:
+    """Sync a repo into the local issue store, then select matching issues from it."""
+    sync_repo_issues(owner, repo, issue_store, _auth_headers(), time_budget=time_budget)
+    issues = []
+    for record in issue_store.open_issues(f"{owner}/{repo}"):
+        if _labels_match_level(record["labels"], experience_level):
             issues.append({
-                "title": item.get("title", ""),
-                "body": item.get("body", ""),
-                "url": item.get("html_url", ""),
-                "repo": f"{owner}/{repo}",
+                "title": record["title"],
+                "body": record["body"],
+                "url": record["url"],
+                "repo": record["repo"],
+                "labels": record["labels"],
+                **issue_signals(stars, record.get("updated_at"), record.get("comments", 0),
+                                _label_strength(record["labels"], experience_level)),
             })
-        else:
-            # Otherwise, check label intersection for specific experience levels
-            labels = {str(l.get("name", "")).strip().casefold() for l in item.get("labels", [])}
-            if labels & wanted:
-                issues.append({
-                    "title": item.get("title", ""),
-                    "body": item.get("body", ""),
-                    "url": item.get("html_url", ""),
-                    "repo": f"{owner}/{repo}",
-                })
-        
-        if len(issues) >= limit:
-            break
+            if len(issues) >= limit:
+                break
     return issues
 
 def fetch_github_issues(
         language: str = "all", 
         per_page: int = 20, 
         top_n: int = 100,
-        experience_level: str = "any"
+        experience_level: str = "any",
+        incremental: Optional[bool] = None,
+        backend: Optional[str] = None,
+        deadline: Optional[Deadline] = None
     ) -> List[Dict]:
-    """Fetch GitHub issues with caching."""
+    """
+    Fetch GitHub issues with caching.
+    With incremental=True (default: GITHUB_INCREMENTAL_SYNC), repos are synced
+    into the local issue store via updated_at watermarks instead of re-downloaded.
+    backend selects "rest" or "graphql" (default: GITHUB_FETCH_BACKEND).
+    With a deadline, fetching stops when it expires; the issues fetched so far
+    are returned (deadline.partial is set) and are not cached.
+    """
+    if incremental is None:
+        incremental = INCREMENTAL_SYNC
+    if backend is None:
+        backend = FETCH_BACKEND
+    if deadline is None:
+        deadline = Deadline()  # unbounded; still tracks whether the fetch was cut short
     
-    # Check cache first
-    cached_issues = get_cached_issues(language, top_n)
+    # Check cache first (keyed by the requested top_n, before any token-based limit)
+    requested_top_n = top_n
+    cached_issues = get_cached_issues(language, requested_top_n, experience_level)
     if cached_issues is not None:
         return cached_issues
     
@@ -423,48 +640,216 @@ def fetch_github_issues(
         orig = top_n
         top_n = min(top_n, 30)
         print(f"⚠️ No GITHUB_TOKEN set, limiting top_n from {orig} to {top_n}")
+        if backend == "graphql":
+            print("⚠️ GraphQL API requires GITHUB_TOKEN, falling back to REST")
+            backend = "rest"
+
+    if backend == "graphql" and not incremental:
+        issues = _fetch_github_issues_graphql(language, per_page, top_n, experience_level, deadline)
+    else:
+        issues = _fetch_github_issues_rest(language, per_page, top_n, experience_level, incremental, deadline)
+    
+    # Cache the results (a partial fetch would otherwise be served until the TTL runs out)
+    if not deadline.partial:
+        set_cached_issues(language, requested_top_n, issues, experience_level)
+        if ISSUE_INDEX_ENABLED:
+            try:
+                issue_index.add_issues(issues, language, experience_level)
+            except Exception as e:
+                print(f"⚠️ Failed to index issues: {e}")
+    
+    return issues
+
+def _candidate_repositories(language: str, experience_level: str, top_n: int,
+                            deadline: Optional[Deadline] = None) -> Iterator[Tuple[str, str, int]]:
+    """
+    Repositories to fetch issues from: fresh catalog entries first, then the live search.
+    The search only runs when the fetch gets through every catalog repository without
+    filling the page, so a thin or stale catalog is topped up instead of shortening results.
+    """
+    catalog_repos = repo_catalog.top_repositories(language, experience_level, top_n) if REPO_CATALOG_ENABLED else []
+    if catalog_repos:
+        print(f"📚 Using {len(catalog_repos)} catalog repositories with open {experience_level} issues")
+    yield from catalog_repos
+    if deadline is not None and deadline.expired():
+        return
+    if catalog_repos:
+        print("📚 Catalog repositories did not fill the page, topping up with the live search")
+    seen = {(owner, repo) for owner, repo, _ in catalog_repos}
+    for owner, repo, stars in fetch_top_repositories(language or None, top_n=top_n, deadline=deadline):
+        if (owner, repo) not in seen:
+            yield owner, repo, stars
 
-    repos = fetch_top_repositories(language or None, top_n=min(100, top_n))
+def _fetch_github_issues_rest(
+        language: str,
+        per_page: int,
+        top_n: int,
+        experience_level: str,
+        incremental: bool,
+        deadline: Optional[Deadline] = None
+    ) -> List[Dict]:
+    """Fetch issues with one search call (or a catalog query) plus per-repo /issues calls."""
+    repos = _candidate_repositories(language, experience_level, top_n, deadline)
     remaining = max(1, int(per_page))
     all_issues: List[Dict] = []
 
-    for owner, repo, _stars in repos:
-        batch = fetch_repo_good_first_issues(owner, repo, limit=min(remaining, 100), experience_level=experience_level)
+    fetch_repo = fetch_repo_issues_incremental if incremental else fetch_repo_good_first_issues
+
+    for i, (owner, repo, stars) in enumerate(repos):
+        full_name = f"{owner}/{repo}"
+        time_budget = REPO_TIME_BUDGET
+        if deadline is not None:
+            if deadline.expired():
+                deadline.mark_partial(f"fetched issues from {i} repositories")
+                break
+            time_budget = deadline.clamp(REPO_TIME_BUDGET)
+        skip_reason = repo_health.skip_reason(full_name, experience_level)
+        if skip_reason:
+            print(f"⏭️ Skipping {full_name} ({skip_reason})")
+            continue
+        repo_started = time.monotonic()
+        try:
+            batch = fetch_repo(owner, repo, limit=min(remaining, 100), experience_level=experience_level,
+                               stars=stars, time_budget=time_budget)
+        except CircuitOpenError as e:
+            print(f"⚠️ {e}, keeping the {len(all_issues)} issues fetched so far")
+            if deadline is not None:
+                deadline.mark_partial("GitHub circuit breaker open")
+            break
+        except requests.HTTPError as e:
+            # One broken repo must not fail the request; gone/disabled repos are remembered
+            status = e.response.status_code if e.response is not None else None
+            if status in NEGATIVE_CACHE_STATUSES:
+                repo_health.record_error(full_name, status)
+            else:
+                print(f"⚠️ Skipping {full_name}: {e}")
+            continue
+        except requests.RequestException as e:
+            if deadline is not None and deadline.expired():
+                deadline.mark_partial(f"fetch of {full_name} cut off ({type(e).__name__})")
+                break
+            print(f"⚠️ Skipping {full_name}: {e}")
+            continue
         if batch:
             all_issues.extend(batch)
             remaining = per_page - len(all_issues)
             if remaining <= 0:
                 break
+        elif time.monotonic() - repo_started < time_budget and (deadline is None or not deadline.expired()):
+            # Only a fetch that finished within its budget shows the repo has no matching issues;
+            # pages cut off by the budget may have held them
+            repo_health.record_empty(full_name, experience_level)
+    else:
+        # Pages inside the last repositories may have been cut off by their clamped budget
+        if deadline is not None and len(all_issues) < per_page and deadline.expired() and not deadline.partial:
+            deadline.mark_partial(f"fetched {len(all_issues)} of {per_page} issues")
     
-    issues = all_issues[:per_page]
-    
-    # Cache the results
-    set_cached_issues(language, top_n, issues)
-    
-    return issues
+    return all_issues[:per_page]
 
-def create_embedding_model(model_name: str = 'all-MiniLM-L6-v2') -> SentenceTransformer:
+def _fetch_github_issues_graphql(language: str, per_page: int, top_n: int, experience_level: str,
+                                 deadline: Optional[Deadline] = None) -> List[Dict]:
+    """Fetch issues through the batched GraphQL backend."""
+    # GitHub's labels: filter only knows exact names, so it would drop the spelling variants, prefix
+    # and alias matches LABEL_MATCHER accepts; levels are matched locally over a full page per repo instead
+    return fetch_issues_graphql(
+        language or None,
+        per_page=max(1, int(per_page)),
+        top_n=top_n,
+        labels=None,
+        headers=_auth_headers(),
+        match_labels=lambda names: _labels_match_level(names, experience_level),
+        label_strength=lambda names: _label_strength(names, experience_level),
+        deadline=deadline,
+        issues_per_repo=None if experience_level == "any" else MAX_ISSUES_PER_REPO,
+    )
+
+_models: Dict[str, 'SentenceTransformer'] = {}
+_models_lock = threading.Lock()
+
+def create_embedding_model(model_name: str = 'all-MiniLM-L6-v2') -> 'SentenceTransformer':
     """
     Create a SentenceTransformer model for generating embeddings.
+    Models are loaded on first use and reused for the life of the process.
     Supported models:
     - 'all-MiniLM-L6-v2': Default, English-focused model
     - 'intfloat/multilingual-e5-base': Multilingual model supporting 100+ languages
     """
-    return SentenceTransformer(model_name)
+    model = _models.get(model_name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(model_name)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                configure_torch()
+                model = SentenceTransformer(model_name)
+                _models[model_name] = model
+    return model
 
-def generate_issue_embeddings(issues: List[Dict], model: SentenceTransformer) -> np.ndarray:
+def generate_issue_embeddings(issues: List[Dict], model: 'SentenceTransformer') -> np.ndarray:
     if not issues:
         return np.array([])
     texts = [
-        f"{issue.get('title', '').strip()} {issue.get('body', '').strip()}"
+        f"{issue.get('title', '').strip()} {(issue.get('body') or '').strip()}"
         for issue in issues
     ]
     return model.encode(texts, show_progress_bar=False)
 
-def _get_profile_cache_key(profile_text: str) -> str:
-    """Generate a unique cache key for profile text using hash."""
-    profile_hash = hashlib.sha256(profile_text.encode()).hexdigest()
-    return f"profile_embedding_{profile_hash}"
+def _get_issue_embedding_cache_key(issue: Dict, model_name: str) -> str:
+    """Cache key for an issue embedding, derived from the embedded text."""
+    text = f"{issue.get('title', '').strip()} {(issue.get('body') or '').strip()}"
+    text_hash = hashlib.sha256(text.encode()).hexdigest()
+    return f"issue_embedding_{model_name}_{text_hash}"
+
+def get_or_create_issue_embeddings(issues: List[Dict], model: 'SentenceTransformer', model_name: str) -> np.ndarray:
+    """Embed issues, re-encoding only those whose title/body changed since last seen."""
+    if not issues:
+        return np.array([])
+    keys = [_get_issue_embedding_cache_key(issue, model_name) for issue in issues]
+    vectors: List[Optional[np.ndarray]] = [cache.get(key) for key in keys]
+    missing = [i for i, vec in enumerate(vectors) if vec is None]
+    
+    if missing:
+        print(f"🔄 Embedding {len(missing)} new or changed issues ({len(issues) - len(missing)} cached)")
+        fresh = generate_issue_embeddings([issues[i] for i in missing], model)
+        for i, vec in zip(missing, fresh):
+            vectors[i] = vec
+            try:
+                cache.set(keys[i], vec, expire=ISSUE_EMBEDDING_TTL)
+            except Exception as e:
+                print(f"⚠️ Failed to cache issue embedding: {e}")
+    
+    return np.vstack(vectors)
+
+def embed_issues_within_deadline(
+        issues: List[Dict],
+        model: 'SentenceTransformer',
+        model_name: str,
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[List[Dict], np.ndarray]:
+    """
+    Embed issues batch by batch while the deadline allows another batch.
+    Returns the issues that were embedded (a prefix, at least one batch) and their embeddings.
+    """
+    if deadline is None:
+        return issues, get_or_create_issue_embeddings(issues, model, model_name)
+    parts = []
+    slowest_batch = 0.0
+    for start in range(0, len(issues), ISSUE_ENCODE_BATCH):
+        if parts and deadline.remaining() < slowest_batch:
+            deadline.mark_partial(f"embedded {start} of {len(issues)} issues")
+            return issues[:start], np.vstack(parts)
+        batch_started = time.monotonic()
+        parts.append(get_or_create_issue_embeddings(issues[start:start + ISSUE_ENCODE_BATCH], model, model_name))
+        slowest_batch = max(slowest_batch, time.monotonic() - batch_started)
+    return issues, np.vstack(parts) if parts else np.array([])
+
+def _get_profile_hash(profile_text: str) -> str:
+    """Hash of the normalized profile text (case/whitespace/unicode-insensitive)."""
+    return hashlib.sha256(normalize_profile_text(profile_text).encode()).hexdigest()
+
+def _get_profile_cache_key(profile_text: str, model_name: str = 'all-MiniLM-L6-v2') -> str:
+    """Generate a cache key from the normalized profile text and the embedding model."""
+    return f"profile_embedding_{model_name}_{_get_profile_hash(profile_text)}"
 
 def _get_reference_embeddings_cache_key(level: str, model_name: str = 'all-MiniLM-L6-v2') -> str:
     """Generate a unique cache key for reference embeddings."""
@@ -472,9 +857,8 @@ def _get_reference_embeddings_cache_key(level: str, model_name: str = 'all-MiniL
 
 def _get_reference_embeddings_file_path() -> str:
     """Get the file path for storing reference embeddings."""
-    cache_dir = '/tmp/github_issues_cache'
-    os.makedirs(cache_dir, exist_ok=True)
-    return os.path.join(cache_dir, 'reference_embeddings.pkl')
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, 'reference_embeddings.pkl')
 
 def get_cached_reference_embeddings(level: str, model_name: str = 'all-MiniLM-L6-v2') -> Optional[List[np.ndarray]]:
     """Retrieve cached reference embeddings from disk."""
@@ -508,12 +892,8 @@ def set_cached_reference_embeddings(level: str, embeddings: List, model_name: st
             with open(file_path, 'rb') as f:
                 embeddings_dict = pickle.load(f)
         
-        # Convert embeddings to numpy for storage
         cache_key = _get_reference_embeddings_cache_key(level, model_name)
-        embeddings_dict[cache_key] = [
-            emb.cpu().numpy() if hasattr(emb, 'cpu') else (emb.numpy() if hasattr(emb, 'numpy') else emb)
-            for emb in embeddings
-        ]
+        embeddings_dict[cache_key] = [np.asarray(emb) for emb in embeddings]
         
         # Save to disk
         with open(file_path, 'wb') as f:
@@ -524,85 +904,247 @@ def set_cached_reference_embeddings(level: str, embeddings: List, model_name: st
     except Exception as e:
         print(f"⚠️ Failed to cache reference embeddings: {e}")
 
-def get_or_create_reference_embeddings(level: str, references: List[str], model: SentenceTransformer) -> List:
+def get_or_create_reference_embeddings(level: str, references: List[str], model: 'SentenceTransformer',
+                                       model_name: str = 'all-MiniLM-L6-v2') -> List[np.ndarray]:
     """Get cached reference embeddings or create and cache new ones."""
     # Try to get from cache first
-    cached_embeddings = get_cached_reference_embeddings(level)
+    cached_embeddings = get_cached_reference_embeddings(level, model_name)
     if cached_embeddings is not None:
-        # Convert cached numpy arrays back to tensors for comparison
-        import torch
-        return [torch.from_numpy(emb).float() for emb in cached_embeddings]
+        return [np.asarray(emb) for emb in cached_embeddings]
     
-    # Generate new embeddings
+    # Generate new embeddings in one batch
     print(f"🔄 Generating reference embeddings for level: {level}")
-    embeddings = []
-    for reference in references:
-        ref_embedding = model.encode(reference, convert_to_tensor=True)
-        embeddings.append(ref_embedding)
-    
-    # Cache them (convert to numpy for storage)
-    embeddings_np = [
-        emb.cpu().numpy() if hasattr(emb, 'cpu') else (emb.numpy() if hasattr(emb, 'numpy') else emb)
-        for emb in embeddings
-    ]
-    set_cached_reference_embeddings(level, embeddings_np)
+    embeddings = list(model.encode(references, show_progress_bar=False))
+    set_cached_reference_embeddings(level, embeddings, model_name)
     
     return embeddings
 
-def get_cached_student_embedding(profile_text: str) -> Optional[np.ndarray]:
-    """Retrieve cached student profile embedding if available."""
-    cache_key = _get_profile_cache_key(profile_text)
+def get_cached_student_embedding(profile_text: str, near_duplicates: Optional[bool] = None,
+                                 model_name: str = 'all-MiniLM-L6-v2') -> Optional[np.ndarray]:
+    """Retrieve cached student profile embedding, falling back to a near-duplicate profile's."""
+    if near_duplicates is None:
+        near_duplicates = PROFILE_NEAR_DUPLICATES
+    cache_key = _get_profile_cache_key(profile_text, model_name)
     
     try:
         embedding = cache.get(cache_key)
         if embedding is not None:
             print(f"✅ Using cached student profile embedding")
+            profile_cache_stats.record("exact_hits")
             return embedding
+        
+        if near_duplicates:
+            match = profile_index.lookup(normalize_profile_text(profile_text))
+            # The index is shared by all models, so only reuse an embedding from this one
+            if match is not None and match[0].startswith(f"profile_embedding_{model_name}_"):
+                embedding = cache.get(match[0])
+                if embedding is not None:
+                    print(f"✅ Using cached embedding of a near-duplicate profile (distance: {match[1]})")
+                    profile_cache_stats.record("near_duplicate_hits")
+                    return embedding
     except Exception as e:
         print(f"⚠️ Error retrieving cached embedding: {e}")
     
     return None
 
-def set_cached_student_embedding(profile_text: str, embedding: np.ndarray) -> None:
-    """Cache student profile embedding."""
-    cache_key = _get_profile_cache_key(profile_text)
+def set_cached_student_embedding(profile_text: str, embedding: np.ndarray, model_name: str = 'all-MiniLM-L6-v2') -> None:
+    """Cache student profile embedding and index it for near-duplicate lookup."""
+    cache_key = _get_profile_cache_key(profile_text, model_name)
     
     try:
         cache.set(cache_key, embedding)
+        if PROFILE_NEAR_DUPLICATES:
+            profile_index.add(normalize_profile_text(profile_text), cache_key)
         print(f"💾 Cached student profile embedding")
     except Exception as e:
         print(f"⚠️ Failed to cache embedding: {e}")
 
-def get_or_create_student_embedding(profile_text: str, model: SentenceTransformer) -> np.ndarray:
+def _get_profile_chunk_cache_key(chunk: str, model_name: str) -> str:
+    chunk_hash = hashlib.sha256(normalize_profile_text(chunk).encode()).hexdigest()
+    return f"profile_chunk_{model_name}_{chunk_hash}"
+
+def encode_student_profile(profile_text: str, model: 'SentenceTransformer', model_name: str = 'all-MiniLM-L6-v2') -> np.ndarray:
+    """Encode a profile, chunking and pooling it when it exceeds the model's sequence limit."""
+    if not PROFILE_CHUNKING:
+        return np.asarray(model.encode(profile_text, show_progress_bar=False))
+
+    def get_chunk(chunk: str) -> Optional[np.ndarray]:
+        try:
+            return cache.get(_get_profile_chunk_cache_key(chunk, model_name))
+        except Exception as e:
+            print(f"⚠️ Error retrieving cached profile chunk: {e}")
+            return None
+
+    def set_chunk(chunk: str, embedding: np.ndarray) -> None:
+        try:
+            cache.set(_get_profile_chunk_cache_key(chunk, model_name), embedding, expire=PROFILE_CHUNK_TTL)
+        except Exception as e:
+            print(f"⚠️ Failed to cache profile chunk: {e}")
+
+    return encode_profile_chunks(profile_text, model, get_chunk, set_chunk)
+
+def get_or_create_student_embedding(profile_text: str, model: 'SentenceTransformer', model_name: str = 'all-MiniLM-L6-v2') -> np.ndarray:
     """Get cached student embedding or create and cache a new one."""
     # Try to get from cache first
-    cached_embedding = get_cached_student_embedding(profile_text)
+    cached_embedding = get_cached_student_embedding(profile_text, model_name=model_name)
     if cached_embedding is not None:
         return cached_embedding
     
     # Generate new embedding
     print(f"🔄 Generating new student profile embedding")
-    embedding = model.encode(profile_text, convert_to_tensor=True)
-    
-    # Convert to numpy for caching
-    embedding_np = embedding.cpu().numpy() if hasattr(embedding, 'cpu') else embedding
+    embedding = encode_student_profile(profile_text, model, model_name)
+    profile_cache_stats.record("encodes")
     
     # Cache it
-    set_cached_student_embedding(profile_text, embedding_np)
+    set_cached_student_embedding(profile_text, embedding, model_name)
     
     return embedding
 
-def generate_student_profile_embedding(profile_text: str, model: SentenceTransformer) -> np.ndarray:
+def generate_student_profile_embedding(profile_text: str, model: 'SentenceTransformer', model_name: str = 'all-MiniLM-L6-v2') -> np.ndarray:
     """Generate or retrieve cached student profile embedding."""
     # Get or create embedding (with caching)
-    embedding = get_or_create_student_embedding(profile_text, model)
+    embedding = get_or_create_student_embedding(profile_text, model, model_name)
     
     # Return as numpy array
     return embedding if isinstance(embedding, np.ndarray) else embedding.cpu().numpy()
 
+def precompute_student_embeddings(profile_texts: List[str], model: 'SentenceTransformer',
+                                  model_name: str = 'all-MiniLM-L6-v2') -> int:
+    """
+    Encode the uncached profiles of a batch in one model call and cache them, so the
+    per-profile pipeline that follows finds every embedding in the cache.
+    Long profiles that need chunking are left to encode_student_profile.
+    Returns:
+        Number of profiles encoded
+    """
+    pending = []
+    for text in dict.fromkeys(profile_texts):
+        if get_cached_student_embedding(text, model_name=model_name) is not None:
+            continue
+        if PROFILE_CHUNKING and len(split_profile(text, chunk_words_for_model(model))) > 1:
+            continue
+        pending.append(text)
+    if not pending:
+        return 0
+
+    print(f"🔄 Encoding {len(pending)} student profiles in one batch")
+    embeddings = model.encode(pending, show_progress_bar=False)
+    for text, embedding in zip(pending, embeddings):
+        set_cached_student_embedding(text, np.asarray(embedding), model_name)
+        profile_cache_stats.record("encodes")
+    return len(pending)
+
+# Bump when detection logic changes; edits to the reference texts or keywords change the fingerprint
+PROFILE_ANALYSIS_FORMAT = 1
+PROFILE_ANALYSIS_VERSION = f"v{PROFILE_ANALYSIS_FORMAT}-" + hashlib.sha256(json.dumps(
+    [EXPERIENCE_LEVEL_REFERENCES, LANGUAGE_KEYWORDS, PHI_LANGUAGES], sort_keys=True).encode()).hexdigest()[:8]
+
+def _get_profile_analysis_key(profile_text: str, model_name: str, use_phi: bool) -> str:
+    detector = "phi" if use_phi else "embeddings"
+    return f"profile_analysis_{PROFILE_ANALYSIS_VERSION}_{detector}_{model_name}_{_get_profile_hash(profile_text)}"
+
+def analyze_student_profile(
+        profile_text: str,
+        model: 'SentenceTransformer',
+        model_name: str = 'all-MiniLM-L6-v2',
+        use_phi: bool = False,
+    ) -> Dict:
+    """
+    Detected language, experience level, level scores and embedding of a profile.
+    The whole record is cached as one entry, so a repeated profile costs a single
+    lookup instead of separate detection, classifier and embedding steps.
+    """
+    cache_key = _get_profile_analysis_key(profile_text, model_name, use_phi)
+    try:
+        record = cache.get(cache_key)
+        if record is not None:
+            print(f"✅ Using cached profile analysis ({record['language']}, {record['experience_level']})")
+            profile_cache_stats.record("analysis_hits")
+            return record
+    except Exception as e:
+        print(f"⚠️ Error retrieving cached profile analysis: {e}")
+
+    embedding = generate_student_profile_embedding(profile_text, model, model_name)
+    language = extract_language_from_profile(profile_text, use_phi)
+    cacheable = True
+    if use_phi:
+        score = phi_predict_experience_score(profile_text)
+        level_scores = {"classifier": float(score)}
+        experience_level = phi_level_from_score(score)
+    else:
+        try:
+            level_scores = experience_level_scores(embedding, model, model_name)
+            experience_level = _best_experience_level(level_scores)
+        except Exception as e:
+            # Not cached, so the next request retries the detection
+            print(f"⚠️ Error in experience level extraction: {e}")
+            level_scores, experience_level, cacheable = {}, "any", False
+
+    record = {
+        "version": PROFILE_ANALYSIS_VERSION,
+        "language": language,
+        "experience_level": experience_level,
+        "level_scores": level_scores,
+        "embedding": embedding,
+    }
+    if cacheable:
+        try:
+            cache.set(cache_key, record, expire=PROFILE_ANALYSIS_TTL)
+            print(f"💾 Cached profile analysis")
+        except Exception as e:
+            print(f"⚠️ Failed to cache profile analysis: {e}")
+    return record
+
 def compute_similarities(student_embedding: np.ndarray, issue_embeddings: np.ndarray) -> np.ndarray:
-    from sklearn.metrics.pairwise import cosine_similarity
-    return cosine_similarity([student_embedding], issue_embeddings)[0]
+    """Cosine similarity of one profile vector against each row of issue_embeddings."""
+    student = np.asarray(student_embedding, dtype=np.float32)
+    issues = np.asarray(issue_embeddings, dtype=np.float32)
+    norms = np.linalg.norm(issues, axis=1) * (np.linalg.norm(student) or 1.0)
+    norms[norms == 0] = 1.0
+    return (issues @ student) / norms
+
+def rank_candidates(
+    issues: Union[List[Dict], IssueTable],
+    similarities: np.ndarray,
+    k: Optional[int] = None,
+    features: Optional[IssueFeatures] = None,
+    weights: Optional[Dict[str, float]] = None,
+    embeddings: Optional[np.ndarray] = None,
+    diversity: Optional[bool] = None,
+    normalized: bool = False,
+    relevance: Optional[np.ndarray] = None,
+) -> List[Tuple[Dict, float]]:
+    """
+    Top k issues (all if k is None) by similarity blended with the issue's
+    recency/stars/comments/label signals (RANKING_WEIGHTS). When embeddings
+    are given and diversity is on (DIVERSITY_ENABLED), picks are made by MMR
+    with a per-repo quota instead of plain score order. Returns
+    (issue, similarity) pairs, best first. Each returned issue is a fresh dict
+    carrying its blended "score"; only the k returned rows are materialized.
+    relevance, when given (e.g. hybrid BM25 + cosine scores), replaces the
+    similarities for ordering; the similarities are still what is returned.
+    """
+    return [candidate for _, candidate in _ranked_rows(issues, similarities, k, features, weights, embeddings,
+                                                      diversity, normalized, relevance)]
+
+def _ranked_rows(issues, similarities, k, features, weights, embeddings, diversity, normalized, relevance):
+    """rank_candidates' picks as (row index, (issue, similarity)) pairs."""
+    if diversity is None:
+        diversity = DIVERSITY_ENABLED
+    if features is None:
+        features = IssueFeatures.from_issues(issues)
+    scores = blend_scores(similarities if relevance is None else relevance, features, weights)
+    k = len(issues) if k is None else k
+    if isinstance(issues, IssueTable):
+        repo_of, row = issues.repo, issues.row
+    else:
+        repo_of = lambda i: issues[i].get("repo", "")
+        row = lambda i, **extra: {**issues[i], **extra}
+    if diversity and embeddings is not None and len(issues):
+        top = diverse_top_k(embeddings, scores, k, group_of=repo_of, normalized=normalized)
+    else:
+        top = recall_top_k(scores, k)
+    return [(int(i), (row(i, score=float(f"{scores[i]:.4f}")), float(similarities[i]))) for i in top]
 
 def rank_issues_by_similarity(
     issues: List[Dict], 
@@ -610,9 +1152,71 @@ def rank_issues_by_similarity(
     issue_embeddings: np.ndarray
 ) -> List[Tuple[Dict, float]]:
     similarities = compute_similarities(student_embedding, issue_embeddings)
-    ranked = list(zip(issues, similarities))
-    ranked.sort(key=lambda x: x[1], reverse=True)
-    return ranked
+    return rank_candidates(issues, similarities, embeddings=issue_embeddings)
+
+def _format_recommendations(ranked: List[Tuple[Dict, float, Optional[float]]]) -> List[Dict]:
+    """Issue dicts with their similarity (and rerank score when the issue was reranked)."""
+    results = []
+    for issue, score, rerank_score in ranked:
+        # rank_candidates already returned per-request copies, so annotate them in place
+        issue["similarity"] = float(f"{score:.4f}")
+        if rerank_score is not None:
+            issue["rerank_score"] = float(f"{rerank_score:.4f}")
+        results.append(issue)
+    return results
+
+def rerank_candidates(
+    profile_text: str,
+    candidates: List[Tuple[Dict, float]],
+    rerank: bool = False,
+    deadline: Optional[Deadline] = None,
+) -> List[Tuple[Dict, float, Optional[float]]]:
+    """Second stage: cross-encoder rerank of recall candidates (best first), if enabled."""
+    if not rerank or not candidates:
+        return [(issue, score, None) for issue, score in candidates]
+    # The reranker's own budget, cut to what is left of the request deadline
+    budget_ms = None if deadline is None else deadline.clamp(reranker.budget_ms / 1000) * 1000
+    try:
+        return reranker.rerank(profile_text, candidates, budget_ms)
+    except Exception as e:
+        print(f"⚠️ Rerank failed, keeping similarity order: {e}")
+        return [(issue, score, None) for issue, score in candidates]
+
+def rank_and_rerank(
+    profile_text: str,
+    issues: Union[List[Dict], IssueTable],
+    similarities: np.ndarray,
+    k: Optional[int] = None,
+    rerank: bool = False,
+    deadline: Optional[Deadline] = None,
+    features: Optional[IssueFeatures] = None,
+    embeddings: Optional[np.ndarray] = None,
+    normalized: bool = False,
+    relevance: Optional[np.ndarray] = None,
+) -> List[Tuple[Dict, float, Optional[float]]]:
+    """
+    Top k issues as (issue, similarity, rerank score) tuples, best first.
+    Without rerank this is rank_candidates. With rerank, the recall
+    candidates are picked by blended score alone, reordered by the
+    cross-encoder, and only then diversified, so MMR's picks are the last
+    word on the order rather than being undone by the reranker.
+    """
+    if not rerank:
+        return [(issue, score, None) for issue, score in rank_candidates(
+            issues, similarities, k, features, embeddings=embeddings, normalized=normalized, relevance=relevance)]
+    k = len(issues) if k is None else k
+    recalled = _ranked_rows(issues, similarities, max(k, reranker.top_k), features, None, None,
+                            False, normalized, relevance)
+    reranked = rerank_candidates(profile_text, [candidate for _, candidate in recalled], rerank, deadline)
+    if not DIVERSITY_ENABLED or embeddings is None or not reranked:
+        return reranked[:k]
+    row_of = {id(issue): i for i, (issue, _) in recalled}
+    rows = np.array([row_of[id(issue)] for issue, _, _ in reranked])
+    # Cross-encoder and recall scores are not on one scale, so MMR sees the reranked position as relevance
+    by_position = np.linspace(1.0, 0.0, len(rows), dtype=np.float32)
+    picks = diverse_top_k(np.asarray(embeddings)[rows], by_position, k,
+                          group_of=lambda p: reranked[p][0].get("repo", ""), normalized=normalized)
+    return [reranked[p] for p in picks]
 
 def recommend_issues(
     language: str = "all",
@@ -621,87 +1225,120 @@ def recommend_issues(
     student_profile: Optional[str] = None,
     model_name: str = 'all-MiniLM-L6-v2',
     use_phi: bool = True,
+    rerank: Optional[bool] = None,
+    shadow_model: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    window: Optional[int] = None,
 ) -> List[Dict]:
     
-    """Recommend GitHub issues based on student profile and experience level."""
+    """Recommend GitHub issues based on student profile and experience level.
+
+    shadow_model is the candidate compared against model_name on sampled requests
+    (SHADOW_MODEL overrides it); it never changes the returned ranking.
+    With a deadline, fetching, encoding and reranking stop when it expires and
+    the best results so far are returned; deadline.partial tells whether any
+    stage was cut short.
+    window asks for up to that many ranked results (for later pages) from the
+    candidates that are scored anyway; only per_page issues are ever fetched.
+    """
+    if rerank is None:
+        rerank = RERANK_ENABLED
+    limit = max(per_page, window or 0)
     model = create_embedding_model(model_name)
     
-    # 1. Extract programming language from profile if needed
-    if student_profile and language == "all":
-        language = extract_language_from_profile(student_profile, use_phi)
-        print(f"Detected programming language from profile: {language}")
-
-    # 2. Extract experience level from profile if needed
+    # 1-2. Language, experience level and embedding of the profile (memoized together)
+    experience_level = "any"
     if student_profile:
-        experience_level = extract_experience_level_embeddings(student_profile, model, use_phi) # 'beginner', 'intermediate', 'advanced', or 'any'
+        analysis = analyze_student_profile(student_profile, model, model_name, use_phi)
+        student_embedding = analysis["embedding"]
+        if language == "all":
+            language = analysis["language"]
+            print(f"Detected programming language from profile: {language}")
+        experience_level = analysis["experience_level"] # 'beginner', 'intermediate', 'advanced', or 'any'
         labels = EXPERIENCE_LEVEL_LABELS.get(experience_level, [])
         if labels:
             print(f"Found: {experience_level} with labels: {labels}")
 
+        # Serve from the cohort's precomputed matrix when one is available
+        artifact = cohort_registry.get(language, experience_level, model_name)
+        if artifact is not None:
+            print(f"📦 Using cohort artifact for {language}/{experience_level} ({len(artifact.issues)} issues)")
+            if artifact.features is None:
+                artifact.features = IssueFeatures.from_issues(artifact.issues)
+            results = _format_recommendations(rank_and_rerank(
+                student_profile, artifact.issues, artifact.score(student_embedding), limit, rerank, deadline,
+                artifact.features, embeddings=artifact.embeddings, normalized=True))
+            shadow_scorer.maybe_submit(student_profile, results, model_name, shadow_model)
+            return results
+
+        # Otherwise answer from the local issue index when it already holds enough issues
+        if ISSUE_INDEX_ENABLED and issue_index.count(model_name, language, experience_level) >= per_page:
+            recall_k = max(limit, reranker.top_k) if rerank else limit
+            issues, fused, similarities, embeddings = issue_index.hybrid_search(
+                student_profile, student_embedding, model_name, language, experience_level,
+                k=max(HYBRID_POOL_SIZE, recall_k))
+            print(f"🗂️ Using issue index for {language}/{experience_level} ({len(issues)} hybrid candidates)")
+            # Ordered by the fused score, but reported with the raw cosine like the other paths
+            results = _format_recommendations(rank_and_rerank(
+                student_profile, issues, similarities, limit, rerank, deadline,
+                embeddings=embeddings, normalized=True, relevance=fused))
+            shadow_scorer.maybe_submit(student_profile, results, model_name, shadow_model)
+            return results
+
     # 3. Fetch GitHub issues
-        issues = fetch_github_issues(language, per_page, top_n, experience_level)
+    issues = fetch_github_issues(language, per_page, top_n, experience_level, deadline=deadline)
     
     # 4. Rank issues by similarity to student profile if provided
-    if issues:
-        issue_embeddings = generate_issue_embeddings(issues, model)
-        student_embedding = generate_student_profile_embedding(student_profile, model)
-        ranked_issues = rank_issues_by_similarity(issues, student_embedding, issue_embeddings)
-        return [
-            {
-                **issue,
-                "similarity": float(f"{score:.4f}")
-            }
-            for issue, score in ranked_issues
-        ]
+    if issues and student_profile:
+        issues, issue_embeddings = embed_issues_within_deadline(issues, model, model_name, deadline)
+        if ISSUE_INDEX_ENABLED:
+            try:
+                issue_index.add_embeddings(model_name, issues, issue_embeddings)
+            except Exception as e:
+                print(f"⚠️ Failed to index issue embeddings: {e}")
+        similarities = compute_similarities(student_embedding, issue_embeddings)
+        results = _format_recommendations(rank_and_rerank(
+            student_profile, issues, similarities, rerank=rerank, deadline=deadline, embeddings=issue_embeddings))
+        shadow_scorer.maybe_submit(student_profile, results, model_name, shadow_model)
+        return results
     else:
         return issues
 
-def _get_cache_key(language: str, top_n: int) -> str:
-    """Generate a unique cache key for language and top_n."""
-    return f"issues_{language}_{top_n}"
+def _get_cache_key(language: str, top_n: int, experience_level: str = "any") -> str:
+    """Generate a unique cache key for language, top_n and experience level."""
+    return f"issues_{language}_{top_n}_{experience_level}"
 
-def _is_cache_expired(cache_key: str) -> bool:
-    """Check if cache entry has expired."""
-    try:
-        timestamp = cache.get(f"{cache_key}_timestamp")
-        if timestamp is None:
-            return True
-        return time.time() - timestamp > CACHE_TTL
-    except:
-        return True
-
-def get_cached_issues(language: str, top_n: int) -> Optional[List[Dict]]:
+def get_cached_issues(language: str, top_n: int, experience_level: str = "any") -> Optional[List[Dict]]:
     """Retrieve cached issues if available and not expired."""
-    cache_key = _get_cache_key(language, top_n)
-    
-    if _is_cache_expired(cache_key):
-        return None
+    cache_key = _get_cache_key(language, top_n, experience_level)
     
     try:
-        issues = cache.get(cache_key)
+        issues = issue_cache.get(cache_key)
         if issues:
             print(f"✅ Using cached issues for language: {language}, top_n: {top_n}")
             return issues
-    except:
-        pass
+    except Exception as e:
+        print(f"⚠️ Error retrieving cached issues: {e}")
     
     return None
 
-def set_cached_issues(language: str, top_n: int, issues: List[Dict]) -> None:
-    """Cache issues with timestamp."""
-    cache_key = _get_cache_key(language, top_n)
+def set_cached_issues(language: str, top_n: int, issues: List[Dict], experience_level: str = "any") -> None:
+    """Cache issues in the memory and disk tiers (expiry is stored with the entry)."""
+    cache_key = _get_cache_key(language, top_n, experience_level)
     
     try:
-        cache.set(cache_key, issues)
-        cache.set(f"{cache_key}_timestamp", time.time())
+        issue_cache.set(cache_key, issues)
         print(f"💾 Cached {len(issues)} issues for language: {language}, top_n: {top_n}")
     except Exception as e:
         print(f"⚠️ Failed to cache issues: {e}")
 
 def clear_profile_embeddings_cache() -> None:
-    """Clear all cached student profile embeddings."""
+    """Clear all cached student profile embeddings, analyses, chunk embeddings and the near-duplicate index."""
     try:
-        keys_to_delete = [key for key in cache.keys() if isinstance(key, str) and key.startswith("profile_embedding_")]
+        keys_to_delete = [
+            key for key in cache.iterkeys()
+            if isinstance(key, str) and key.startswith(("profile_embedding_", "profile_analysis_", "profile_chunk_", INDEX_KEY_PREFIX))
+        ]
         for key in keys_to_delete:
             del cache[key]
         print(f"🗑️  Cleared {len(keys_to_delete)} cached profile embeddings")
@@ -0,0 +1,47 @@
+"""
+End-to-end request deadlines.
+
+A Deadline is created once per request and passed down the pipeline (repo
+search, per-repo issue fetches, issue encoding, rerank). Each stage caps its
+own time budget and HTTP timeouts with remaining(), and skips work once the
+deadline has passed. A stage that returns less than it would have without the
+deadline calls mark_partial(), so the caller can flag the response as partial
+and avoid caching the incomplete result.
+"""
+
+import math
+import os
+import threading
+import time
+from typing import List, Optional
+
+RECOMMEND_DEADLINE_MS = float(os.getenv("RECOMMEND_DEADLINE_MS", "0"))  # 0 = no deadline
+
+
+class Deadline:
+    """Wall-clock deadline shared by every stage of one request."""
+
+    def __init__(self, budget_ms: Optional[float] = None):
+        self.budget_ms = budget_ms if budget_ms and budget_ms > 0 else None
+        self._expires_at = time.monotonic() + self.budget_ms / 1000 if self.budget_ms else math.inf
+        self._lock = threading.Lock()
+        self.partial = False
+        self.reasons: List[str] = []
+
+    def remaining(self) -> float:
+        """Seconds left (inf without a budget, never negative)."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, seconds: float) -> float:
+        """A stage's own budget, cut to what is left of the request."""
+        return min(seconds, self.remaining())
+
+    def mark_partial(self, reason: str) -> None:
+        """Record that a stage returned incomplete results (time ran out or GitHub was unavailable)."""
+        with self._lock:
+            self.partial = True
+            self.reasons.append(reason)
+        print(f"⏱️ Returning partial results: {reason}")
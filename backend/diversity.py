@@ -0,0 +1,105 @@
+"""
+Diversity-aware top-k selection over ranked issues.
+
+Maximal Marginal Relevance picks, at each step, the issue that maximizes
+    lambda * relevance - (1 - lambda) * max similarity to already picked issues
+so near-identical issues stop crowding the top of the list. A per-repo quota
+additionally caps how many picks come from one repository. Both run over
+L2-normalized embeddings with one matrix-vector product per pick: O(k * n).
+In practice selection runs over the top `pool` candidates by relevance, which
+keeps n=10k corpora in the low milliseconds (see benchmark_diversity.py).
+"""
+
+import os
+from typing import Callable, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+DIVERSITY_LAMBDA = float(os.getenv("DIVERSITY_LAMBDA", "0.7"))  # 1.0 = pure relevance
+DIVERSITY_REPO_QUOTA = int(os.getenv("DIVERSITY_REPO_QUOTA", "3"))  # 0 = no per-repo cap
+DIVERSITY_POOL_FACTOR = int(os.getenv("DIVERSITY_POOL_FACTOR", "10"))  # candidates considered per pick
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """float32 copy of embeddings with unit-length rows."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+
+def mmr_select(
+        embeddings: np.ndarray,
+        relevance: np.ndarray,
+        k: int,
+        lambda_: float = DIVERSITY_LAMBDA,
+        groups: Optional[Sequence] = None,
+        quota: int = DIVERSITY_REPO_QUOTA,
+    ) -> np.ndarray:
+    """
+    Indices of k items chosen by MMR, in pick order.
+    Args:
+        embeddings: (n, d) L2-normalized rows
+        relevance: (n,) relevance scores (higher is better)
+        lambda_: Trade-off between relevance (1.0) and novelty (0.0)
+        groups: Optional group label per item (e.g. repo); at most `quota` picks per group
+        quota: Per-group cap; once every group under the cap is exhausted the cap is
+            lifted, so k items are always returned when n >= k
+    """
+    relevance = np.asarray(relevance, dtype=np.float32)
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+
+    group_ids = None
+    if groups is not None and quota > 0:
+        _, group_ids = np.unique(np.asarray([str(g) for g in groups]), return_inverse=True)
+        group_counts = np.zeros(group_ids.max() + 1, dtype=np.int64)
+
+    max_sim = np.full(n, -1.0, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    picks = np.empty(k, dtype=np.int64)
+    weighted_relevance = lambda_ * relevance
+    for step in range(k):
+        scores = weighted_relevance - (1.0 - lambda_) * max_sim
+        eligible = available
+        if group_ids is not None:
+            under_quota = available & (group_counts[group_ids] < quota)
+            if under_quota.any():
+                eligible = under_quota
+        pick = int(np.argmax(np.where(eligible, scores, -np.inf)))
+        picks[step] = pick
+        available[pick] = False
+        if group_ids is not None:
+            group_counts[group_ids[pick]] += 1
+        np.maximum(max_sim, embeddings @ embeddings[pick], out=max_sim)
+    return picks
+
+
+def diverse_top_k(
+        embeddings: np.ndarray,
+        relevance: np.ndarray,
+        k: int,
+        lambda_: float = DIVERSITY_LAMBDA,
+        group_of: Optional[Callable[[int], Hashable]] = None,
+        quota: int = DIVERSITY_REPO_QUOTA,
+        pool_factor: int = DIVERSITY_POOL_FACTOR,
+        normalized: bool = False,
+    ) -> List[int]:
+    """
+    MMR over the top k * pool_factor items by relevance (all items if pool_factor <= 0).
+    group_of(i) gives the quota group of item i; it is only called for pooled items.
+    Returns indices into the full arrays.
+    """
+    relevance = np.asarray(relevance, dtype=np.float32)
+    n = len(relevance)
+    pool_size = n if pool_factor <= 0 else min(n, max(k, k * pool_factor))
+    if pool_size < n:
+        pool = np.argpartition(-relevance, pool_size - 1)[:pool_size]
+    else:
+        pool = np.arange(n)
+    pool_embeddings = np.asarray(embeddings)[pool]
+    if not normalized:
+        pool_embeddings = normalize_rows(pool_embeddings)
+    pool_groups = None if group_of is None else [group_of(int(i)) for i in pool]
+    picks = mmr_select(pool_embeddings, relevance[pool], k, lambda_, pool_groups, quota)
+    return [int(pool[i]) for i in picks]
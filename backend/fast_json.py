@@ -0,0 +1,54 @@
+"""
+Fast JSON responses with optional field selection.
+
+Results are serialized straight to bytes with orjson when it is installed
+(falling back to the standard json module), instead of walking every dict with
+jsonable_encoder and then serializing again. Clients can ask for a subset of
+fields (e.g. title, repo, url, similarity) so large issue bodies are never
+serialized when the frontend does not display them.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library is used instead
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    # numpy scalars/arrays and other non-JSON types that may reach a response
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "item"):
+        return obj.item()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def select_fields(items: List[Dict], fields: Optional[Iterable[str]]) -> List[Dict]:
+    """Keep only the requested fields of each item (all fields if fields is None/empty)."""
+    if not fields:
+        return items
+    fields = list(dict.fromkeys(fields))
+    return [{field: item[field] for field in fields if field in item} for item in items]
+
+
+class FastJSONResponse(Response):
+    """JSONResponse that serializes with dumps()."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
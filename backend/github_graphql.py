@@ -0,0 +1,169 @@
+"""
+GitHub GraphQL fetch backend.
+
+One query returns a batch of top repositories together with their open issues
+(optionally label-filtered by GitHub), so filling a request takes a handful of
+round trips instead of one search call plus one /issues call per repository.
+Batches are sized from GitHub's node limit and the remaining rate-limit points.
+"""
+
+import math
+import os
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from deadlines import Deadline
+from issue_features import issue_signals
+from repo_health import GITHUB_CIRCUIT
+
+GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+MAX_REPOS_PER_QUERY = 50
+MAX_ISSUES_PER_REPO = 100
+LABELS_PER_ISSUE = 20
+NODE_LIMIT = 500_000  # GitHub's per-query node limit
+MAX_QUERY_COST = 50  # rate-limit points we are willing to spend on one query
+
+ISSUES_QUERY = """
+query($q: String!, $repos: Int!, $after: String, $issues: Int!, $labels: [String!], $labelCount: Int!) {
+  rateLimit { cost remaining }
+  search(query: $q, type: REPOSITORY, first: $repos, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on Repository {
+        nameWithOwner
+        stargazerCount
+        issues(states: OPEN, first: $issues, labels: $labels, orderBy: {field: UPDATED_AT, direction: DESC}) {
+          nodes {
+            title
+            body
+            url
+            updatedAt
+            comments { totalCount }
+            labels(first: $labelCount) { nodes { name } }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def estimate_query_cost(repos: int, issues_per_repo: int) -> int:
+    """GitHub's documented cost: connection requests / 100, minimum 1."""
+    requests_made = 1 + repos + repos * issues_per_repo
+    return max(1, math.ceil(requests_made / 100))
+
+
+def plan_batch_size(issues_per_repo: int, remaining_points: Optional[int] = None) -> int:
+    """Largest repo batch that stays within the node limit, cost cap and remaining points."""
+    repos = MAX_REPOS_PER_QUERY
+    while repos > 1 and (
+        repos * issues_per_repo * (1 + LABELS_PER_ISSUE) > NODE_LIMIT
+        or estimate_query_cost(repos, issues_per_repo) > MAX_QUERY_COST
+        or (remaining_points is not None and estimate_query_cost(repos, issues_per_repo) > remaining_points)
+    ):
+        repos //= 2
+    return repos
+
+
+def fetch_issues_graphql(
+        language: Optional[str],
+        per_page: int,
+        top_n: int,
+        labels: Optional[List[str]],
+        headers: Dict[str, str],
+        match_labels: Callable[[List[str]], bool],
+        url: Optional[str] = None,
+        label_strength: Optional[Callable[[List[str]], float]] = None,
+        deadline: Optional[Deadline] = None,
+        issues_per_repo: Optional[int] = None,
+    ) -> List[Dict]:
+    """
+    Fetch open issues from the top_n most starred repositories via GraphQL.
+    Args:
+        labels: Label names GitHub should filter on (OR-ed), or None for all issues
+        match_labels: Local check applied to each issue's label names
+        issues_per_repo: Issues requested per repository (default: per_page); raise it
+            when match_labels, not labels, does the filtering
+        url: GraphQL endpoint (default: GITHUB_GRAPHQL_URL)
+        label_strength: Optional 0-1 level-signal strength for an issue's label names
+        deadline: Optional request deadline; no query is sent after it expires
+    Returns:
+        Issue dicts with the same fields as the REST backend
+    """
+    url = url or GRAPHQL_URL
+    q = "stars:>0 sort:stars-desc"
+    if language:
+        q += f" language:{language}"
+
+    issues: List[Dict] = []
+    scanned = 0
+    cursor = None
+    remaining_points = None
+    issues_per_repo = max(1, min(int(issues_per_repo or per_page), MAX_ISSUES_PER_REPO))
+
+    while len(issues) < per_page and scanned < top_n:
+        if deadline is not None and deadline.expired():
+            deadline.mark_partial(f"scanned {scanned} of {top_n} repositories via GraphQL")
+            break
+        batch = min(plan_batch_size(issues_per_repo, remaining_points), top_n - scanned)
+        if remaining_points is not None and estimate_query_cost(batch, issues_per_repo) > remaining_points:
+            print(f"⚠️ GraphQL rate limit nearly exhausted ({remaining_points} points left), stopping")
+            break
+
+        variables = {
+            "q": q,
+            "repos": batch,
+            "after": cursor,
+            "issues": issues_per_repo,
+            "labels": labels or None,
+            "labelCount": LABELS_PER_ISSUE,
+        }
+        timeout = 30 if deadline is None else min(30, max(deadline.remaining(), 1.0))
+        try:
+            r = GITHUB_CIRCUIT.post(url, headers=headers, json={"query": ISSUES_QUERY, "variables": variables}, timeout=timeout)
+        except requests.Timeout:
+            if deadline is None or not deadline.expired():
+                raise
+            deadline.mark_partial(f"GraphQL query timed out after {scanned} of {top_n} repositories")
+            break
+        r.raise_for_status()
+        payload = r.json()
+        if payload.get("errors"):
+            raise RuntimeError(f"GitHub GraphQL error: {payload['errors'][0].get('message')}")
+
+        data = payload["data"]
+        remaining_points = (data.get("rateLimit") or {}).get("remaining", remaining_points)
+        search = data["search"]
+        nodes = search.get("nodes", [])
+        scanned += len(nodes)
+
+        for node in nodes:
+            full_name = node.get("nameWithOwner", "")
+            stars = node.get("stargazerCount", 0)
+            for item in (node.get("issues") or {}).get("nodes", []):
+                label_names = [l.get("name", "") for l in (item.get("labels") or {}).get("nodes", [])]
+                if not match_labels(label_names):
+                    continue
+                issues.append({
+                    "title": item.get("title", ""),
+                    "body": item.get("body", ""),
+                    "url": item.get("url", ""),
+                    "repo": full_name,
+                    "labels": label_names,
+                    **issue_signals(stars, item.get("updatedAt"), (item.get("comments") or {}).get("totalCount", 0),
+                                    label_strength(label_names) if label_strength else 0.0),
+                })
+                if len(issues) >= per_page:
+                    break
+            if len(issues) >= per_page:
+                break
+
+        page_info = search.get("pageInfo", {})
+        if not nodes or not page_info.get("hasNextPage"):
+            break
+        cursor = page_info.get("endCursor")
+
+    return issues[:per_page]
@@ -0,0 +1,100 @@
+"""
+Paginated GET helper for the GitHub REST API.
+
+The first page is fetched on its own. When GitHub's ``Link`` header advertises
+``rel="last"`` the remaining pages are requested concurrently; otherwise
+``rel="next"`` links are followed one at a time. Every traversal is bounded by
+a page budget and a wall-clock budget, and every request goes through the
+shared GitHub circuit breaker.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from repo_health import GITHUB_CIRCUIT
+
+MAX_PAGES_PER_REPO = int(os.getenv("GITHUB_MAX_PAGES_PER_REPO", "3"))
+REPO_TIME_BUDGET = float(os.getenv("GITHUB_REPO_TIME_BUDGET", "10"))  # seconds
+PAGE_FETCH_WORKERS = int(os.getenv("GITHUB_PAGE_WORKERS", "4"))
+REQUEST_TIMEOUT = 30  # seconds
+
+
+def _page_number(link_url: str) -> Optional[int]:
+    try:
+        return int(parse_qs(urlparse(link_url).query)["page"][0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+def fetch_pages(
+        url: str,
+        headers: Dict[str, str],
+        params: Dict[str, Any],
+        max_pages: int = MAX_PAGES_PER_REPO,
+        time_budget: float = REPO_TIME_BUDGET,
+    ) -> List[Any]:
+    """
+    Fetch up to max_pages pages of a GitHub list endpoint.
+    Errors on the first page are raised; later pages that fail or miss the time
+    budget end the traversal, so the result is always a contiguous prefix.
+    Returns:
+        The decoded JSON payload of each page, in page order
+    """
+    deadline = time.monotonic() + time_budget
+
+    def remaining() -> float:
+        return max(0.0, deadline - time.monotonic())
+
+    first = GITHUB_CIRCUIT.get(url, headers=headers, params={**params, "page": 1},
+                               timeout=min(REQUEST_TIMEOUT, max(remaining(), 1.0)))
+    first.raise_for_status()
+    pages = [first.json()]
+    if max_pages <= 1:
+        return pages
+
+    links = getattr(first, "links", None) or {}
+    last_page = _page_number(links.get("last", {}).get("url", ""))
+
+    if last_page:
+        numbers = list(range(2, min(last_page, max_pages) + 1))
+        if not numbers:
+            return pages
+
+        def get_page(n: int):
+            # Timed when the request starts, not when it was queued, so no page outlives the budget
+            if remaining() <= 0:
+                raise requests.Timeout(f"time budget spent before page {n}")
+            return GITHUB_CIRCUIT.get(url, headers=headers, params={**params, "page": n},
+                                      timeout=min(REQUEST_TIMEOUT, max(remaining(), 1.0)))
+
+        executor = ThreadPoolExecutor(max_workers=min(PAGE_FETCH_WORKERS, len(numbers)))
+        futures = [executor.submit(get_page, n) for n in numbers]
+        wait(futures, timeout=remaining())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for future in futures:
+            if not future.done() or future.cancelled() or future.exception() is not None:
+                print(f"⚠️ Stopped paging {url} after {len(pages)} pages (budget or error)")
+                break
+            resp = future.result()
+            if resp.status_code >= 400:
+                print(f"⚠️ Page fetch failed for {url}: HTTP {resp.status_code}")
+                break
+            pages.append(resp.json())
+        return pages
+
+    next_url = links.get("next", {}).get("url")
+    while next_url and len(pages) < max_pages and remaining() > 0:
+        try:
+            resp = GITHUB_CIRCUIT.get(next_url, headers=headers, timeout=min(REQUEST_TIMEOUT, max(remaining(), 1.0)))
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            print(f"⚠️ Page fetch failed for {url}: {e}")
+            break
+        pages.append(resp.json())
+        next_url = (getattr(resp, "links", None) or {}).get("next", {}).get("url")
+    return pages
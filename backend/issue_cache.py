@@ -0,0 +1,135 @@
+"""
+Two-tier cache for fetched GitHub issue lists.
+
+Hot entries live in an in-process LRU as ready-to-use lists of issue dicts.
+Behind it, diskcache holds one compact columnar record per key with its expiry
+and the issue bodies stored inline. Every reader needs the bodies (embedding
+cache keys hash title + body, and responses include them), so keeping them in
+the record makes a disk hit a single lookup.
+"""
+
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+RECORD_VERSION = 2  # 1 kept the bodies under a second key
+
+
+def encode_issues(issues: List[Dict]) -> Dict[str, Any]:
+    """Encode issue dicts as a columnar record."""
+    order: List[str] = []
+    for issue in issues:
+        for field in issue:
+            if field not in order:
+                order.append(field)
+    fields = [field for field in order if field not in ("body", "repo")]
+
+    repos: List[str] = []
+    repo_index: Dict[str, int] = {}
+    repo_ids = array("I")
+    columns: Dict[str, List[Any]] = {field: [] for field in fields}
+    bodies: List[str] = []
+
+    for issue in issues:
+        repo = issue.get("repo", "")
+        if repo not in repo_index:
+            repo_index[repo] = len(repos)
+            repos.append(repo)
+        repo_ids.append(repo_index[repo])
+        for field in fields:
+            columns[field].append(issue.get(field))
+        bodies.append(issue.get("body") or "")
+
+    record = {
+        "version": RECORD_VERSION,
+        "count": len(issues),
+        "repos": repos,
+        "repo_ids": repo_ids,
+        "columns": columns,
+        "order": order,
+        "bodies": bodies,
+    }
+    return record
+
+
+def decode_issues(record: Dict[str, Any]) -> List[Dict]:
+    """Rebuild issue dicts from a columnar record."""
+    repos = [sys.intern(repo) for repo in record["repos"]]
+    repo_ids = record["repo_ids"]
+    columns = record["columns"]
+    bodies = record["bodies"]
+    issues = []
+    for i in range(record["count"]):
+        issue = {}
+        for field in record["order"]:
+            if field == "body":
+                issue["body"] = bodies[i]
+            elif field == "repo":
+                issue["repo"] = repos[repo_ids[i]]
+            else:
+                issue[field] = columns[field][i]
+        issues.append(issue)
+    return issues
+
+
+class TieredIssueCache:
+    """In-process LRU of decoded issue lists in front of a diskcache tier."""
+
+    def __init__(self, disk, ttl: int, max_memory_entries: int = 32):
+        self.disk = disk
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def get(self, cache_key: str) -> Optional[List[Dict]]:
+        """
+        Return the cached list, or None if missing or expired. Each call gets its own
+        issue dicts; nested values such as label lists are shared and must not be mutated.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                expires_at, issues = entry
+                if expires_at > now:
+                    self._memory.move_to_end(cache_key)
+                    self.stats["memory_hits"] += 1
+                    return [dict(issue) for issue in issues]
+                del self._memory[cache_key]
+
+        record = self.disk.get(cache_key)
+        if not isinstance(record, dict) or record.get("version") != RECORD_VERSION \
+                or record.get("expires_at", 0) <= now:
+            self.stats["misses"] += 1
+            return None
+
+        issues = decode_issues(record)
+        self.stats["disk_hits"] += 1
+        self._remember(cache_key, record["expires_at"], issues)
+        return [dict(issue) for issue in issues]
+
+    def set(self, cache_key: str, issues: List[Dict]) -> None:
+        """Store issues in both tiers with a shared expiry."""
+        expires_at = time.time() + self.ttl
+        record = encode_issues(issues)
+        record["expires_at"] = expires_at
+        self.disk.set(cache_key, record, expire=self.ttl)
+        # Copies, so later changes to the caller's dicts do not leak into the cache
+        self._remember(cache_key, expires_at, [dict(issue) for issue in issues])
+
+    def clear_memory(self) -> None:
+        """Drop the in-process tier (the disk tier is left untouched)."""
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, cache_key: str, expires_at: float, issues: List[Dict]) -> None:
+        with self._lock:
+            self._memory[cache_key] = (expires_at, issues)
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,121 @@
+"""
+Per-issue ranking signals and vectorized multi-signal scoring.
+
+Fetchers attach raw signals to each issue dict (repo stars, updated_at, comment
+count, label strength for the requested level). IssueFeatures turns a list of
+issues into parallel NumPy columns once, and blend_scores combines them with
+cosine similarity using configurable weights in a few array operations, so
+ranking a large corpus needs no per-issue Python logic.
+"""
+
+import math
+import os
+import time
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from issue_records import IssueTable, parse_timestamp
+
+RECENCY_HALF_LIFE_DAYS = float(os.getenv("RANKING_RECENCY_HALF_LIFE_DAYS", "30"))
+STARS_SCALE = 100_000  # stars at which the popularity signal saturates
+COMMENTS_SCALE = 50  # comments at which the discussion signal saturates
+
+DEFAULT_WEIGHTS = {
+    "similarity": 1.0,
+    "recency": 0.1,
+    "stars": 0.05,
+    # Long threads are usually contested or stale, which is a worse start for newcomers
+    "comments": -0.05,
+    "label": 0.1,
+}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parse "similarity=1,recency=0.2" on top of DEFAULT_WEIGHTS."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Unknown ranking signal '{name}', expected one of {sorted(DEFAULT_WEIGHTS)}")
+        weights[name] = float(value)
+    return weights
+
+
+RANKING_WEIGHTS = parse_weights(os.getenv("RANKING_WEIGHTS", ""))
+
+
+def issue_signals(stars: int, updated_at: Optional[str], comments: int, label_strength: float) -> Dict:
+    """Signal fields stored on an issue dict at fetch time."""
+    return {
+        "stars": int(stars or 0),
+        "updated_at": updated_at,
+        "comments": int(comments or 0),
+        "label_strength": float(label_strength),
+    }
+
+
+class IssueFeatures:
+    """Column-oriented ranking signals for a list of issues."""
+
+    __slots__ = ("stars", "updated_ts", "comments", "label_strength")
+
+    def __init__(self, stars: np.ndarray, updated_ts: np.ndarray, comments: np.ndarray,
+                 label_strength: np.ndarray):
+        self.stars = stars
+        self.updated_ts = updated_ts
+        self.comments = comments
+        self.label_strength = label_strength
+
+    @classmethod
+    def from_issues(cls, issues: Union[List[Dict], IssueTable]) -> "IssueFeatures":
+        """Build columns from issue dicts; missing signals become neutral (0 / NaN)."""
+        if isinstance(issues, IssueTable):
+            # The table already holds typed columns; only a dtype conversion is needed
+            return cls(
+                stars=np.asarray(issues.stars, dtype=np.float32),
+                updated_ts=np.frombuffer(issues.updated_ts, dtype=np.float64),
+                comments=np.asarray(issues.comments, dtype=np.float32),
+                label_strength=np.frombuffer(issues.label_strength, dtype=np.float32),
+            )
+        return cls(
+            stars=np.fromiter((issue.get("stars") or 0 for issue in issues), dtype=np.float32, count=len(issues)),
+            updated_ts=np.fromiter((parse_timestamp(issue.get("updated_at")) for issue in issues),
+                                   dtype=np.float64, count=len(issues)),
+            comments=np.fromiter((issue.get("comments") or 0 for issue in issues), dtype=np.float32,
+                                 count=len(issues)),
+            label_strength=np.fromiter((issue.get("label_strength") or 0.0 for issue in issues),
+                                       dtype=np.float32, count=len(issues)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.stars)
+
+    def signals(self, now: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Each signal scaled to [0, 1]."""
+        now = time.time() if now is None else now
+        age_days = np.maximum(now - self.updated_ts, 0) / 86400
+        recency = np.nan_to_num(np.exp2(-age_days / RECENCY_HALF_LIFE_DAYS), nan=0.0)
+        return {
+            "recency": recency.astype(np.float32),
+            "stars": np.minimum(np.log1p(self.stars) / math.log1p(STARS_SCALE), 1.0),
+            "comments": np.minimum(np.log1p(self.comments) / math.log1p(COMMENTS_SCALE), 1.0),
+            "label": np.clip(self.label_strength, 0.0, 1.0),
+        }
+
+
+def blend_scores(similarities: np.ndarray, features: IssueFeatures,
+                 weights: Optional[Dict[str, float]] = None, now: Optional[float] = None) -> np.ndarray:
+    """Weighted sum of similarity and the scaled signals, one value per issue."""
+    weights = RANKING_WEIGHTS if weights is None else weights
+    scores = weights.get("similarity", 1.0) * np.asarray(similarities, dtype=np.float32)
+    if len(features) != len(scores):
+        raise ValueError(f"{len(features)} feature rows for {len(scores)} similarities")
+    for name, column in features.signals(now).items():
+        weight = weights.get(name, 0.0)
+        if weight:
+            scores = scores + weight * column
+    return scores
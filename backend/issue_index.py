@@ -0,0 +1,254 @@
+"""
+SQLite issue index with FTS5 and hybrid lexical + vector retrieval.
+
+Fetched issues are written to a SQLite database instead of living only as
+pickled lists in the cache. Titles and bodies are indexed with FTS5, and repo,
+language, experience level and updated_at are indexed columns. L2-normalized
+embeddings are stored per model next to the rows. hybrid_search filters by
+language and level in SQL, scores the filtered issues with BM25 (FTS5) and
+cosine similarity, and fuses the two min-max normalized scores, so a request can
+be answered from local data in milliseconds without any GitHub calls. The file
+can be opened read-only (ISSUE_INDEX_READONLY=1) by workers that only serve.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ISSUE_INDEX_PATH = os.getenv("ISSUE_INDEX_PATH", "/tmp/github_issues_cache/issue_index.db")
+ISSUE_INDEX_READONLY = os.getenv("ISSUE_INDEX_READONLY", "0") == "1"
+HYBRID_ALPHA = float(os.getenv("HYBRID_ALPHA", "0.7"))  # weight of cosine vs. BM25 in the fused score
+MAX_QUERY_TERMS = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    repo TEXT NOT NULL,
+    language TEXT,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    stars INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    updated_at TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_language ON issues (language, indexed_at);
+CREATE INDEX IF NOT EXISTS issues_repo ON issues (repo);
+CREATE INDEX IF NOT EXISTS issues_updated ON issues (updated_at);
+CREATE TABLE IF NOT EXISTS issue_levels (
+    level TEXT NOT NULL,
+    issue_id INTEGER NOT NULL,
+    label_strength REAL NOT NULL,
+    PRIMARY KEY (level, issue_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS issue_embeddings (
+    model TEXT NOT NULL,
+    issue_id INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model, issue_id)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+    title, body, content='issues', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
+    INSERT INTO issues_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_ad AFTER DELETE ON issues BEGIN
+    INSERT INTO issues_fts (issues_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE OF title, body ON issues BEGIN
+    INSERT INTO issues_fts (issues_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO issues_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_au_stale AFTER UPDATE OF title, body ON issues
+WHEN old.title IS NOT new.title OR old.body IS NOT new.body BEGIN
+    DELETE FROM issue_embeddings WHERE issue_id = old.id;
+END;
+"""
+
+_TERM = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]", re.IGNORECASE)
+
+
+def fts_query(text: str, max_terms: int = MAX_QUERY_TERMS) -> Optional[str]:
+    """OR-query of the distinct words of free text, quoted so FTS5 syntax in it is inert."""
+    terms = list(dict.fromkeys(term.lower() for term in _TERM.findall(text) if len(term) > 1))[:max_terms]
+    if not terms:
+        return None
+    return " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _min_max(values: np.ndarray) -> np.ndarray:
+    span = float(values.max() - values.min()) if len(values) else 0.0
+    if span <= 0:
+        return np.ones_like(values) if len(values) else values
+    return (values - values.min()) / span
+
+
+class IssueIndex:
+    """Issues, their levels and per-model embeddings in one SQLite file (one connection per thread)."""
+
+    def __init__(self, path: str = ISSUE_INDEX_PATH, readonly: bool = ISSUE_INDEX_READONLY,
+                 max_age: int = 3600):
+        self.path = path
+        self.readonly = readonly
+        self.max_age = max_age
+        self._local = threading.local()
+
+    def _connect(self, write: bool = False) -> Optional[sqlite3.Connection]:
+        if write and self.readonly:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.readonly or not write:
+                if not os.path.exists(self.path):
+                    return None  # nothing indexed yet
+            if self.readonly:
+                conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+            else:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def add_issues(self, issues: Sequence[Dict], language: Optional[str], experience_level: str) -> int:
+        """Insert or refresh fetched issues and tag them with the level they were fetched for."""
+        conn = self._connect(write=True)
+        if conn is None or not issues:
+            return 0
+        language = None if not language or language == "all" else language.lower()
+        now = time.time()
+        with conn:
+            for issue in issues:
+                conn.execute(
+                    "INSERT INTO issues (url, repo, language, title, body, labels, stars, comments, updated_at, indexed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (url) DO UPDATE SET repo = excluded.repo,"
+                    " language = COALESCE(excluded.language, issues.language), title = excluded.title,"
+                    " body = excluded.body, labels = excluded.labels, stars = excluded.stars,"
+                    " comments = excluded.comments, updated_at = excluded.updated_at, indexed_at = excluded.indexed_at",
+                    (issue.get("url", ""), issue.get("repo", ""), language, issue.get("title") or "",
+                     issue.get("body") or "", json.dumps(issue.get("labels") or []), int(issue.get("stars") or 0),
+                     int(issue.get("comments") or 0), issue.get("updated_at"), now),
+                )
+                if experience_level != "any":
+                    conn.execute(
+                        "INSERT OR REPLACE INTO issue_levels (level, issue_id, label_strength)"
+                        " SELECT ?, id, ? FROM issues WHERE url = ?",
+                        (experience_level, float(issue.get("label_strength") or 0.0), issue.get("url", "")),
+                    )
+        return len(issues)
+
+    def add_embeddings(self, model_name: str, issues: Sequence[Dict], embeddings: np.ndarray) -> None:
+        """Store the embeddings of indexed issues (matched by URL) for a model."""
+        conn = self._connect(write=True)
+        if conn is None or not len(issues):
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO issue_embeddings (model, issue_id, vector)"
+                " SELECT ?, id, ? FROM issues WHERE url = ?",
+                [(model_name, vector.tobytes(), issue.get("url", "")) for issue, vector in zip(issues, vectors)],
+            )
+
+    def _filter(self, model_name: str, language: Optional[str], experience_level: str) -> Tuple[str, List]:
+        """FROM/WHERE clause selecting fresh, embedded issues for the language and level."""
+        clause = (" FROM issues i JOIN issue_embeddings e ON e.issue_id = i.id AND e.model = ?"
+                  " LEFT JOIN issue_levels l ON l.issue_id = i.id AND l.level = ?"
+                  " WHERE i.indexed_at >= ?")
+        params: List = [model_name, experience_level, time.time() - self.max_age]
+        if language and language != "all":
+            clause += " AND i.language = ?"
+            params.append(language.lower())
+        if experience_level != "any":
+            clause += " AND l.issue_id IS NOT NULL"
+        return clause, params
+
+    def count(self, model_name: str, language: Optional[str], experience_level: str) -> int:
+        """Fresh issues with embeddings for the language and level."""
+        conn = self._connect()
+        if conn is None:
+            return 0
+        clause, params = self._filter(model_name, language, experience_level)
+        try:
+            return conn.execute("SELECT COUNT(*)" + clause, params).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"⚠️ Error reading issue index: {e}")
+            return 0
+
+    def hybrid_search(
+            self,
+            query_text: str,
+            query_vector: np.ndarray,
+            model_name: str,
+            language: Optional[str] = None,
+            experience_level: str = "any",
+            k: int = 100,
+            alpha: float = HYBRID_ALPHA,
+        ) -> Tuple[List[Dict], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Top k filtered issues by alpha * cosine + (1 - alpha) * BM25 (both min-max normalized).
+        Only ids and vectors are read for scoring; issue rows are loaded for the top k.
+        Returns:
+            (issue dicts, fused scores, cosine similarities, normalized embeddings), best first
+        """
+        conn = self._connect()
+        empty = ([], np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32), np.zeros((0, 0), dtype=np.float32))
+        if conn is None:
+            return empty
+        clause, params = self._filter(model_name, language, experience_level)
+        rows = conn.execute("SELECT i.id, COALESCE(l.label_strength, 0), e.vector" + clause, params).fetchall()
+        if not rows:
+            return empty
+
+        ids = [row[0] for row in rows]
+        matrix = np.frombuffer(b"".join(row[2] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        query = np.asarray(query_vector, dtype=np.float32)
+        cosine = matrix @ (query / (np.linalg.norm(query) or 1.0))
+
+        lexical = np.zeros(len(rows), dtype=np.float32)
+        match = fts_query(query_text)
+        if match:
+            # bm25() is lower-is-better; negate so higher means more relevant. Only filtered rows are scored.
+            position = {issue_id: i for i, issue_id in enumerate(ids)}
+            for rowid, score in conn.execute(
+                    "SELECT rowid, -bm25(issues_fts) FROM issues_fts WHERE issues_fts MATCH ?"
+                    " AND rowid IN (SELECT i.id" + clause + ")", [match, *params]):
+                if rowid in position:
+                    lexical[position[rowid]] = score
+
+        fused = alpha * _min_max(cosine) + (1 - alpha) * _min_max(lexical)
+        top = np.argsort(-fused, kind="stable")[:k]
+        top_ids = [ids[i] for i in top]
+        details = {}
+        for start in range(0, len(top_ids), 500):
+            chunk = top_ids[start:start + 500]
+            details.update((row[0], row[1:]) for row in conn.execute(
+                "SELECT id, url, repo, title, body, labels, stars, comments, updated_at FROM issues"
+                f" WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+        issues = []
+        for i, issue_id in zip(top, top_ids):
+            url, repo, title, body, labels, stars, comments, updated_at = details[issue_id]
+            issues.append({"title": title, "body": body, "url": url, "repo": repo, "labels": json.loads(labels),
+                           "stars": stars, "updated_at": updated_at, "comments": comments,
+                           "label_strength": rows[i][1]})
+        return issues, fused[top].astype(np.float32), cosine[top].astype(np.float32), matrix[top]
+
+    def stats(self) -> Dict:
+        conn = self._connect()
+        if conn is None:
+            return {"issues": 0}
+        issues = conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+        models = dict(conn.execute("SELECT model, COUNT(*) FROM issue_embeddings GROUP BY model").fetchall())
+        return {"issues": issues, "embeddings": models, "readonly": self.readonly}
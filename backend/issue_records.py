@@ -0,0 +1,162 @@
+"""
+Compact struct-of-arrays storage for large issue corpora.
+
+A list of issue dicts costs a dict, a duplicated repo string, a URL string and
+the full body per issue. IssueTable keeps one column per field instead:
+interned repo names referenced by index, issue numbers instead of URLs where
+the URL follows the usual github.com pattern, numeric signals in typed arrays
+and bodies loaded only when a row that needs them is materialized. Rows are
+turned back into plain dicts one at a time (e.g. only for the returned page),
+and the columns serialize to JSON/pickle without per-issue objects.
+"""
+
+import math
+import re
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+_ISSUE_URL = re.compile(r"^https://github\.com/([^/]+/[^/]+)/issues/(\d+)$")
+
+TABLE_FORMAT = 1
+
+
+def parse_timestamp(value: Optional[str]) -> float:
+    """ISO-8601 (GitHub "...Z") to epoch seconds; NaN when missing or invalid."""
+    if not value:
+        return math.nan
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return math.nan
+
+
+def _isoformat(ts: float) -> Optional[str]:
+    if math.isnan(ts):
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class IssueTable:
+    """Column-oriented issue collection; indexing returns a plain issue dict."""
+
+    __slots__ = ("titles", "repos", "repo_ids", "numbers", "url_overrides", "labels", "stars",
+                 "comments", "updated_ts", "label_strength", "_bodies", "_body_loader")
+
+    def __init__(self, body_loader: Optional[Callable[[], List[str]]] = None):
+        self.titles: List[str] = []
+        self.repos: List[str] = []
+        self.repo_ids = array("I")
+        self.numbers = array("q")  # -1 where the URL is not a standard issue URL
+        self.url_overrides: Dict[int, str] = {}
+        self.labels: List[tuple] = []
+        self.stars = array("q")
+        self.comments = array("q")
+        self.updated_ts = array("d")
+        self.label_strength = array("f")
+        self._bodies: Optional[List[str]] = None
+        self._body_loader = body_loader
+
+    @classmethod
+    def from_dicts(cls, issues: Sequence[Dict]) -> "IssueTable":
+        table = cls()
+        table._bodies = []
+        repo_index: Dict[str, int] = {}
+        for i, issue in enumerate(issues):
+            repo = issue.get("repo", "")
+            if repo not in repo_index:
+                repo_index[repo] = len(table.repos)
+                table.repos.append(sys.intern(repo))
+            table.repo_ids.append(repo_index[repo])
+
+            url = issue.get("url", "")
+            match = _ISSUE_URL.match(url)
+            if match and match.group(1) == repo:
+                table.numbers.append(int(match.group(2)))
+            else:
+                table.numbers.append(-1)
+                table.url_overrides[i] = url
+
+            table.titles.append(issue.get("title", ""))
+            table.labels.append(tuple(sys.intern(str(name)) for name in issue.get("labels") or ()))
+            table.stars.append(int(issue.get("stars") or 0))
+            table.comments.append(int(issue.get("comments") or 0))
+            table.updated_ts.append(parse_timestamp(issue.get("updated_at")))
+            table.label_strength.append(float(issue.get("label_strength") or 0.0))
+            table._bodies.append(issue.get("body") or "")
+        return table
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __getitem__(self, i: int) -> Dict:
+        return self.row(i)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.row(i) for i in range(len(self)))
+
+    def repo(self, i: int) -> str:
+        return self.repos[self.repo_ids[i]]
+
+    def url(self, i: int) -> str:
+        number = self.numbers[i]
+        if number < 0:
+            return self.url_overrides.get(i, "")
+        return f"https://github.com/{self.repo(i)}/issues/{number}"
+
+    def bodies(self) -> List[str]:
+        """All bodies, loaded on first use."""
+        if self._bodies is None:
+            bodies = self._body_loader() if self._body_loader else None
+            self._bodies = bodies if bodies is not None and len(bodies) == len(self) else [""] * len(self)
+        return self._bodies
+
+    def row(self, i: int, include_body: bool = True, **extra) -> Dict:
+        """Materialize one issue as a dict (plus any extra fields, e.g. scores)."""
+        issue = {"title": self.titles[i]}
+        if include_body:
+            issue["body"] = self.bodies()[i]
+        issue.update({
+            "url": self.url(i),
+            "repo": self.repo(i),
+            "labels": list(self.labels[i]),
+            "stars": self.stars[i],
+            "updated_at": _isoformat(self.updated_ts[i]),
+            "comments": self.comments[i],
+            "label_strength": round(self.label_strength[i], 4),
+        })
+        issue.update(extra)
+        return issue
+
+    def to_columns(self) -> Dict:
+        """JSON-serializable columns (bodies excluded, see bodies())."""
+        return {
+            "format": TABLE_FORMAT,
+            "titles": self.titles,
+            "repos": self.repos,
+            "repo_ids": self.repo_ids.tolist(),
+            "numbers": self.numbers.tolist(),
+            "url_overrides": {str(i): url for i, url in self.url_overrides.items()},
+            "labels": [list(names) for names in self.labels],
+            "stars": self.stars.tolist(),
+            "comments": self.comments.tolist(),
+            # JSON has no NaN; missing timestamps are stored as null
+            "updated_ts": [None if math.isnan(ts) else ts for ts in self.updated_ts],
+            "label_strength": self.label_strength.tolist(),
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict, body_loader: Optional[Callable[[], List[str]]] = None) -> "IssueTable":
+        table = cls(body_loader)
+        table.titles = columns["titles"]
+        table.repos = [sys.intern(repo) for repo in columns["repos"]]
+        table.repo_ids = array("I", columns["repo_ids"])
+        table.numbers = array("q", columns["numbers"])
+        table.url_overrides = {int(i): url for i, url in columns["url_overrides"].items()}
+        table.labels = [tuple(sys.intern(name) for name in names) for names in columns["labels"]]
+        table.stars = array("q", columns["stars"])
+        table.comments = array("q", columns["comments"])
+        table.updated_ts = array("d", (math.nan if ts is None else ts for ts in columns["updated_ts"]))
+        table.label_strength = array("f", columns["label_strength"])
+        return table
@@ -0,0 +1,129 @@
+"""
+Incremental sync of open GitHub issues into a persistent local store.
+
+Each repository keeps an ``updated_at`` watermark next to its open issues.
+A refresh asks GitHub only for issues updated since that watermark and applies
+edits, label changes and closures to the stored copy, so refresh cost scales
+with churn instead of corpus size.
+"""
+
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from github_pagination import fetch_pages, REPO_TIME_BUDGET
+
+STORE_KEY_PREFIX = "issue_store_"
+SYNC_PAGE_SIZE = 100
+SYNC_MAX_PAGES = 10
+
+
+class IssueStore:
+    """Per-repo open issues and sync watermarks persisted in diskcache."""
+
+    def __init__(self, disk):
+        self.disk = disk
+        self._lock = threading.Lock()
+
+    def _key(self, full_name: str) -> str:
+        return f"{STORE_KEY_PREFIX}{full_name}"
+
+    def load(self, full_name: str) -> Dict:
+        """Return the stored record for a repo: its watermark and open issues by number."""
+        record = self.disk.get(self._key(full_name))
+        if record is None:
+            return {"watermark": None, "issues": {}}
+        return record
+
+    def watermark(self, full_name: str) -> Optional[str]:
+        return self.load(full_name)["watermark"]
+
+    def open_issues(self, full_name: str) -> List[Dict]:
+        """Stored open issues for a repo, most recently updated first."""
+        issues = list(self.load(full_name)["issues"].values())
+        issues.sort(key=lambda issue: issue.get("updated_at") or "", reverse=True)
+        return issues
+
+    def apply(self, full_name: str, items: List[Dict]) -> Tuple[Set[int], Set[int]]:
+        """
+        Apply raw GitHub issue payloads to the stored repo.
+        Returns:
+            (touched, closed) issue numbers
+        """
+        touched: Set[int] = set()
+        closed: Set[int] = set()
+        with self._lock:
+            record = self.load(full_name)
+            issues = record["issues"]
+            watermark = record["watermark"]
+
+            for item in items:
+                updated_at = item.get("updated_at")
+                if updated_at and (watermark is None or updated_at > watermark):
+                    watermark = updated_at
+                if "pull_request" in item:
+                    continue
+                number = item.get("number")
+                if item.get("state") == "closed":
+                    if issues.pop(number, None) is not None:
+                        closed.add(number)
+                    continue
+                issues[number] = _issue_record(item, full_name)
+                touched.add(number)
+
+            record["watermark"] = watermark
+            self.disk.set(self._key(full_name), record)
+        return touched, closed
+
+    def clear(self) -> int:
+        """Remove every stored repo. Returns the number of repos removed."""
+        keys = [k for k in self.disk.iterkeys() if isinstance(k, str) and k.startswith(STORE_KEY_PREFIX)]
+        for key in keys:
+            self.disk.delete(key)
+        return len(keys)
+
+
+def _issue_record(item: Dict, full_name: str) -> Dict:
+    return {
+        "number": item.get("number"),
+        "title": item.get("title", ""),
+        "body": item.get("body", ""),
+        "url": item.get("html_url", ""),
+        "repo": full_name,
+        "labels": [str(l.get("name", "")) for l in item.get("labels", [])],
+        "updated_at": item.get("updated_at"),
+        "comments": item.get("comments", 0),
+    }
+
+
+def sync_repo_issues(
+        owner: str,
+        repo: str,
+        store: IssueStore,
+        headers: Dict[str, str],
+        max_pages: int = SYNC_MAX_PAGES,
+        time_budget: float = REPO_TIME_BUDGET,
+    ) -> Tuple[Set[int], Set[int]]:
+    """
+    Bring the stored copy of a repo's open issues up to date.
+    The first sync reads the most recently updated open issues; later syncs pass
+    the stored watermark as ``since`` and include closed issues so they can be
+    dropped from the store.
+    Returns:
+        (touched, closed) issue numbers
+    """
+    full_name = f"{owner}/{repo}"
+    url = f"https://api.github.com/repos/{full_name}/issues"
+    watermark = store.watermark(full_name)
+    params = {"per_page": SYNC_PAGE_SIZE}
+    if watermark:
+        params.update({"state": "all", "since": watermark, "sort": "updated", "direction": "asc"})
+    else:
+        params.update({"state": "open", "sort": "updated", "direction": "desc"})
+
+    pages = fetch_pages(url, headers, params, max_pages=max_pages, time_budget=time_budget)
+    items = [item for page in pages for item in page]
+
+    touched, closed = store.apply(full_name, items)
+    if touched or closed:
+        print(f"🔁 Synced {full_name}: {len(touched)} updated, {len(closed)} closed")
+    return touched, closed
@@ -0,0 +1,158 @@
+"""
+Compiled experience-level classifier for GitHub issue labels.
+
+Labels are normalized (case, unicode, emoji, separators) before being matched
+against exact names, word-prefix rules, regex rules and an alias table. The
+rule set is compiled once and each distinct label is classified only once.
+"""
+
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+_EMOJI_SHORTCODE = re.compile(r":[a-z0-9_+\-]+:")
+_SEPARATORS = re.compile(r"[\s\-_/.:|,()\[\]]+")
+
+MAX_CACHED_DECISIONS = 10_000
+
+
+def normalize_label(label: str) -> str:
+    """Casefold, drop emoji and symbols, and collapse separators to single spaces."""
+    text = unicodedata.normalize("NFKC", str(label)).casefold()
+    text = _EMOJI_SHORTCODE.sub(" ", text)
+    text = "".join(ch for ch in text if not unicodedata.category(ch).startswith(("S", "C")))
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+class LabelMatcher:
+    """Classify label names into experience levels using precompiled rules."""
+
+    def __init__(
+            self,
+            exact: Dict[str, List[str]],
+            prefixes: Optional[Dict[str, List[str]]] = None,
+            patterns: Optional[Dict[str, List[str]]] = None,
+            aliases: Optional[Dict[str, str]] = None,
+            aliases_path: Optional[str] = None,
+            learn: bool = False,
+            min_support: int = 10,
+            min_purity: float = 0.9,
+        ):
+        self._exact: Dict[str, set] = defaultdict(set)
+        self._spellings: Dict[str, set] = defaultdict(set)
+        spellings: Dict[str, Dict[str, set]] = defaultdict(lambda: defaultdict(set))
+        for level, names in exact.items():
+            for name in names:
+                spellings[normalize_label(name)][name.strip().casefold()].add(level)
+        for name, by_spelling in spellings.items():
+            level_sets = list(by_spelling.values())
+            # Normalization must not move a label across levels: when spellings that normalize alike
+            # belong to different levels ("help wanted" vs "help-wanted"), only those exact spellings count
+            self._exact[name] = set.intersection(*level_sets)
+            if any(levels != level_sets[0] for levels in level_sets):
+                for spelling, levels in by_spelling.items():
+                    self._spellings[spelling] = levels
+
+        self._prefix_rules = {
+            level: re.compile(r"^(?:%s)\b" % "|".join(re.escape(normalize_label(p)) for p in rules))
+            for level, rules in (prefixes or {}).items() if rules
+        }
+        self._pattern_rules = {
+            level: re.compile("|".join(f"(?:{p})" for p in rules))
+            for level, rules in (patterns or {}).items() if rules
+        }
+
+        self.aliases_path = aliases_path
+        self._aliases: Dict[str, str] = {}
+        if aliases_path and os.path.exists(aliases_path):
+            try:
+                with open(aliases_path, "r", encoding="utf-8") as f:
+                    self._aliases.update({normalize_label(k): v for k, v in json.load(f).items()})
+            except Exception as e:
+                print(f"⚠️ Failed to load label aliases: {e}")
+        self._aliases.update({normalize_label(k): v for k, v in (aliases or {}).items()})
+
+        self.learn = learn
+        self.min_support = min_support
+        self.min_purity = min_purity
+        self._cooccurrence: Dict[str, Counter] = defaultdict(Counter)
+        self._decisions: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, label: str) -> FrozenSet[str]:
+        """Return the experience levels a single label indicates (possibly empty)."""
+        decision = self._decisions.get(label)
+        if decision is not None:
+            return decision
+
+        name = normalize_label(label)
+        levels = set(self._spellings.get(str(label).strip().casefold(), self._exact.get(name, ())))
+        if name in self._aliases:
+            levels.add(self._aliases[name])
+        for level, rule in self._prefix_rules.items():
+            if rule.match(name):
+                levels.add(level)
+        for level, rule in self._pattern_rules.items():
+            if rule.search(name):
+                levels.add(level)
+
+        decision = frozenset(levels)
+        if len(self._decisions) >= MAX_CACHED_DECISIONS:
+            self._decisions.clear()
+        self._decisions[label] = decision
+        return decision
+
+    def matches(self, label_names: Iterable[str], experience_level: str) -> bool:
+        """True if any label indicates the level ("any" matches everything)."""
+        if experience_level == "any":
+            return True
+        label_names = list(label_names)
+        if self.learn:
+            self.observe(label_names)
+        return any(experience_level in self.classify(name) for name in label_names)
+
+    def add_alias(self, label: str, level: str) -> None:
+        """Map a label to a level and persist it to aliases_path if configured."""
+        with self._lock:
+            self._aliases[normalize_label(label)] = level
+            self._decisions.clear()
+            if self.aliases_path:
+                try:
+                    with open(self.aliases_path, "w", encoding="utf-8") as f:
+                        json.dump(self._aliases, f, indent=2, sort_keys=True)
+                except Exception as e:
+                    print(f"⚠️ Failed to save label aliases: {e}")
+
+    def observe(self, label_names: List[str]) -> None:
+        """
+        Learn aliases from co-occurrence: an unclassified label that keeps appearing
+        alongside labels of one level is promoted to an alias of that level.
+        """
+        classified = set()
+        unknown = []
+        for name in label_names:
+            levels = self.classify(name)
+            if levels:
+                classified.update(levels)
+            else:
+                unknown.append(normalize_label(name))
+        if not classified or not unknown:
+            return
+
+        promote = []
+        with self._lock:
+            for name in unknown:
+                counts = self._cooccurrence[name]
+                counts.update(classified)
+                total = sum(counts.values())
+                level, support = counts.most_common(1)[0]
+                if support >= self.min_support and support / total >= self.min_purity:
+                    promote.append((name, level))
+                    del self._cooccurrence[name]
+        for name, level in promote:
+            print(f"🏷️  Learned label alias: '{name}' -> {level}")
+            self.add_alias(name, level)
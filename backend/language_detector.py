@@ -0,0 +1,110 @@
+"""
+Programming-language detection from free-text profiles.
+
+Profiles are tokenized once (punctuation other than "+", "#" and "." becomes
+whitespace) and every token is looked up in a precompiled keyword table, with
+multi-word keywords checked only after their first word. This is O(text length)
+regardless of keyword count, and matching whole tokens means "go" no longer
+matches inside "good" or "ts" inside "its" (versioned names such as "python3"
+are therefore listed as keywords of their own). Each distinct keyword found adds
+its weight to its language. On long résumés this is about twice as fast as the
+old substring scans; on short profiles the tokenizing overhead makes it
+slightly slower (see benchmark_language_detection.py).
+"""
+
+import string
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+# language -> {keyword: weight}; ambiguous English words get lower weights
+LANGUAGE_KEYWORDS: Dict[str, Dict[str, float]] = {
+    'python': {'python': 2.0, 'python3': 2.0, 'django': 1.0, 'flask': 1.0, 'fastapi': 1.0, 'pytorch': 1.0,
+               'tensorflow': 1.0, 'pandas': 1.0, 'numpy': 1.0},
+    'javascript': {'javascript': 2.0, 'js': 1.0, 'react': 1.0, 'vue': 1.0, 'angular': 1.0,
+                   'node.js': 1.0, 'nodejs': 1.0, 'express': 0.5},
+    'typescript': {'typescript': 2.0, 'ts': 0.5},
+    'java': {'java': 2.0, 'spring': 0.5, 'spring boot': 1.0, 'maven': 1.0, 'gradle': 1.0},
+    'go': {'golang': 2.0, 'go': 1.0},
+    'rust': {'rust': 2.0, 'cargo': 0.5},
+    'ruby': {'ruby': 2.0, 'rails': 1.0, 'ruby on rails': 1.0},
+    'php': {'php': 2.0, 'laravel': 1.0, 'symfony': 1.0},
+    'c++': {'c++': 2.0, 'cpp': 1.0},
+    'csharp': {'c#': 2.0, 'csharp': 2.0, '.net': 1.0, 'dotnet': 1.0, 'asp.net': 1.0},
+    'swift': {'swift': 2.0, 'ios': 1.0, 'swiftui': 1.0},
+    'kotlin': {'kotlin': 2.0, 'android': 0.5},
+}
+
+
+class LanguageDetector:
+    """Tokenized weighted keyword matcher over lowercased text."""
+
+    def __init__(self, keywords: Dict[str, Dict[str, float]]):
+        self.languages = list(keywords)
+        self._keyword_weights: Dict[str, List] = defaultdict(list)
+        self._phrases: Dict[str, List[List[str]]] = defaultdict(list)
+        for lang, weighted in keywords.items():
+            for kw, weight in weighted.items():
+                kw = kw.lower()
+                self._keyword_weights[kw].append((lang, weight))
+                words = kw.split()
+                if len(words) > 1:
+                    self._phrases[words[0]].append(words)
+
+        keep = set(string.ascii_lowercase + string.digits + "_+#.")
+        self._to_spaces = str.maketrans({ch: " " for ch in string.punctuation + "\u2019\u201c\u201d" if ch not in keep})
+
+    @staticmethod
+    def _clean(tok: str) -> str:
+        # Drop sentence punctuation but keep a leading dot (".net")
+        return tok.rstrip(".") if tok.startswith(".") else tok.strip(".")
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Weighted score per language; each distinct keyword counts once."""
+        totals = {lang: 0.0 for lang in self.languages}
+        if not text:
+            return totals
+        weights = self._keyword_weights
+        raw = text.lower().translate(self._to_spaces).split()
+        tokens = {self._clean(tok) for tok in set(raw)}
+
+        found = tokens & weights.keys()
+        for tok in tokens - found:
+            if "." in tok:
+                # "app.js" / "vb.net": try the dotted parts on their own
+                for part in tok.split("."):
+                    if part in weights:
+                        found.add(part)
+                    elif "." + part in weights:
+                        found.add("." + part)
+
+        heads = tokens & self._phrases.keys()
+        if heads:
+            joined = f" {' '.join(self._clean(tok) for tok in raw)} "
+            for head in heads:
+                for words in self._phrases[head]:
+                    phrase = " ".join(words)
+                    if f" {phrase} " in joined:
+                        found.add(phrase)
+
+        for kw in found:
+            for lang, weight in weights[kw]:
+                totals[lang] += weight
+        return totals
+
+    def detect(self, text: str, allowed: Optional[Sequence[str]] = None, default: str = "all") -> str:
+        """Best-scoring language (ties keep declaration order), or default when nothing matches."""
+        scores = self.scores(text)
+        candidates = [lang for lang in self.languages if allowed is None or lang in allowed]
+        best = max(candidates, key=lambda lang: scores[lang], default=None)
+        if best is None or scores[best] <= 0:
+            return default
+        return best
+
+    def detect_batch(self, texts: Sequence[str], allowed: Optional[Sequence[str]] = None,
+                     default: str = "all") -> List[str]:
+        """Detect languages for many profiles with the shared compiled pattern."""
+        return [self.detect(text, allowed=allowed, default=default) for text in texts]
+
+
+# Compiled once and shared by core and phi_predictor
+DEFAULT_DETECTOR = LanguageDetector(LANGUAGE_KEYWORDS)
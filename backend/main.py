@@ -2,6 +2,10 @@
 import argparse
 import sys
 import os
+from runtime_config import configure_runtime
+from batch import requested_processes
+# Batch mode splits the cores between its worker processes (which re-import this module)
+configure_runtime(workers=requested_processes(sys.argv[1:]), concurrency=1)
 from core import recommend_issues
 
 def print_issues(issues, ranked: bool = False):
@@ -23,6 +27,11 @@ def print_issues(issues, ranked: bool = False):
             print(f"{idx}. [{repo}] {title}\n   {url}")
 
 def main():
+    if sys.argv[1:2] == ["batch"]:
+        from batch import main as batch_main
+        batch_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="Fetch and print GitHub 'good first issue' issues from top repositories.")
     parser.add_argument("--language", "-l", default="all", help="Programming language to filter repositories by (default: all; use a language name to filter)")
     parser.add_argument("--per-page", "-n", type=int, default=20, help="Total number of issues to print (default: 20)")
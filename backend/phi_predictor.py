@@ -1,22 +1,40 @@
-from transformers import pipeline
 import json
+import threading
+from language_detector import DEFAULT_DETECTOR
+from runtime_config import configure_torch
+
+_phi_model = None
+_phi_model_lock = threading.Lock()
 
 def create_phi_model():
     """Initialize a simpler model for text classification"""
+    # transformers is heavy to import, so it is only loaded when a model is built
+    from transformers import pipeline
+    configure_torch()
     return pipeline("text-classification", 
                    model="distilbert-base-uncased",
                    return_all_scores=True)
 
-def predict_experience_level(profile_text: str, model=None) -> str:
-    """Predict experience level using sentiment analysis as a proxy"""
+def get_phi_model():
+    """Return the shared classifier, building it on first use"""
+    global _phi_model
+    if _phi_model is None:
+        with _phi_model_lock:
+            if _phi_model is None:
+                _phi_model = create_phi_model()
+    return _phi_model
+
+def predict_experience_score(profile_text: str, model=None) -> float:
+    """Classifier score used as the experience signal (one forward pass)"""
     if model is None:
-        model = create_phi_model()
+        model = get_phi_model()
     
     # Use sentiment analysis scores as a proxy for experience level
     result = model(profile_text)
-    sentiment_score = result[0][0]['score']  # Get the sentiment score
-    
-    # Map sentiment scores to experience levels
+    return result[0][0]['score']  # Get the sentiment score
+
+def experience_level_from_score(sentiment_score: float) -> str:
+    """Map a classifier score to an experience level"""
     if sentiment_score < 0.3:
         return 'beginner'
     elif sentiment_score < 0.7:
@@ -24,23 +42,20 @@ def predict_experience_level(profile_text: str, model=None) -> str:
     else:
         return 'advanced'
 
+def predict_experience_level(profile_text: str, model=None) -> str:
+    """Predict experience level using sentiment analysis as a proxy"""
+    return experience_level_from_score(predict_experience_score(profile_text, model))
+
+# Languages the Phi path reports; anything else falls back to 'python'
+PHI_LANGUAGES = ['python', 'javascript', 'java', 'c++', 'ruby', 'php', 'typescript', 'go', 'rust']
+
 def predict_programming_language(profile_text: str, model=None) -> str:
-    """Extract programming language from text using keyword matching"""
-    # List of common programming languages
-    languages = ['python', 'javascript', 'java', 'c++', 'ruby', 'php', 'typescript', 'go', 'rust']
-    
-    # Convert to lowercase for case-insensitive matching
-    text_lower = profile_text.lower()
-    
-    # Find all mentioned languages
-    found_languages = [lang for lang in languages if lang in text_lower]
-    
-    # Return the first found language or 'python' as default
-    return found_languages[0] if found_languages else 'python'
+    """Extract programming language from text using the shared keyword detector"""
+    return DEFAULT_DETECTOR.detect(profile_text, allowed=PHI_LANGUAGES, default='python')
 
 def analyze_profile(profile_text: str) -> dict:
     """Analyze a profile using Phi-4 to determine both experience level and language"""
-    model = create_phi_model()  # Create model once to reuse
+    model = get_phi_model()  # Create model once to reuse
     
     experience_level = predict_experience_level(profile_text, model)
     language = predict_programming_language(profile_text, model)
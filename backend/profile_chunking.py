@@ -0,0 +1,121 @@
+"""
+Chunked encoding for long (résumé-length) profiles.
+
+Sentence encoders truncate their input (MiniLM at 256 tokens, e5 at 512), so a
+long profile loses everything past the limit. Long profiles are therefore split
+into overlapping windows of whole sentences, encoded as one batch and pooled
+into a single vector. Chunk boundaries are content-defined (chosen from sentence
+hashes rather than positions), so editing one paragraph changes only the chunks
+around it and every other chunk embedding comes from the cache.
+"""
+
+import hashlib
+import os
+import re
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# Rough words-per-token ratio for technical English under WordPiece/SentencePiece
+WORDS_PER_TOKEN = 0.6
+PROFILE_CHUNK_WORDS = int(os.getenv("PROFILE_CHUNK_WORDS", "0"))  # 0 = derive from the model's max_seq_length
+PROFILE_CHUNK_OVERLAP = int(os.getenv("PROFILE_CHUNK_OVERLAP", "1"))  # sentences repeated between chunks
+PROFILE_CHUNK_POOLING = os.getenv("PROFILE_CHUNK_POOLING", "mean")  # "mean" or "max"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+
+def chunk_words_for_model(model, default_tokens: int = 256) -> int:
+    """Window size in words that fits the model's sequence limit."""
+    if PROFILE_CHUNK_WORDS > 0:
+        return PROFILE_CHUNK_WORDS
+    max_tokens = getattr(model, "max_seq_length", None) or default_tokens
+    return max(32, int(max_tokens * WORDS_PER_TOKEN))
+
+
+def _sentences(text: str, max_words: int) -> List[List[str]]:
+    """Split into sentences (as word lists); overlong sentences are cut into windows."""
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        for start in range(0, len(words), max_words):
+            sentences.append(words[start:start + max_words])
+    return [s for s in sentences if s]
+
+
+def _is_boundary(sentence: List[str]) -> bool:
+    # Roughly one sentence in three ends a chunk, decided by content not position
+    return hashlib.blake2b(" ".join(sentence).encode(), digest_size=2).digest()[0] % 3 == 0
+
+
+def split_profile(text: str, max_words: int, overlap: int = PROFILE_CHUNK_OVERLAP) -> List[str]:
+    """
+    Split a profile into chunks of at most max_words words. Profiles that fit
+    in one window come back unchanged as a single chunk.
+    """
+    if len(text.split()) <= max_words:
+        return [text]
+
+    chunks: List[List[List[str]]] = []
+    current: List[List[str]] = []
+    new_sentences = 0
+
+    def close(chunk: List[List[str]]) -> List[List[str]]:
+        # Emit the chunk and carry its last sentences into the next one
+        chunks.append(chunk)
+        return chunk[-overlap:] if overlap else []
+
+    for sentence in _sentences(text, max_words):
+        if new_sentences and sum(map(len, current)) + len(sentence) > max_words:
+            current, new_sentences = close(current), 0
+        while current and sum(map(len, current)) + len(sentence) > max_words:
+            current = current[1:]
+        current = current + [sentence]
+        new_sentences += 1
+        if sum(map(len, current)) >= max_words // 2 and _is_boundary(sentence):
+            current, new_sentences = close(current), 0
+    if new_sentences:
+        close(current)
+    return [" ".join(" ".join(s) for s in chunk) for chunk in chunks]
+
+
+def pool_chunk_embeddings(embeddings: np.ndarray, weights: Optional[List[int]] = None,
+                          pooling: str = PROFILE_CHUNK_POOLING) -> np.ndarray:
+    """Pool L2-normalized chunk vectors into one profile vector (mean is length-weighted)."""
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    if pooling == "max":
+        pooled = vectors.max(axis=0)
+    elif pooling == "mean":
+        w = np.asarray(weights if weights is not None else [1] * len(vectors), dtype=np.float32)
+        pooled = (vectors * w[:, None]).sum(axis=0) / w.sum()
+    else:
+        raise ValueError(f"Unknown pooling '{pooling}', expected 'mean' or 'max'")
+    return pooled / (np.linalg.norm(pooled) or 1.0)
+
+
+def encode_profile_chunks(
+        text: str,
+        model,
+        get_cached: Callable[[str], Optional[np.ndarray]],
+        set_cached: Callable[[str, np.ndarray], None],
+        pooling: str = PROFILE_CHUNK_POOLING,
+    ) -> np.ndarray:
+    """
+    Encode a profile as pooled chunk embeddings. Chunks are looked up with
+    get_cached(chunk) and only the missing ones are encoded, in one batch.
+    Single-chunk profiles are encoded as-is, matching the unchunked behaviour.
+    """
+    chunks = split_profile(text, chunk_words_for_model(model))
+    if len(chunks) == 1:
+        return np.asarray(model.encode(text, show_progress_bar=False))
+
+    vectors: List[Optional[np.ndarray]] = [get_cached(chunk) for chunk in chunks]
+    missing = [i for i, vec in enumerate(vectors) if vec is None]
+    if missing:
+        print(f"🔄 Encoding {len(missing)} of {len(chunks)} profile chunks")
+        fresh = model.encode([chunks[i] for i in missing], show_progress_bar=False)
+        for i, vec in zip(missing, fresh):
+            vectors[i] = np.asarray(vec)
+            set_cached(chunks[i], vectors[i])
+    return pool_chunk_embeddings(np.vstack(vectors), [len(c.split()) for c in chunks], pooling)
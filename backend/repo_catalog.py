@@ -0,0 +1,191 @@
+"""
+Persistent catalog of repositories and their open-issue label statistics.
+
+A crawl job records, per repository, its language, stars, open issue count, the
+label vocabulary of its open issues and how many open issues carry labels for
+each experience level. The catalog is a SQLite database indexed for "top repos
+by stars with at least N open issues for level L in language X", so cold
+fetches can go straight to repositories that actually have matching issues
+instead of running a live search and probing repos that have none.
+
+Build or refresh the catalog with:
+    python repo_catalog.py --languages python javascript --top-n 300
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+REPO_CATALOG_PATH = os.getenv("REPO_CATALOG_PATH", "/tmp/github_issues_cache/repo_catalog.db")
+REPO_CATALOG_MAX_AGE = int(os.getenv("REPO_CATALOG_MAX_AGE", str(7 * 24 * 3600)))  # seconds
+REPO_CATALOG_MIN_ISSUES = int(os.getenv("REPO_CATALOG_MIN_ISSUES", "1"))  # open issues needed for a level
+CRAWL_MAX_PAGES = int(os.getenv("REPO_CATALOG_CRAWL_PAGES", "3"))  # pages of 100 open issues sampled per repo
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    full_name TEXT PRIMARY KEY,
+    language TEXT,
+    stars INTEGER NOT NULL,
+    open_issues INTEGER NOT NULL,
+    crawled_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS repos_language_stars ON repos (language, stars DESC);
+CREATE TABLE IF NOT EXISTS repo_levels (
+    full_name TEXT NOT NULL,
+    level TEXT NOT NULL,
+    open_issues INTEGER NOT NULL,
+    PRIMARY KEY (full_name, level)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS repo_levels_level ON repo_levels (level, open_issues);
+CREATE TABLE IF NOT EXISTS repo_labels (
+    full_name TEXT NOT NULL,
+    label TEXT NOT NULL,
+    open_issues INTEGER NOT NULL,
+    PRIMARY KEY (full_name, label)
+) WITHOUT ROWID;
+"""
+
+
+def summarize_issues(items: Iterable[Dict], classify: Callable[[str], FrozenSet[str]]) -> Tuple[int, Dict[str, int], Dict[str, int]]:
+    """
+    Count open issues (pull requests excluded) per experience level and per label.
+    Returns:
+        (open issues, {level: issues}, {label: issues}); "any" counts every issue
+    """
+    total = 0
+    levels: Counter = Counter()
+    labels: Counter = Counter()
+    for item in items:
+        if "pull_request" in item:
+            continue
+        total += 1
+        names = {label.get("name", "") for label in item.get("labels", [])}
+        labels.update(names)
+        levels.update({level for name in names for level in classify(name)})
+    levels["any"] = total
+    return total, dict(levels), dict(labels)
+
+
+class RepoCatalog:
+    """SQLite-backed repository catalog (one connection per thread)."""
+
+    def __init__(self, path: str = REPO_CATALOG_PATH, max_age: int = REPO_CATALOG_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._local = threading.local()
+
+    def _connect(self, create: bool = False) -> Optional[sqlite3.Connection]:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not create and not os.path.exists(self.path):
+                return None  # no crawl has run yet; callers fall back to live search
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, full_name: str, language: Optional[str], stars: int, open_issues: int,
+               levels: Dict[str, int], labels: Dict[str, int], crawled_at: Optional[float] = None) -> None:
+        """Replace a repository's row and statistics."""
+        conn = self._connect(create=True)
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, ?)",
+                         (full_name, (language or "").lower() or None, int(stars), int(open_issues),
+                          time.time() if crawled_at is None else crawled_at))
+            conn.execute("DELETE FROM repo_levels WHERE full_name = ?", (full_name,))
+            conn.execute("DELETE FROM repo_labels WHERE full_name = ?", (full_name,))
+            conn.executemany("INSERT INTO repo_levels VALUES (?, ?, ?)",
+                             [(full_name, level, count) for level, count in levels.items()])
+            conn.executemany("INSERT INTO repo_labels VALUES (?, ?, ?)",
+                             [(full_name, label, count) for label, count in labels.items()])
+
+    def top_repositories(self, language: Optional[str], experience_level: str, limit: int,
+                         min_issues: int = REPO_CATALOG_MIN_ISSUES) -> List[Tuple[str, str, int]]:
+        """
+        Most starred fresh repositories with at least min_issues open issues for the level.
+        Returns:
+            (owner, repo, stars) tuples, like fetch_top_repositories; empty without a catalog
+        """
+        conn = self._connect()
+        if conn is None:
+            return []
+        query = ("SELECT r.full_name, r.stars FROM repos r JOIN repo_levels l ON l.full_name = r.full_name"
+                 " WHERE l.level = ? AND l.open_issues >= ? AND r.crawled_at >= ?")
+        params: List = [experience_level, max(1, min_issues), time.time() - self.max_age]
+        if language and language != "all":
+            query += " AND r.language = ?"
+            params.append(language.lower())
+        query += " ORDER BY r.stars DESC LIMIT ?"
+        params.append(int(limit))
+        try:
+            rows = conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️ Error reading repository catalog: {e}")
+            return []
+        return [(*full_name.split("/", 1), stars) for full_name, stars in rows]
+
+    def label_vocabulary(self, full_name: str) -> Dict[str, int]:
+        """Open issues per label name for one repository."""
+        conn = self._connect()
+        if conn is None:
+            return {}
+        rows = conn.execute("SELECT label, open_issues FROM repo_labels WHERE full_name = ? ORDER BY open_issues DESC",
+                            (full_name,)).fetchall()
+        return dict(rows)
+
+    def stats(self) -> Dict:
+        conn = self._connect()
+        if conn is None:
+            return {"repos": 0}
+        repos, oldest, newest = conn.execute("SELECT COUNT(*), MIN(crawled_at), MAX(crawled_at) FROM repos").fetchone()
+        levels = dict(conn.execute(
+            "SELECT level, COUNT(*) FROM repo_levels WHERE open_issues > 0 GROUP BY level").fetchall())
+        return {"repos": repos, "oldest_crawl": oldest, "newest_crawl": newest, "repos_per_level": levels}
+
+
+def crawl(languages: List[str], top_n: int, catalog: RepoCatalog, max_pages: int = CRAWL_MAX_PAGES) -> int:
+    """Record the top_n repositories of each language. Returns the number of repositories crawled."""
+    import requests
+    from core import LABEL_MATCHER, _auth_headers, fetch_top_repositories
+    from github_pagination import fetch_pages
+
+    headers = _auth_headers()
+    crawled = 0
+    for language in languages:
+        repos = fetch_top_repositories(language, top_n=top_n)
+        print(f"🔄 Crawling {len(repos)} {language} repositories")
+        for owner, repo, stars in repos:
+            full_name = f"{owner}/{repo}"
+            try:
+                pages = fetch_pages(f"https://api.github.com/repos/{full_name}/issues", headers,
+                                    {"state": "open", "per_page": 100}, max_pages=max_pages)
+            except requests.RequestException as e:
+                # Recorded with no issues, so the fetcher stops targeting it
+                print(f"⚠️ Failed to crawl {full_name}: {e}")
+                pages = []
+            total, levels, labels = summarize_issues((item for page in pages for item in page), LABEL_MATCHER.classify)
+            catalog.upsert(full_name, language, stars, total, levels, labels)
+            crawled += 1
+    print(f"💾 Catalog now has {catalog.stats()['repos']} repositories")
+    return crawled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or refresh the repository catalog.")
+    parser.add_argument("--languages", nargs="+", default=["python", "javascript", "typescript", "java", "go"])
+    parser.add_argument("--top-n", type=int, default=300, help="Top repositories by stars crawled per language")
+    parser.add_argument("--pages", type=int, default=CRAWL_MAX_PAGES, help="Pages of 100 open issues sampled per repository")
+    parser.add_argument("--path", default=REPO_CATALOG_PATH, help="SQLite database path")
+    args = parser.parse_args()
+
+    crawl(args.languages, args.top_n, RepoCatalog(args.path), args.pages)
+
+
+if __name__ == "__main__":
+    main()
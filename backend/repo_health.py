@@ -0,0 +1,191 @@
+"""
+Per-repository health tracking and a circuit breaker for the GitHub API.
+
+RepoHealth negatively caches repos that cannot help a cold fetch: repos that
+answered 404/410/451 (deleted, issues disabled, legal block) are skipped for
+REPO_ERROR_TTL, and repos that yielded no issues for an experience level are
+skipped for that level for REPO_EMPTY_TTL. Entries live in the shared disk
+cache, so every worker benefits.
+
+CircuitBreaker watches GitHub responses across all requests. When the share of
+server errors, rate-limit rejections and network failures in the recent window
+crosses a threshold, it opens and requests fail fast with CircuitOpenError
+until a cooldown has passed and a probe request succeeds.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import requests
+
+REPO_EMPTY_TTL = int(os.getenv("REPO_EMPTY_TTL", str(6 * 3600)))  # seconds
+REPO_ERROR_TTL = int(os.getenv("REPO_ERROR_TTL", str(24 * 3600)))  # seconds
+# Statuses that describe the repository itself (gone, issues disabled, blocked), not GitHub's health
+NEGATIVE_CACHE_STATUSES = {404, 410, 451}
+
+CIRCUIT_FAILURE_RATIO = float(os.getenv("GITHUB_CIRCUIT_FAILURE_RATIO", "0.5"))
+CIRCUIT_MIN_REQUESTS = int(os.getenv("GITHUB_CIRCUIT_MIN_REQUESTS", "10"))
+CIRCUIT_WINDOW = float(os.getenv("GITHUB_CIRCUIT_WINDOW", "60"))  # seconds of outcomes considered
+CIRCUIT_COOLDOWN = float(os.getenv("GITHUB_CIRCUIT_COOLDOWN", "30"))  # seconds open before a probe
+
+ERROR_KEY_PREFIX = "repo_error_"
+EMPTY_KEY_PREFIX = "repo_empty_"
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+def is_failure_response(response) -> bool:
+    """Responses that indicate GitHub itself is unhealthy or rejecting us."""
+    status = getattr(response, "status_code", 200)
+    if status >= 500 or status == 429:
+        return True
+    headers = getattr(response, "headers", None) or {}
+    return status == 403 and headers.get("X-RateLimit-Remaining") == "0"
+
+
+class CircuitBreaker:
+    """Closed -> open on a high failure ratio -> half-open probe after the cooldown."""
+
+    def __init__(self, name: str, failure_ratio: float = CIRCUIT_FAILURE_RATIO,
+                 min_requests: int = CIRCUIT_MIN_REQUESTS, window: float = CIRCUIT_WINDOW,
+                 cooldown: float = CIRCUIT_COOLDOWN):
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if now - self._opened_at >= self.cooldown else "open"
+
+    def check(self) -> bool:
+        """
+        Raise CircuitOpenError unless a request may be sent now.
+        Returns True if this request is the half-open probe, whose outcome alone closes or reopens the circuit.
+        """
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == "closed":
+                return False
+            if state == "half_open" and not self._probing:
+                self._probing = True  # let exactly one probe through
+                return True
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit for {self.name} is open, not sending request")
+
+    def record(self, success: bool, probe: bool = False) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._opened_at is not None:
+                # Late outcomes of requests sent before the circuit opened say nothing about recovery
+                if probe and self._probing:
+                    self._probing = False
+                    if success:
+                        print(f"✅ Circuit for {self.name} closed")
+                        self._opened_at = None
+                        self._outcomes.clear()
+                    else:
+                        self._opened_at = now
+                return
+            self._outcomes.append((now, success))
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._outcomes.popleft()
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.failure_ratio:
+                print(f"⚠️ Circuit for {self.name} opened ({failures}/{len(self._outcomes)} failures)")
+                self._opened_at = now
+
+    def _send(self, send, url: str, **kwargs):
+        probe = self.check()
+        try:
+            response = send(url, **kwargs)
+        except BaseException:
+            # Any error, not only network ones, must resolve the probe or the circuit never closes again
+            self.record(False, probe)
+            raise
+        self.record(not is_failure_response(response), probe)
+        return response
+
+    def get(self, url: str, **kwargs):
+        """requests.get guarded by the breaker."""
+        return self._send(requests.get, url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """requests.post guarded by the breaker."""
+        return self._send(requests.post, url, **kwargs)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            outcomes = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {"state": self._state(time.monotonic()), "window_requests": outcomes,
+                    "window_failures": failures, "rejected": self.rejected}
+
+
+class RepoHealth:
+    """Negative cache of repos that errored or yielded no issues for a level."""
+
+    def __init__(self, disk, error_ttl: int = REPO_ERROR_TTL, empty_ttl: int = REPO_EMPTY_TTL):
+        self.disk = disk
+        self.error_ttl = error_ttl
+        self.empty_ttl = empty_ttl
+        self._lock = threading.Lock()
+        self.counts = {"skipped_errors": 0, "skipped_empty": 0, "recorded_errors": 0, "recorded_empty": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def skip_reason(self, full_name: str, experience_level: str) -> Optional[str]:
+        """Why the repo should not be fetched for this level right now, or None."""
+        try:
+            status = self.disk.get(ERROR_KEY_PREFIX + full_name)
+            if status is not None:
+                self._count("skipped_errors")
+                return f"HTTP {status}"
+            if self.disk.get(f"{EMPTY_KEY_PREFIX}{experience_level}_{full_name}") is not None:
+                self._count("skipped_empty")
+                return f"no {experience_level} issues"
+        except Exception as e:
+            print(f"⚠️ Error reading repo health: {e}")
+        return None
+
+    def record_error(self, full_name: str, status: int) -> None:
+        try:
+            self.disk.set(ERROR_KEY_PREFIX + full_name, status, expire=self.error_ttl)
+            self._count("recorded_errors")
+            print(f"🚫 {full_name} returned HTTP {status}, skipping it for {self.error_ttl}s")
+        except Exception as e:
+            print(f"⚠️ Failed to record repo error: {e}")
+
+    def record_empty(self, full_name: str, experience_level: str) -> None:
+        try:
+            self.disk.set(f"{EMPTY_KEY_PREFIX}{experience_level}_{full_name}", time.time(), expire=self.empty_ttl)
+            self._count("recorded_empty")
+        except Exception as e:
+            print(f"⚠️ Failed to record empty repo: {e}")
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+# Shared by every GitHub REST and GraphQL call in the process
+GITHUB_CIRCUIT = CircuitBreaker("api.github.com")
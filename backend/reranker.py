@@ -0,0 +1,125 @@
+"""
+Second ranking stage: cross-encoder rerank of the top bi-encoder candidates.
+
+The bi-encoder (MiniLM) recall picks the best `top_k` issues from the full pool
+by cosine similarity; a cross-encoder then scores (profile, issue) pairs for
+those candidates only. Scoring runs in batches and stops once the latency
+budget would be exceeded, so slow hardware degrades to the recall order rather
+than slow responses. Pair scores are cached by (model, profile hash, issue
+text hash), so repeat requests and unchanged issues cost nothing.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cohort_artifacts import issue_text
+from profile_index import normalize_profile_text
+from runtime_config import configure_torch
+
+RERANK_SCORE_TTL = 7 * 24 * 3600  # 1 week in seconds
+
+
+def recall_top_k(similarities: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest similarities, best first (O(n) selection + O(k log k) sort)."""
+    k = min(k, len(similarities))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    top = np.argpartition(-similarities, k - 1)[:k]
+    return top[np.argsort(-similarities[top], kind="stable")]
+
+
+class CrossEncoderReranker:
+    """Rerank candidates with a cross-encoder under a per-request time budget."""
+
+    def __init__(self, model_name: str, disk, top_k: int = 50, budget_ms: float = 300,
+                 batch_size: int = 16):
+        self.model_name = model_name
+        self.disk = disk
+        self.top_k = top_k
+        self.budget_ms = budget_ms
+        self.batch_size = batch_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+                    configure_torch()
+                    self._model = CrossEncoder(self.model_name)
+        return self._model
+
+    def load(self) -> None:
+        """Load the cross-encoder now rather than on the first rerank (startup warm-up)."""
+        self._get_model()
+
+    def _cache_key(self, profile_hash: str, issue: Dict) -> str:
+        issue_hash = hashlib.sha256(issue_text(issue).encode()).hexdigest()
+        return f"rerank_{self.model_name}_{profile_hash}_{issue_hash}"
+
+    def score(self, profile_text: str, issues: List[Dict],
+              budget_ms: Optional[float] = None) -> List[Optional[float]]:
+        """
+        Cross-encoder score per issue (cached where possible). Issues that could
+        not be scored within the budget get None.
+        """
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000
+        profile_hash = hashlib.sha256(normalize_profile_text(profile_text).encode()).hexdigest()
+        keys = [self._cache_key(profile_hash, issue) for issue in issues]
+
+        scores: List[Optional[float]] = []
+        for key in keys:
+            try:
+                scores.append(self.disk.get(key))
+            except Exception as e:
+                print(f"⚠️ Error retrieving cached rerank score: {e}")
+                scores.append(None)
+        missing = [i for i, s in enumerate(scores) if s is None]
+        if not missing:
+            return scores
+        # No time left for a single batch: do not pay for loading the model either
+        if budget <= 0:
+            print(f"⏱️ No rerank budget left, {len(missing)} candidates keep recall order")
+            return scores
+
+        model = self._get_model()
+        start = time.perf_counter()
+        slowest_batch = 0.0
+        for offset in range(0, len(missing), self.batch_size):
+            elapsed = time.perf_counter() - start
+            # Stop before a batch that would likely overrun the budget
+            if elapsed + slowest_batch > budget:
+                print(f"⏱️ Rerank budget reached, {len(missing) - offset} candidates keep recall order")
+                break
+            batch = missing[offset:offset + self.batch_size]
+            batch_start = time.perf_counter()
+            batch_scores = model.predict([(profile_text, issue_text(issues[i])) for i in batch],
+                                         show_progress_bar=False)
+            slowest_batch = max(slowest_batch, time.perf_counter() - batch_start)
+            for i, value in zip(batch, batch_scores):
+                scores[i] = float(value)
+                try:
+                    self.disk.set(keys[i], scores[i], expire=RERANK_SCORE_TTL)
+                except Exception as e:
+                    print(f"⚠️ Failed to cache rerank score: {e}")
+        return scores
+
+    def rerank(self, profile_text: str, candidates: List[Tuple[Dict, float]],
+               budget_ms: Optional[float] = None) -> List[Tuple[Dict, float, Optional[float]]]:
+        """
+        Reorder recall candidates (best first) by cross-encoder score. Scored
+        candidates come first; unscored ones follow in their recall order.
+        Returns (issue, similarity, rerank_score) tuples.
+        """
+        head = candidates[:self.top_k]
+        scores = self.score(profile_text, [issue for issue, _ in head], budget_ms)
+        scored = [(issue, sim, s) for (issue, sim), s in zip(head, scores) if s is not None]
+        unscored = [(issue, sim, None) for (issue, sim), s in zip(head, scores) if s is None]
+        scored.sort(key=lambda x: x[2], reverse=True)
+        tail = [(issue, sim, None) for issue, sim in candidates[self.top_k:]]
+        return scored + unscored + tail
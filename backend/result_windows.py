@@ -0,0 +1,73 @@
+"""
+Cursor-based result windows for paginated /recommend responses.
+
+The first request keeps up to several pages of the candidates it ranks anyway
+(no extra issues are fetched for them) and stores that window in the disk cache
+for a short TTL under a random id. The response carries an opaque
+cursor (window id + offset); following pages are sliced from the stored
+ranking, so "load more" is a cache read instead of a full recommend pass.
+"""
+
+import base64
+import binascii
+import os
+import secrets
+from typing import Dict, List, Optional, Tuple
+
+RESULT_WINDOW_TTL = int(os.getenv("RECOMMEND_CURSOR_TTL", "600"))  # seconds
+RESULT_WINDOW_PAGES = int(os.getenv("RECOMMEND_WINDOW_PAGES", "5"))  # pages kept from the first ranking
+KEY_PREFIX = "result_window_"
+
+
+def encode_cursor(window_id: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{window_id}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        window_id, offset = raw.rsplit(":", 1)
+        return window_id, int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Malformed cursor: {cursor!r}") from e
+
+
+class ResultWindowStore:
+    """Ranked result lists stored under short-lived ids."""
+
+    def __init__(self, disk, ttl: int = RESULT_WINDOW_TTL):
+        self.disk = disk
+        self.ttl = ttl
+
+    def _slice(self, window_id: str, results: List[Dict], offset: int,
+               page_size: int) -> Tuple[List[Dict], Optional[str]]:
+        end = offset + max(1, page_size)
+        next_cursor = encode_cursor(window_id, end) if end < len(results) else None
+        return results[offset:end], next_cursor
+
+    def open(self, results: List[Dict], page_size: int, partial: bool = False) -> Tuple[List[Dict], Optional[str]]:
+        """Store a ranked list (and whether it is partial) and return its first page plus the next cursor."""
+        window_id = secrets.token_urlsafe(12)
+        if len(results) > page_size:
+            try:
+                self.disk.set(KEY_PREFIX + window_id, {"results": results, "partial": partial}, expire=self.ttl)
+            except Exception as e:
+                print(f"⚠️ Failed to cache result window: {e}")
+                return results[:page_size], None
+        return self._slice(window_id, results, 0, page_size)
+
+    def read(self, cursor: str, page_size: int) -> Optional[Tuple[List[Dict], Optional[str], bool]]:
+        """(page, next cursor, partial) at the cursor, or None if it is malformed or its window expired."""
+        try:
+            window_id, offset = decode_cursor(cursor)
+            window = self.disk.get(KEY_PREFIX + window_id)
+        except ValueError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Error reading result window: {e}")
+            return None
+        if window is None or offset < 0:
+            return None
+        page, next_cursor = self._slice(window_id, window["results"], offset, page_size)
+        return page, next_cursor, window["partial"]
@@ -0,0 +1,162 @@
+"""
+CPU thread and affinity settings for torch, HuggingFace tokenizers and BLAS.
+
+By default each of these libraries sizes its own thread pool to every core, so
+a few concurrent /recommend calls (each in its own request thread, possibly in
+several uvicorn workers) oversubscribe the CPU. configure_runtime() divides the
+available cores by workers x concurrent requests and applies that budget to all
+of them once at startup; torch picks it up when the first model is loaded.
+
+Call configure_runtime() before numpy/torch are imported where possible: the
+BLAS environment variables are only read when the library loads (threadpoolctl,
+if installed, is used to adjust already-loaded BLAS pools).
+"""
+
+import os
+import sys
+import threading
+from typing import Dict, List, Optional
+
+RUNTIME_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))  # uvicorn worker processes
+RUNTIME_CONCURRENCY = int(os.getenv("RUNTIME_CONCURRENT_REQUESTS", "2"))  # requests doing model work per worker
+RUNTIME_INTRA_THREADS = int(os.getenv("RUNTIME_INTRA_OP_THREADS", "0"))  # 0 = derive from the budget
+RUNTIME_INTEROP_THREADS = int(os.getenv("RUNTIME_INTER_OP_THREADS", "1"))
+RUNTIME_CPU_AFFINITY = os.getenv("RUNTIME_CPU_AFFINITY", "")  # "", "auto" or a core list such as "0-7,16-23"
+# The shadow scoring executor encodes on its own thread, like one more request
+RUNTIME_BACKGROUND_JOBS = 1 if float(os.getenv("SHADOW_SAMPLE_RATE", "0")) > 0 else 0
+
+BLAS_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                 "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+_settings: Optional[Dict] = None
+_torch_configured = False
+_lock = threading.Lock()
+
+
+def available_cores() -> List[int]:
+    """Cores this process may run on (respects cgroup/taskset restrictions)."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return list(range(os.cpu_count() or 1))
+
+
+def parse_core_list(spec: str) -> List[int]:
+    """Parse "0-3,8,10-11" into [0, 1, 2, 3, 8, 10, 11]."""
+    cores = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cores.extend(range(int(start), int(end) + 1))
+        else:
+            cores.append(int(part))
+    return cores
+
+
+def thread_budget(cores: int, workers: int = RUNTIME_WORKERS, concurrency: int = RUNTIME_CONCURRENCY) -> int:
+    """Intra-op threads per request so that workers x concurrency x threads <= cores."""
+    return max(1, cores // max(1, workers * concurrency))
+
+
+def _worker_cores(cores: List[int], workers: int) -> Optional[List[int]]:
+    """This worker's contiguous slice of cores, or None without a WORKER_INDEX."""
+    # PIDs are no substitute: two workers' PIDs can share a remainder and end up on the same cores
+    index = os.getenv("WORKER_INDEX")
+    if index is None or not index.strip().isdigit():
+        return None
+    size = max(1, len(cores) // max(1, workers))
+    start = (int(index) % max(1, workers)) * size
+    return cores[start:start + size] or cores
+
+
+def configure_runtime(
+        workers: int = RUNTIME_WORKERS,
+        concurrency: int = RUNTIME_CONCURRENCY,
+        intra_threads: int = RUNTIME_INTRA_THREADS,
+        interop_threads: int = RUNTIME_INTEROP_THREADS,
+        affinity: str = RUNTIME_CPU_AFFINITY,
+        background: int = RUNTIME_BACKGROUND_JOBS,
+    ) -> Dict:
+    """
+    Apply the thread budget to BLAS, tokenizers and (if already imported) torch.
+    background is the number of background model jobs (shadow scoring) per worker
+    that share the budget with the concurrent requests.
+    Idempotent: later calls return the settings chosen by the first one.
+    Explicit OMP_NUM_THREADS / TOKENIZERS_PARALLELISM values are left untouched.
+    """
+    global _settings
+    with _lock:
+        if _settings is not None:
+            return _settings
+
+        cores = available_cores()
+        pinned = None
+        if affinity == "auto":
+            pinned = _worker_cores(cores, workers)
+            if pinned is None:
+                print("⚠️ RUNTIME_CPU_AFFINITY=auto needs WORKER_INDEX (0..workers-1) per worker, not pinning")
+        elif affinity:
+            pinned = parse_core_list(affinity)
+        if pinned is not None:
+            try:
+                os.sched_setaffinity(0, pinned)
+                cores = pinned
+                # The pinned slice already belongs to this worker alone
+                workers = 1
+            except (AttributeError, OSError, ValueError) as e:
+                print(f"⚠️ Could not set CPU affinity {affinity}: {e}")
+
+        threads = intra_threads or thread_budget(len(cores), workers, concurrency + background)
+        for var in BLAS_ENV_VARS:
+            os.environ.setdefault(var, str(threads))
+        # Request threads already provide parallelism; tokenizer pools would only compete
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+        try:
+            from threadpoolctl import threadpool_limits
+            threadpool_limits(limits=threads, user_api="blas")
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Could not limit BLAS threads: {e}")
+
+        _settings = {
+            "cores": len(cores),
+            "workers": workers,
+            "concurrency": concurrency,
+            "background_jobs": background,
+            "intra_op_threads": threads,
+            "inter_op_threads": interop_threads,
+            "affinity": cores if affinity else None,
+        }
+        print(f"🧵 Runtime: {threads} intra-op / {interop_threads} inter-op threads "
+              f"({len(cores)} cores, {workers} workers x {concurrency} requests + {background} background)")
+
+    if "torch" in sys.modules:
+        configure_torch()
+    return _settings
+
+
+def configure_torch() -> None:
+    """Apply the thread settings to torch; called right after torch is imported."""
+    global _torch_configured
+    settings = configure_runtime()
+    with _lock:
+        if _torch_configured:
+            return
+        _torch_configured = True
+    import torch
+    torch.set_num_threads(settings["intra_op_threads"])
+    try:
+        # Only allowed before torch has run any inter-op parallel work
+        torch.set_num_interop_threads(settings["inter_op_threads"])
+    except RuntimeError as e:
+        print(f"⚠️ Could not set torch inter-op threads: {e}")
+
+
+def runtime_settings() -> Optional[Dict]:
+    """The applied settings, or None if configure_runtime() has not run."""
+    return _settings
@@ -0,0 +1,154 @@
+"""
+Shadow scoring: compare a candidate embedding model against the serving one.
+
+A configurable fraction of profile requests is handed to a background executor
+after the response has been computed. The job encodes the profile and the
+returned result pool with both models (so their encode latencies are measured
+on identical, uncached inputs), re-ranks the pool by the candidate's cosine
+similarity and records how far that ranking agrees with the order the user was
+actually served (Kendall tau over the pool and top-k overlap). Users never wait
+for the candidate, and when the executor is busy, new shadow jobs are dropped
+instead of queueing. The executor's thread counts as one more concurrent
+request in the runtime thread budget (runtime_config) while sampling is on.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cohort_artifacts import issue_text
+
+SHADOW_MODEL = os.getenv("SHADOW_MODEL", "")  # candidate; empty = use the request's `model`
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "0"))  # fraction of requests shadowed
+SHADOW_MAX_PENDING = int(os.getenv("SHADOW_MAX_PENDING", "2"))  # jobs queued before new ones are dropped
+SHADOW_POOL_SIZE = int(os.getenv("SHADOW_POOL_SIZE", "50"))  # ranked results compared per request
+SHADOW_TOP_K = int(os.getenv("SHADOW_TOP_K", "10"))
+SHADOW_LATENCY_BUDGET_MS = float(os.getenv("SHADOW_LATENCY_BUDGET_MS", "500"))  # candidate encode budget per request
+SAMPLES_KEPT = 1000
+
+
+def kendall_tau(order_a: Sequence, order_b: Sequence) -> float:
+    """Kendall tau between two rankings of the same items (1 = identical, -1 = reversed)."""
+    position = {item: i for i, item in enumerate(order_b)}
+    ranks = np.array([position[item] for item in order_a if item in position], dtype=np.int64)
+    n = len(ranks)
+    if n < 2:
+        return 1.0
+    upper = np.triu_indices(n, k=1)
+    signs = np.sign(ranks[upper[1]] - ranks[upper[0]])
+    return float(signs.sum() / len(signs))
+
+
+def top_k_overlap(order_a: Sequence, order_b: Sequence, k: int) -> float:
+    """Fraction of the first k items the two rankings share."""
+    k = min(k, len(order_a), len(order_b))
+    if k <= 0:
+        return 1.0
+    return len(set(order_a[:k]) & set(order_b[:k])) / k
+
+
+def _percentile(values: Sequence[float], q: float) -> Optional[float]:
+    return round(float(np.percentile(values, q)), 2) if values else None
+
+
+class ShadowScorer:
+    """Samples requests and scores them with a candidate model in the background."""
+
+    def __init__(self, model_loader: Callable[[str], object], sample_rate: float = SHADOW_SAMPLE_RATE,
+                 max_pending: int = SHADOW_MAX_PENDING, latency_budget_ms: float = SHADOW_LATENCY_BUDGET_MS):
+        self.model_loader = model_loader
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.latency_budget_ms = latency_budget_ms
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._latency: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=SAMPLES_KEPT))
+        self._tau: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=SAMPLES_KEPT))
+        self._overlap: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=SAMPLES_KEPT))
+        self.counts = {"submitted": 0, "completed": 0, "dropped": 0, "errors": 0, "over_budget": 0}
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def maybe_submit(self, profile_text: str, results: List[Dict], primary_model: str,
+                     candidate_model: Optional[str]) -> bool:
+        """Queue a shadow comparison of results (in served order) if sampled and there is capacity."""
+        candidate_model = SHADOW_MODEL or candidate_model
+        if not candidate_model or candidate_model == primary_model or not results or not self.should_sample():
+            return False
+        pool = [dict(issue) for issue in results[:SHADOW_POOL_SIZE]]
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.counts["dropped"] += 1
+                return False
+            self._pending += 1
+            self.counts["submitted"] += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._executor.submit(self._run, profile_text, pool, primary_model, candidate_model)
+        return True
+
+    def _encode(self, model_name: str, texts: List[str]) -> Tuple[np.ndarray, float]:
+        """Normalized embeddings of texts and the encode time in milliseconds."""
+        model = self.model_loader(model_name)
+        start = time.perf_counter()
+        vectors = np.asarray(model.encode(texts, show_progress_bar=False), dtype=np.float32)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors, elapsed_ms
+
+    def _run(self, profile_text: str, pool: List[Dict], primary_model: str, candidate_model: str) -> None:
+        try:
+            texts = [profile_text] + [issue_text(issue) for issue in pool]
+            _, primary_ms = self._encode(primary_model, texts)
+            vectors, elapsed_ms = self._encode(candidate_model, texts)
+            similarities = vectors[1:] @ vectors[0]
+
+            urls = [issue.get("url", str(i)) for i, issue in enumerate(pool)]
+            # The pool is in served order (after rerank and diversity), which is what the candidate competes with
+            primary_order = urls
+            candidate_order = [urls[i] for i in np.argsort(-similarities, kind="stable")]
+            with self._lock:
+                self._latency[primary_model].append(primary_ms)
+                self._latency[candidate_model].append(elapsed_ms)
+                key = f"{primary_model} -> {candidate_model}"
+                self._tau[key].append(kendall_tau(primary_order, candidate_order))
+                self._overlap[key].append(top_k_overlap(primary_order, candidate_order, SHADOW_TOP_K))
+                self.counts["completed"] += 1
+                if elapsed_ms > self.latency_budget_ms:
+                    self.counts["over_budget"] += 1
+        except Exception as e:
+            print(f"⚠️ Shadow scoring with {candidate_model} failed: {e}")
+            with self._lock:
+                self.counts["errors"] += 1
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def snapshot(self) -> Dict:
+        """Encode latency percentiles per model and agreement per (serving -> candidate) pair."""
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "latency_budget_ms": self.latency_budget_ms,
+                **self.counts,
+                "latency_ms": {
+                    model: {"count": len(values), "p50": _percentile(values, 50), "p95": _percentile(values, 95)}
+                    for model, values in self._latency.items()
+                },
+                "agreement": {
+                    pair: {
+                        "count": len(self._tau[pair]),
+                        "kendall_tau": round(float(np.mean(self._tau[pair])), 4),
+                        f"top_{SHADOW_TOP_K}_overlap": round(float(np.mean(self._overlap[pair])), 4),
+                    }
+                    for pair in self._tau
+                },
+            }
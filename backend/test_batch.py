@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline batch mode:
+1. Profiles are read from JSONL files and directories, and bad lines become error results
+2. Batches are encoded once and results keep input order, also across worker processes
+"""
+
+import numpy as np
+
+import batch
+import core
+
+
+def test_read_profiles(tmp_path):
+    source = tmp_path / "profiles.jsonl"
+    source.write_text('{"id": "a", "profile": "Python dev", "language": "python"}\n\n"Go dev"\n{broken\n42\nnull\n')
+    records = list(batch.read_profiles(str(source)))
+    assert records[0] == {"id": "a", "profile": "Python dev", "language": "python"}
+    assert records[1] == {"id": "3", "profile": "Go dev"}
+    assert records[2]["id"] == "4" and "error" in records[2]
+    assert records[3] == {"id": "5", "error": "Expected an object or string"}
+    assert records[4] == {"id": "6", "error": "Expected an object or string"}
+
+    directory = tmp_path / "dir"
+    directory.mkdir()
+    (directory / "b.txt").write_text("Rust dev\n")
+    (directory / "a.md").write_text("Java dev")
+    assert [r["id"] for r in batch.read_profiles(str(directory))] == ["a", "b"]
+
+
+def test_requested_processes():
+    assert batch.requested_processes(["batch", "in.jsonl", "-o", "out.jsonl", "-j", "4"]) == 4
+    assert batch.requested_processes(["--processes", "4"]) == 1
+
+
+def test_score_profiles_batches_and_keeps_order(monkeypatch):
+    encoded = []
+
+    class FakeModel:
+        def encode(self, texts, show_progress_bar=False):
+            encoded.append(list(texts))
+            return np.ones((len(texts), 2))
+
+    monkeypatch.setattr(core, "create_embedding_model", lambda name="": FakeModel())
+    monkeypatch.setattr(core, "get_cached_student_embedding", lambda text, model_name="": None)
+    monkeypatch.setattr(core, "set_cached_student_embedding", lambda text, emb, model_name="": None)
+
+    def fake_recommend(language, per_page, top_n, student_profile, model_name):
+        if student_profile == "boom":
+            raise RuntimeError("fetch failed")
+        return [{"title": student_profile, "language": language, "per_page": per_page}]
+
+    monkeypatch.setattr(core, "recommend_issues", fake_recommend)
+
+    records = [{"id": str(i), "profile": f"profile {i}"} for i in range(5)]
+    records[1]["language"] = "go"
+    records[3] = {"id": "3", "profile": "boom"}
+    options = {"language": "all", "per_page": 3, "top_n": 10, "model_name": "m"}
+    results = list(batch.score_profiles(records, options, processes=1, batch_size=2))
+
+    assert [r["id"] for r in results] == ["0", "1", "2", "3", "4"]
+    assert results[1]["recommendations"][0]["language"] == "go"
+    assert results[3] == {"id": "3", "error": "fetch failed"}
+    assert encoded == [["profile 0", "profile 1"], ["profile 2", "boom"], ["profile 4"]]
+
+
+def test_worker_pool_keeps_input_order():
+    """Batches scored by spawned workers are written back in input order."""
+    # Records the workers can answer without a model or network, so the spawn path runs anywhere
+    records = []
+    for i in range(9):
+        records.append({"id": str(i), "error": f"bad line {i}"} if i % 2 else {"id": str(i), "profile": ""})
+    options = {"language": "all", "per_page": 3, "top_n": 10, "model_name": "/nonexistent/model"}
+    results = list(batch.score_profiles(records, options, processes=2, batch_size=2))
+
+    assert [r["id"] for r in results] == [str(i) for i in range(9)]
+    assert results[1] == {"id": "1", "error": "bad line 1"}
+    assert results[2] == {"id": "2", "error": "Empty profile"}
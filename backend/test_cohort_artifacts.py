@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for precomputed cohort artifacts:
+1. Builds store normalized embeddings, and rebuilds only re-encode changed issues
+2. The registry reloads rebuilt artifacts and ignores stale or empty ones
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+from cohort_artifacts import CohortRegistry, _paths, build_cohort_artifact, issue_text
+
+
+class StubEncoder:
+    """Deterministic 3-d vectors from the text; records every text it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, show_progress_bar=False):
+        self.encoded.extend(texts)
+        return np.array([[len(t), t.count("a") + 1, t.count("e") + 1] for t in texts], dtype=np.float32)
+
+
+def _issues(*titles):
+    return [{"title": title, "body": f"body of {title}", "url": f"https://github.com/o/r/issues/{n}", "repo": "o/r",
+             "labels": ["good first issue"], "stars": 5, "comments": n, "updated_at": "2026-01-01T00:00:00Z",
+             "label_strength": 0.5} for n, title in enumerate(titles, start=1)]
+
+
+def test_build_and_incremental_rebuild(tmp_path):
+    encoder = StubEncoder()
+    first = build_cohort_artifact("python", "beginner", _issues("alpha", "beta", "gamma"), encoder, "m", str(tmp_path))
+    assert len(encoder.encoded) == 3
+    assert np.allclose(np.linalg.norm(first.embeddings, axis=1), 1.0)
+    assert first.issues[1]["url"] == "https://github.com/o/r/issues/2"
+    assert first.issues[1]["body"] == "body of beta"
+
+    scores = first.score(np.array(first.embeddings[2]) * 3)
+    assert scores.shape == (3,) and np.isclose(scores[2], 1.0)
+
+    encoder.encoded.clear()
+    issues = _issues("alpha", "beta edited", "gamma")
+    second = build_cohort_artifact("python", "beginner", issues, encoder, "m", str(tmp_path))
+    assert encoder.encoded == [issue_text(issues[1])]
+    assert np.array_equal(second.embeddings[0], first.embeddings[0])
+    assert np.array_equal(second.embeddings[2], first.embeddings[2])
+    assert not np.allclose(second.embeddings[1], first.embeddings[1])
+
+
+def test_registry_reloads_and_skips_stale_or_empty(tmp_path):
+    directory = str(tmp_path)
+    registry = CohortRegistry(directory)
+    assert registry.get("python", "beginner", "m") is None
+
+    build_cohort_artifact("python", "beginner", _issues("alpha"), StubEncoder(), "m", directory)
+    loaded = registry.get("python", "beginner", "m")
+    assert len(loaded.issues) == 1
+    assert registry.get("python", "beginner", "m") is loaded  # unchanged files are not reloaded
+
+    build_cohort_artifact("python", "beginner", _issues("alpha", "beta"), StubEncoder(), "m", directory)
+    _, json_path = _paths(directory, "python", "beginner", "m")
+    later = time.time() + 5
+    os.utime(json_path, (later, later))  # mtime resolution can hide a rebuild within the same tick
+    assert len(registry.get("python", "beginner", "m").issues) == 2
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["built_at"] = time.time() - 10 * 24 * 3600
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.utime(json_path, (later + 5, later + 5))
+    assert registry.get("python", "beginner", "m") is None
+
+    empty = build_cohort_artifact("go", "beginner", [], StubEncoder(), "m", directory)
+    assert len(empty.issues) == 0 and empty.embeddings.shape[0] == 0
+    assert registry.get("go", "beginner", "m") is None
+    assert registry.load_all() == 0
+
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for request deadlines:
+1. Per-repo fetches stop once the deadline expires; the issues fetched so far
+   are returned, flagged partial and not cached
+2. Issue encoding stops between batches when another batch would overrun
+"""
+
+import time
+
+import diskcache as dc
+import numpy as np
+
+import core
+from deadlines import Deadline
+from issue_index import IssueIndex
+from repo_catalog import RepoCatalog
+from repo_health import RepoHealth
+
+
+class Resp:
+    def __init__(self, payload):
+        self.payload = payload
+        self.links = {}
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def _slow_github(delay):
+    """requests.get stand-in: 10 repos, 2 issues each, every /issues call takes delay seconds."""
+    def get(url, headers=None, params=None, timeout=None):
+        if "search/repositories" in url:
+            return Resp({"items": [{"full_name": f"o/r{i}", "stargazers_count": 10} for i in range(10)]})
+        time.sleep(delay)
+        repo = url.split("/repos/")[1].split("/issues")[0]
+        return Resp([{"title": f"{repo} #{n}", "body": "", "html_url": f"https://github.com/{repo}/issues/{n}",
+                      "labels": [{"name": "good first issue"}]} for n in (1, 2)])
+    return get
+
+
+def test_deadline_basics():
+    unbounded = Deadline(None)
+    assert unbounded.remaining() == float("inf") and not unbounded.expired()
+    assert unbounded.clamp(10) == 10
+
+    deadline = Deadline(1)
+    time.sleep(0.01)
+    assert deadline.expired() and deadline.clamp(10) == 0
+    deadline.mark_partial("test")
+    assert deadline.partial and deadline.reasons == ["test"]
+
+
+def test_rest_fetch_returns_partial_results(monkeypatch, tmp_path):
+    monkeypatch.setattr(core.requests, "get", _slow_github(0.05))
+    monkeypatch.setattr(core.issue_cache, "disk", dc.Cache(str(tmp_path)))
+    monkeypatch.setattr(core, "issue_index", IssueIndex(str(tmp_path / "index.db")))
+    monkeypatch.setattr(core, "repo_health", RepoHealth(dc.Cache(str(tmp_path / "health"))))
+    monkeypatch.setattr(core, "repo_catalog", RepoCatalog(str(tmp_path / "catalog.db")))
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    core.issue_cache.clear_memory()
+    try:
+        deadline = Deadline(120)
+        issues = core.fetch_github_issues("python", per_page=20, top_n=10, experience_level="beginner",
+                                          incremental=False, backend="rest", deadline=deadline)
+        assert deadline.partial
+        assert 0 < len(issues) < 20
+        assert core.get_cached_issues("python", 10, "beginner") is None
+
+        complete = Deadline(None)
+        issues = core.fetch_github_issues("python", per_page=20, top_n=10, experience_level="beginner",
+                                          incremental=False, backend="rest", deadline=complete)
+        assert not complete.partial and len(issues) == 20
+    finally:
+        core.issue_cache.clear_memory()
+
+
+class SlowModel:
+    def encode(self, texts, show_progress_bar=False):
+        time.sleep(0.05)
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def test_encoding_stops_between_batches(monkeypatch, tmp_path):
+    monkeypatch.setattr(core, "cache", dc.Cache(str(tmp_path)))
+    monkeypatch.setattr(core, "ISSUE_ENCODE_BATCH", 2)
+    issues = [{"title": f"issue {i}", "body": ""} for i in range(10)]
+
+    deadline = Deadline(80)
+    kept, embeddings = core.embed_issues_within_deadline(issues, SlowModel(), "m", deadline)
+    assert deadline.partial
+    assert 2 <= len(kept) < 10 and embeddings.shape == (len(kept), 4)
+
+    kept, embeddings = core.embed_issues_within_deadline(issues, SlowModel(), "m")
+    assert len(kept) == 10 and embeddings.shape == (10, 4)
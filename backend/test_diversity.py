@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests for diversity-aware selection:
+1. MMR skips near-duplicates of already picked issues
+2. The per-repo quota caps picks per repo but never shortens the page
+"""
+
+import numpy as np
+
+from diversity import diverse_top_k, mmr_select, normalize_rows
+
+
+def test_mmr_skips_near_duplicates():
+    embeddings = normalize_rows(np.array([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]]))
+    relevance = np.array([0.9, 0.89, 0.6])
+    assert list(mmr_select(embeddings, relevance, 2, lambda_=1.0)) == [0, 1]
+    assert list(mmr_select(embeddings, relevance, 2, lambda_=0.5)) == [0, 2]
+
+
+def test_repo_quota():
+    rng = np.random.default_rng(0)
+    embeddings = normalize_rows(rng.standard_normal((10, 8)))
+    relevance = np.linspace(1.0, 0.1, 10)
+    repos = ["a"] * 8 + ["b", "c"]
+
+    picks = mmr_select(embeddings, relevance, 4, lambda_=1.0, groups=repos, quota=2)
+    assert sorted(repos[i] for i in picks) == ["a", "a", "b", "c"]
+
+    # Quota is lifted once other repos run out, so the page stays full
+    picks = mmr_select(embeddings, relevance, 6, lambda_=1.0, groups=repos, quota=2)
+    assert len(set(picks.tolist())) == 6
+
+
+def test_pooled_selection_returns_corpus_indices():
+    rng = np.random.default_rng(1)
+    embeddings = normalize_rows(rng.standard_normal((1000, 16)))
+    relevance = rng.random(1000).astype(np.float32)
+    picks = diverse_top_k(embeddings, relevance, 5, lambda_=1.0, pool_factor=2, normalized=True)
+    assert picks == list(np.argsort(-relevance)[:5])
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for the /recommend response path:
+1. Field selection drops unrequested fields (e.g. bodies)
+2. Large responses are gzip-compressed; numpy values serialize
+"""
+
+import json
+import tempfile
+
+import diskcache as dc
+import numpy as np
+from fastapi.testclient import TestClient
+
+import api
+from fast_json import dumps, select_fields
+from result_windows import ResultWindowStore
+
+
+def _issues(n):
+    return [{"title": f"issue {i}", "body": "x" * 2000, "url": f"u{i}", "repo": "o/r", "similarity": 0.5}
+            for i in range(n)]
+
+
+def test_dumps_and_select_fields():
+    assert json.loads(dumps({"a": np.float32(0.5), "b": np.arange(2)})) == {"a": 0.5, "b": [0, 1]}
+    assert select_fields(_issues(1), ["title", "similarity", "missing"]) == [{"title": "issue 0", "similarity": 0.5}]
+    assert select_fields(_issues(1), None) == _issues(1)
+
+
+def test_recommend_fields_and_gzip(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        # A full window, so the first response opens a cursor for the later pages
+        monkeypatch.setattr(api, "recommend_issues", lambda per_page, **kwargs: _issues(kwargs["window"]))
+        monkeypatch.setattr(api, "result_windows", ResultWindowStore(dc.Cache(tmp)))
+        client = TestClient(api.app)
+
+        res = client.post("/recommend", json={"per_page": 5, "fields": ["title", "url"]})
+        assert res.json()["recommendations"][0] == {"title": "issue 0", "url": "u0"}
+        cursor = res.json()["next_cursor"]
+        assert cursor is not None
+        page = client.post("/recommend", json={"cursor": cursor, "per_page": 5, "fields": ["repo", "url"]}).json()
+        assert page["recommendations"][0] == {"repo": "o/r", "url": "u5"}
+
+        third = client.post("/recommend", json={"cursor": page["next_cursor"], "per_page": 5},
+                            headers={"Accept-Encoding": "gzip"})
+        assert third.headers["content-encoding"] == "gzip"
+        assert third.json()["recommendations"][0]["url"] == "u10"
+
+        full = client.post("/recommend", json={"per_page": 5}, headers={"Accept-Encoding": "gzip"})
+        assert full.headers["content-encoding"] == "gzip"
+        assert full.json()["recommendations"][0]["body"] == "x" * 2000
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for Link-header pagination:
+1. rel="last" pages are fetched concurrently within the page budget
+2. rel="next" links are followed sequentially
+3. Queued pages get the time left when they start, not when they were queued
+"""
+
+import time
+
+import github_pagination
+from github_pagination import fetch_pages
+
+URL = "https://api.github.com/repos/o/r/issues"
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload, links=None):
+        self.payload = payload
+        self.links = links or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def test_last_link_pages_fetched_in_parallel(monkeypatch):
+    """Pages 2..max_pages are requested by number and returned in order."""
+    requested = []
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        page = params["page"]
+        requested.append(page)
+        links = {"last": {"url": f"{URL}?per_page=100&page=9"}} if page == 1 else {}
+        return FakeResponse([page], links)
+
+    monkeypatch.setattr(github_pagination.requests, "get", fake_get)
+    pages = fetch_pages(URL, {}, {"per_page": 100}, max_pages=4, time_budget=5)
+    assert pages == [[1], [2], [3], [4]]
+    assert sorted(requested) == [1, 2, 3, 4]
+
+
+def test_next_links_followed(monkeypatch):
+    """Without rel="last" the traversal follows rel="next" until the budget."""
+    def fake_get(url, headers=None, params=None, timeout=None):
+        page = params["page"] if params else int(url.rsplit("=", 1)[1])
+        return FakeResponse([page], {"next": {"url": f"{URL}?page={page + 1}"}})
+
+    monkeypatch.setattr(github_pagination.requests, "get", fake_get)
+    pages = fetch_pages(URL, {}, {"per_page": 100}, max_pages=3, time_budget=5)
+    assert pages == [[1], [2], [3]]
+
+
+def test_queued_pages_get_the_remaining_budget(monkeypatch):
+    timeouts = {}
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        page = params["page"]
+        timeouts[page] = timeout
+        if page == 2:
+            time.sleep(0.5)
+        links = {"last": {"url": f"{URL}?per_page=100&page=3"}} if page == 1 else {}
+        return FakeResponse([page], links)
+
+    monkeypatch.setattr(github_pagination.requests, "get", fake_get)
+    monkeypatch.setattr(github_pagination, "PAGE_FETCH_WORKERS", 1)
+    pages = fetch_pages(URL, {}, {"per_page": 100}, max_pages=3, time_budget=5)
+    assert pages == [[1], [2], [3]]
+    # Page 3 waited behind page 2, so it may only use what is left of the budget
+    assert timeouts[3] <= timeouts[2] - 0.4
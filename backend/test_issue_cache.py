@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the two-tier issue cache:
+1. Columnar encode/decode round trip
+2. Memory tier hits and TTL expiry
+3. Disk tier hits from a fresh process-level cache
+4. Callers get their own issue dicts
+"""
+
+import tempfile
+import time
+
+import diskcache as dc
+
+from issue_cache import TieredIssueCache, decode_issues, encode_issues
+
+ISSUES = [
+    {"title": "Fix typo", "body": "README typo", "url": "https://github.com/a/b/issues/1", "repo": "a/b"},
+    {"title": "Add test", "body": None, "url": "https://github.com/a/b/issues/2", "repo": "a/b"},
+    {"title": "Docs", "body": "Explain setup", "url": "https://github.com/c/d/issues/3", "repo": "c/d"},
+]
+
+
+def test_encode_decode_round_trip():
+    """Columnar records interning repos decode back to the same dicts."""
+    record = encode_issues(ISSUES)
+    assert record["repos"] == ["a/b", "c/d"]
+    assert list(record["repo_ids"]) == [0, 0, 1]
+
+    decoded = decode_issues(record)
+    assert [issue["title"] for issue in decoded] == [issue["title"] for issue in ISSUES]
+    assert decoded[1]["body"] == ""
+    assert list(decoded[0]) == ["title", "body", "url", "repo"]
+
+
+def test_memory_tier_and_expiry():
+    """Entries are served from memory until their TTL passes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tiered = TieredIssueCache(dc.Cache(tmp), ttl=1)
+        tiered.set("issues_python_10", ISSUES)
+
+        assert tiered.get("issues_python_10") == ISSUES
+        assert tiered.stats["memory_hits"] == 1
+
+        time.sleep(1.1)
+        assert tiered.get("issues_python_10") is None
+
+
+class CountingCache(dc.Cache):
+    """diskcache that records the keys it is asked for."""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.reads = []
+
+    def get(self, key, *args, **kwargs):
+        self.reads.append(key)
+        return super().get(key, *args, **kwargs)
+
+
+def test_disk_tier_hit():
+    """A cold memory tier falls back to a single disk record, read with one lookup."""
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = CountingCache(tmp)
+        TieredIssueCache(disk, ttl=60).set("issues_go_10", ISSUES)
+
+        cold = TieredIssueCache(disk, ttl=60)
+        issues = cold.get("issues_go_10")
+        assert [issue["url"] for issue in issues] == [issue["url"] for issue in ISSUES]
+        assert [issue["body"] for issue in issues] == ["README typo", "", "Explain setup"]
+        assert cold.stats["disk_hits"] == 1
+        assert disk.reads == ["issues_go_10"]
+
+        assert cold.get("issues_go_10") is not None
+        assert cold.stats["memory_hits"] == 1
+
+
+def test_callers_get_their_own_dicts():
+    """Annotating returned issues does not change what the next caller sees."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tiered = TieredIssueCache(dc.Cache(tmp), ttl=60)
+        issues = [dict(issue) for issue in ISSUES]
+        tiered.set("issues_rust_10", issues)
+        issues[0]["title"] = "changed by the fetcher"
+
+        first = tiered.get("issues_rust_10")
+        first[0]["similarity"] = 0.9
+        second = tiered.get("issues_rust_10")
+        assert second[0]["title"] == "Fix typo" and "similarity" not in second[0]
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-signal ranking:
+1. Signals are scaled to [0, 1] and missing values stay neutral
+2. Blending lets recency/label strength break near-ties in similarity
+"""
+
+import numpy as np
+import pytest
+
+from issue_features import IssueFeatures, blend_scores, issue_signals, parse_weights
+
+NOW = 1_760_000_000.0  # fixed clock for recency
+
+
+def _issue(updated_at, stars=0, comments=0, label_strength=0.0):
+    return {"title": "t", **issue_signals(stars, updated_at, comments, label_strength)}
+
+
+def test_signals_scaled():
+    issues = [
+        _issue("2025-10-09T08:53:20Z", stars=100_000, comments=0, label_strength=1.0),
+        _issue(None, stars=0, comments=500),
+    ]
+    signals = IssueFeatures.from_issues(issues).signals(now=NOW)
+    assert np.isclose(signals["recency"][0], 1.0, atol=1e-3)
+    assert signals["recency"][1] == 0.0
+    assert np.allclose(signals["stars"], [1.0, 0.0])
+    assert np.allclose(signals["comments"], [0.0, 1.0])
+    assert np.allclose(signals["label"], [1.0, 0.0])
+
+
+def test_blend_breaks_ties():
+    issues = [_issue("2024-01-01T00:00:00Z"), _issue("2025-10-09T08:53:20Z", label_strength=1.0)]
+    features = IssueFeatures.from_issues(issues)
+    similarities = np.array([0.60, 0.58])
+
+    only_similarity = parse_weights("recency=0,stars=0,comments=0,label=0")
+    assert np.allclose(blend_scores(similarities, features, only_similarity, now=NOW), similarities)
+
+    blended = blend_scores(similarities, features, parse_weights(""), now=NOW)
+    assert blended[1] > blended[0]
+
+
+def test_parse_weights_rejects_unknown():
+    with pytest.raises(ValueError):
+        parse_weights("popularity=1")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite issue index:
+1. Filters by language and level, BM25 + cosine fusion, and stale embeddings
+   being dropped when an issue's text changes
+2. A read-only handle serves queries but never writes
+"""
+
+import numpy as np
+
+from issue_index import IssueIndex, fts_query
+
+
+def _issue(n, title, body="", repo="o/r"):
+    return {"title": title, "body": body, "url": f"https://github.com/{repo}/issues/{n}", "repo": repo,
+            "labels": ["good first issue"], "stars": 10, "comments": 1, "updated_at": "2026-01-01T00:00:00Z",
+            "label_strength": 0.5}
+
+
+def _index(tmp_path):
+    index = IssueIndex(str(tmp_path / "issues.db"))
+    python = [_issue(1, "Fix asyncio timeout", "asyncio event loop"), _issue(2, "Improve docs"),
+              _issue(3, "Parser crash on unicode")]
+    index.add_issues(python, "python", "beginner")
+    index.add_issues([_issue(4, "Goroutine leak", repo="o/go")], "go", "beginner")
+    index.add_embeddings("m", python, np.array([[1, 0], [0, 1], [0.7, 0.7]], dtype=np.float32))
+    index.add_embeddings("m", [_issue(4, "Goroutine leak", repo="o/go")], np.array([[1, 0]], dtype=np.float32))
+    return index, python
+
+
+def test_fts_query_quotes_terms():
+    assert fts_query('C++ "AND" c++ NEAR(x)') == '"c++" OR "and" OR "near"'
+    assert fts_query("!!") is None
+
+
+def test_hybrid_search_filters_and_fuses(tmp_path):
+    index, python = _index(tmp_path)
+    assert index.count("m", "python", "beginner") == 3
+    assert index.count("m", "python", "advanced") == 0
+    assert index.count("other-model", "python", "beginner") == 0
+
+    # Vector-only ranking prefers issue 1; the lexical match on "unicode parser" lifts issue 3
+    issues, scores, cosine, vectors = index.hybrid_search("unicode parser", np.array([1, 0.1]), "m", "python",
+                                                          "beginner", k=3, alpha=1.0)
+    assert [issue["url"][-1] for issue in issues] == ["1", "3", "2"]
+    issues, scores, cosine, vectors = index.hybrid_search("unicode parser", np.array([1, 0.1]), "m", "python",
+                                                          "beginner", k=2, alpha=0.5)
+    assert [issue["url"][-1] for issue in issues] == ["3", "1"]
+    assert issues[0]["body"] == "" and issues[1]["body"] == "asyncio event loop"
+    assert vectors.shape == (2, 2) and np.all(np.diff(scores) <= 0)
+    # The raw cosine is returned next to the fused score (issue 3 is not the closest vector)
+    assert cosine[0] < cosine[1] and np.isclose(cosine[1], vectors[1] @ np.array([1, 0.1]) / np.linalg.norm([1, 0.1]))
+    assert all(issue["repo"] == "o/r" for issue in issues)
+
+    # Changed text invalidates the stored embedding
+    index.add_issues([_issue(2, "Improve docs", "now with a body")], "python", "beginner")
+    assert index.count("m", "python", "beginner") == 2
+
+
+def test_readonly_index(tmp_path):
+    _index(tmp_path)
+    readonly = IssueIndex(str(tmp_path / "issues.db"), readonly=True)
+    assert readonly.add_issues([_issue(9, "new")], "python", "beginner") == 0
+    assert readonly.count("m", "python", "beginner") == 3
+    assert IssueIndex(str(tmp_path / "missing.db"), readonly=True).count("m", None, "any") == 0
+
+
+def test_fused_score_orders_but_cosine_is_reported(tmp_path):
+    import core
+
+    index, _ = _index(tmp_path)
+    issues, fused, cosine, vectors = index.hybrid_search("unicode parser", np.array([1, 0.1]), "m", "python",
+                                                         "beginner", k=3, alpha=0.5)
+    ranked = core.rank_candidates(issues, cosine, 3, embeddings=vectors, normalized=True, diversity=False,
+                                  weights={}, relevance=fused)
+    assert [issue["url"] for issue, _ in ranked] == [issue["url"] for issue in issues]
+    assert [similarity for _, similarity in ranked] == [float(c) for c in cosine]
+    assert max(similarity for _, similarity in ranked) < 1.0
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar issue table:
+1. Rows round-trip through JSON columns (URLs rebuilt from numbers, odd URLs kept)
+2. Bodies are loaded lazily and only once
+"""
+
+import json
+
+from issue_records import IssueTable
+
+ISSUES = [
+    {"title": "Fix typo", "body": "body one", "url": "https://github.com/o/r/issues/7", "repo": "o/r",
+     "labels": ["good first issue"], "stars": 120, "updated_at": "2025-06-01T12:00:00Z", "comments": 3,
+     "label_strength": 0.5},
+    {"title": "Mirror issue", "body": "body two", "url": "https://example.com/x", "repo": "o/r"},
+]
+
+
+def test_roundtrip():
+    table = IssueTable.from_dicts(ISSUES)
+    assert table.repos == ["o/r"] and list(table.repo_ids) == [0, 0]
+    assert table[0] == ISSUES[0]
+
+    restored = IssueTable.from_columns(json.loads(json.dumps(table.to_columns())), lambda: ["a", "b"])
+    assert restored.row(0, include_body=False, similarity=0.9) == {
+        **{k: v for k, v in ISSUES[0].items() if k != "body"}, "similarity": 0.9}
+    second = restored[1]
+    assert second["url"] == "https://example.com/x"
+    assert second["updated_at"] is None and second["stars"] == 0
+
+
+def test_bodies_loaded_lazily():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return ["first", "second"]
+
+    table = IssueTable.from_columns(IssueTable.from_dicts(ISSUES).to_columns(), loader)
+    assert table.row(0, include_body=False)["title"] == "Fix typo"
+    assert loads == []
+    assert [table[0]["body"], table[1]["body"]] == ["first", "second"]
+    assert loads == [1]
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental issue sync:
+1. First sync stores open issues and sets the watermark
+2. Later syncs pass `since` and apply edits, label changes and closures
+"""
+
+import tempfile
+
+import diskcache as dc
+
+import github_pagination
+from issue_sync import IssueStore, sync_repo_issues
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def _item(number, updated_at, state="open", labels=("good first issue",), title=None):
+    return {
+        "number": number,
+        "title": title or f"Issue {number}",
+        "body": "body",
+        "html_url": f"https://github.com/o/r/issues/{number}",
+        "state": state,
+        "labels": [{"name": name} for name in labels],
+        "updated_at": updated_at,
+    }
+
+
+def test_incremental_sync(monkeypatch):
+    """Watermarks drive `since` and only changed issues are touched."""
+    calls = []
+    responses = [
+        [_item(1, "2026-01-01T00:00:00Z"), _item(2, "2026-01-02T00:00:00Z")],
+        [
+            _item(1, "2026-01-03T00:00:00Z", labels=("bug",), title="Edited"),
+            _item(2, "2026-01-04T00:00:00Z", state="closed"),
+            _item(3, "2026-01-05T00:00:00Z"),
+        ],
+    ]
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        calls.append(dict(params))
+        return FakeResponse(responses[len(calls) - 1])
+
+    monkeypatch.setattr(github_pagination.requests, "get", fake_get)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = IssueStore(dc.Cache(tmp))
+
+        touched, closed = sync_repo_issues("o", "r", store, headers={})
+        assert touched == {1, 2} and closed == set()
+        assert "since" not in calls[0] and calls[0]["state"] == "open"
+        assert store.watermark("o/r") == "2026-01-02T00:00:00Z"
+
+        touched, closed = sync_repo_issues("o", "r", store, headers={})
+        assert calls[1]["since"] == "2026-01-02T00:00:00Z" and calls[1]["state"] == "all"
+        assert touched == {1, 3} and closed == {2}
+
+        issues = store.open_issues("o/r")
+        assert [issue["number"] for issue in issues] == [3, 1]
+        assert issues[1]["title"] == "Edited" and issues[1]["labels"] == ["bug"]
+        assert store.watermark("o/r") == "2026-01-05T00:00:00Z"
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled label matcher:
+1. Normalization of case, separators and emoji
+2. Exact, prefix and regex rules
+3. Aliases learned from co-occurrence
+"""
+
+from label_matcher import LabelMatcher, normalize_label
+
+MATCHER = LabelMatcher(
+    {"beginner": ["good first issue", "easy"], "advanced": ["performance"]},
+    prefixes={"beginner": ["difficulty easy", "e easy"], "advanced": ["e hard"]},
+    patterns={"beginner": [r"\bgood first (?:bug|pr)\b"]},
+)
+
+
+def test_normalize_label():
+    assert normalize_label("Good-First-Issue") == "good first issue"
+    assert normalize_label("good first issue :rocket:") == "good first issue"
+    assert normalize_label("✨ Good first issue ✨") == "good first issue"
+    assert normalize_label("difficulty/easy") == "difficulty easy"
+
+
+def test_rules():
+    assert MATCHER.classify("GOOD_FIRST_ISSUE") == {"beginner"}
+    assert MATCHER.classify("E-easy") == {"beginner"}
+    assert MATCHER.classify("Difficulty: Easy") == {"beginner"}
+    assert MATCHER.classify("good first bug") == {"beginner"}
+    assert MATCHER.classify("E-hard") == {"advanced"}
+    assert MATCHER.classify("easyness") == frozenset()
+    assert MATCHER.matches(["wontfix", "E-easy"], "beginner")
+    assert not MATCHER.matches(["wontfix"], "beginner")
+    assert MATCHER.matches([], "any")
+
+
+def test_normalization_keeps_levels_apart():
+    """Spellings that normalize alike but sit in different levels keep their own levels."""
+    matcher = LabelMatcher({"beginner": ["help-wanted"], "intermediate": ["help wanted", "help-wanted"]})
+    assert matcher.classify("Help Wanted") == {"intermediate"}
+    assert matcher.classify("help-wanted") == {"beginner", "intermediate"}
+    assert not matcher.matches(["help_wanted"], "beginner")
+
+
+def test_learned_aliases(tmp_path):
+    aliases_path = tmp_path / "aliases.json"
+    matcher = LabelMatcher({"beginner": ["good first issue"]}, aliases_path=str(aliases_path),
+                           learn=True, min_support=3)
+    for _ in range(3):
+        matcher.matches(["good first issue", "Area: Docs"], "beginner")
+
+    assert matcher.classify("area/docs") == {"beginner"}
+    reloaded = LabelMatcher({}, aliases_path=str(aliases_path))
+    assert reloaded.classify("Area: Docs") == {"beginner"}
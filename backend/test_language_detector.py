@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for keyword-based language detection:
+1. Keywords match whole tokens only, multi-word keywords match as phrases,
+   and versioned or dotted names still count
+2. Weights decide between languages, each keyword counts once, and
+   detect_batch agrees with detect
+"""
+
+from language_detector import DEFAULT_DETECTOR, LanguageDetector
+
+
+def test_whole_token_matching():
+    assert DEFAULT_DETECTOR.detect("I am a good developer and enjoy going outside") == "all"
+    assert DEFAULT_DETECTOR.detect("A Swift fan who reads about its internals") == "swift"
+    assert DEFAULT_DETECTOR.scores("its")["typescript"] == 0
+    assert DEFAULT_DETECTOR.detect("Learning Go, mostly goroutines") == "go"
+
+
+def test_versioned_and_dotted_keywords():
+    assert DEFAULT_DETECTOR.detect("Scripting with python3 every day") == "python"
+    assert DEFAULT_DETECTOR.detect("Built app.js and a small API") == "javascript"
+    assert DEFAULT_DETECTOR.detect("Enterprise apps on .NET.") == "csharp"
+    assert DEFAULT_DETECTOR.detect("Game engines in C++") == "c++"
+
+
+def test_multi_word_phrases():
+    scores = DEFAULT_DETECTOR.scores("Web apps with Ruby on Rails and Spring Boot services")
+    assert scores["ruby"] == 2.0 + 1.0 + 1.0  # ruby, rails, ruby on rails
+    assert scores["java"] == 0.5 + 1.0  # spring, spring boot
+    assert DEFAULT_DETECTOR.scores("boot the spring release")["java"] == 0.5
+
+
+def test_weights_and_single_counting():
+    assert DEFAULT_DETECTOR.scores("python python python")["python"] == 2.0
+    # The language name outweighs an ambiguous framework word
+    assert DEFAULT_DETECTOR.detect("I know Python and some Go") == "python"
+    assert DEFAULT_DETECTOR.detect("Express backend, typescript frontend") == "typescript"
+    # Ties keep declaration order
+    detector = LanguageDetector({"a": {"x": 1.0}, "b": {"y": 1.0}})
+    assert detector.detect("y x") == "a"
+    assert detector.detect("y x", allowed=["b"]) == "b"
+
+
+def test_detect_batch():
+    texts = ["Django and pandas", "", "rust and cargo", "nothing relevant"]
+    assert DEFAULT_DETECTOR.detect_batch(texts) == [DEFAULT_DETECTOR.detect(t) for t in texts]
+    assert DEFAULT_DETECTOR.detect_batch(texts) == ["python", "all", "rust", "all"]
+    assert DEFAULT_DETECTOR.detect_batch(texts, allowed=["rust"], default="any") == ["any", "any", "rust", "any"]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the memoized profile analysis:
+1. A repeated (normalized) profile is served from one cached record without
+   re-encoding or re-running detection
+2. Records and profile embeddings are kept apart per model and detector
+"""
+
+import diskcache as dc
+import numpy as np
+
+import core
+
+
+class CountingModel:
+    """Deterministic bag-of-characters embeddings; counts encode calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, show_progress_bar=False):
+        self.calls += 1
+        single = isinstance(texts, str)
+        batch = [texts] if single else texts
+        vectors = np.array([[t.count(c) + 1 for c in "aeiourst"] for t in batch], dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+PROFILE = "I am a Python beginner learning loops and functions"
+
+
+def _use_temp_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(core, "cache", dc.Cache(str(tmp_path / "cache")))
+    monkeypatch.setattr(core, "_get_reference_embeddings_file_path", lambda: str(tmp_path / "ref.pkl"))
+    monkeypatch.setattr(core, "PROFILE_NEAR_DUPLICATES", False)
+    monkeypatch.setattr(core, "PROFILE_CHUNKING", False)
+
+
+def test_repeated_profile_is_one_lookup(monkeypatch, tmp_path):
+    _use_temp_cache(monkeypatch, tmp_path)
+    model = CountingModel()
+
+    first = core.analyze_student_profile(PROFILE, model, "m1")
+    calls = model.calls
+    second = core.analyze_student_profile("  i am a python BEGINNER learning loops and functions ", model, "m1")
+
+    assert model.calls == calls  # no embedding or reference encoding on the hit
+    assert first["language"] == second["language"] == "python"
+    assert second["experience_level"] == first["experience_level"]
+    assert set(second["level_scores"]) == set(core.EXPERIENCE_LEVEL_REFERENCES)
+    assert np.allclose(second["embedding"], first["embedding"])
+
+
+def test_records_are_per_model_and_detector(monkeypatch, tmp_path):
+    _use_temp_cache(monkeypatch, tmp_path)
+    model = CountingModel()
+
+    core.analyze_student_profile(PROFILE, model, "m1")
+    calls = model.calls
+    core.analyze_student_profile(PROFILE, model, "m2")
+    assert model.calls > calls  # other model: profile and references are encoded again
+
+    keys = set(core.cache.iterkeys())
+    assert core._get_profile_cache_key(PROFILE, "m1") in keys
+    assert core._get_profile_cache_key(PROFILE, "m2") in keys
+    assert core._get_profile_analysis_key(PROFILE, "m1", use_phi=True) not in keys
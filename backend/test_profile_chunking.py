@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for long-profile chunking:
+1. Short profiles stay a single chunk; long ones respect the window size
+2. Editing one sentence re-encodes only the chunks that contain it
+"""
+
+import hashlib
+
+import numpy as np
+
+from profile_chunking import encode_profile_chunks, pool_chunk_embeddings, split_profile
+
+
+class CountingModel:
+    max_seq_length = 64
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, show_progress_bar=False):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        self.encoded += len(texts)
+        out = np.stack([np.frombuffer(hashlib.sha256(t.encode()).digest()[:8], dtype=np.uint8).astype(np.float32)
+                        for t in texts])
+        return out[0] if single else out
+
+
+def _resume(edit=None):
+    sentences = [f"Sentence {i} about python rust and databases with some filler words." for i in range(40)]
+    if edit is not None:
+        sentences[edit] = "I rewrote this sentence completely."
+    return " ".join(sentences)
+
+
+def test_split_profile():
+    """Windows never exceed max_words and every sentence is covered."""
+    assert split_profile("short python profile", 50) == ["short python profile"]
+    chunks = split_profile(_resume(), 38)
+    assert len(chunks) > 1
+    assert all(len(chunk.split()) <= 38 for chunk in chunks)
+    joined = " ".join(chunks)
+    assert all(f"Sentence {i} " in joined for i in range(40))
+
+
+def test_only_changed_chunks_reencoded():
+    """Chunk embeddings are cached individually and pooled into one unit vector."""
+    store = {}
+    model = CountingModel()
+    first = encode_profile_chunks(_resume(), model, store.get, store.__setitem__)
+    total = model.encoded
+    assert total > 1 and np.isclose(np.linalg.norm(first), 1.0)
+
+    model.encoded = 0
+    encode_profile_chunks(_resume(edit=20), model, store.get, store.__setitem__)
+    assert 0 < model.encoded <= 2
+
+
+def test_max_pooling():
+    pooled = pool_chunk_embeddings(np.array([[1.0, 0.0], [0.0, 1.0]]), pooling="max")
+    assert np.allclose(pooled, [np.sqrt(0.5), np.sqrt(0.5)])
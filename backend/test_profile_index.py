@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for profile normalization and near-duplicate lookup:
+1. Cosmetic edits normalize to the same text
+2. A typo fix maps to the earlier profile, a different stack does not
+3. Fingerprints are stable, so indexes written earlier stay valid
+"""
+
+import tempfile
+
+import diskcache as dc
+
+from profile_index import NearDuplicateIndex, hamming_distance, normalize_profile_text, simhash
+
+PROFILE = ("I am a backend developer with strong experience in Python, Django and Flask. "
+           "I enjoy writing tests and working on REST APIs and database performance.")
+
+
+def test_normalization():
+    """Whitespace, case and unicode width differences normalize away."""
+    assert normalize_profile_text("  Python\n\tDEVELOPER  ") == normalize_profile_text("python developer")
+    assert normalize_profile_text("ｐｙｔｈｏｎ") == "python"
+
+
+def test_near_duplicate_lookup():
+    """Lightly edited profiles reuse the indexed key; unrelated ones are rejected."""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(dc.Cache(tmp))
+        original = normalize_profile_text(PROFILE)
+        index.add(original, "student_profile_original")
+
+        typo = normalize_profile_text(PROFILE.replace("strong", "strnog"))
+        assert hamming_distance(simhash(original), simhash(typo)) <= index.max_distance
+        assert index.lookup(typo)[0] == "student_profile_original"
+
+        other = normalize_profile_text(
+            PROFILE.replace("Python", "Rust").replace("Django and Flask", "Actix and Tokio"))
+        assert index.lookup(other) is None
+        assert index.lookup("python developer") is None  # too short for fuzzy matching
+
+
+def test_simhash_is_stable():
+    """Values from the original per-bit loop; the numpy vote count must reproduce them."""
+    assert simhash("hello world python developer") == 2040828344379920612
+    assert simhash("a") == 4681665781835383343
+    assert simhash("") == 0
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the repository catalog:
+1. Crawled issue pages are summarized into per-level and per-label counts
+2. Catalog queries filter by level, language, minimum issues and freshness,
+   and the REST fetcher uses them instead of the live search
+3. A catalog that cannot fill the page is topped up by the live search
+"""
+
+import time
+
+import diskcache as dc
+
+import core
+from repo_catalog import RepoCatalog, summarize_issues
+from repo_health import RepoHealth
+
+
+def classify(label):
+    return frozenset({"good first issue": {"beginner"}, "hard": {"advanced"}}.get(label, set()))
+
+
+def test_summarize_issues():
+    items = [
+        {"labels": [{"name": "good first issue"}, {"name": "bug"}]},
+        {"labels": [{"name": "hard"}]},
+        {"labels": [{"name": "good first issue"}], "pull_request": {}},
+        {"labels": []},
+    ]
+    total, levels, labels = summarize_issues(items, classify)
+    assert total == 3
+    assert levels == {"beginner": 1, "advanced": 1, "any": 3}
+    assert labels == {"good first issue": 1, "bug": 1, "hard": 1}
+
+
+def _catalog(tmp_path):
+    catalog = RepoCatalog(str(tmp_path / "catalog.db"))
+    catalog.upsert("a/big", "Python", 900, 40, {"beginner": 5, "any": 40}, {"good first issue": 5})
+    catalog.upsert("a/small", "Python", 100, 3, {"beginner": 1, "any": 3}, {"good first issue": 1})
+    catalog.upsert("a/none", "Python", 800, 10, {"any": 10}, {"bug": 10})
+    catalog.upsert("b/go", "Go", 1000, 9, {"beginner": 9, "any": 9}, {"good first issue": 9})
+    catalog.upsert("a/stale", "Python", 5000, 9, {"beginner": 9, "any": 9}, {}, crawled_at=time.time() - 10**8)
+    return catalog
+
+
+def test_top_repositories_query(tmp_path):
+    catalog = _catalog(tmp_path)
+    assert catalog.top_repositories("python", "beginner", 10) == [("a", "big", 900), ("a", "small", 100)]
+    assert catalog.top_repositories("python", "beginner", 10, min_issues=2) == [("a", "big", 900)]
+    assert [r[1] for r in catalog.top_repositories("all", "beginner", 2)] == ["go", "big"]
+    assert catalog.label_vocabulary("a/none") == {"bug": 10}
+    assert RepoCatalog(str(tmp_path / "missing.db")).top_repositories("python", "beginner", 10) == []
+
+
+def test_rest_fetch_uses_catalog(monkeypatch, tmp_path):
+    requested = []
+
+    class Resp:
+        status_code = 200
+        links = {}
+        headers = {}
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return [{"title": "t", "body": "", "html_url": "https://github.com/a/big/issues/1",
+                     "labels": [{"name": "good first issue"}]}]
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        requested.append(url)
+        return Resp()
+
+    monkeypatch.setattr(core.requests, "get", fake_get)
+    monkeypatch.setattr(core, "repo_catalog", _catalog(tmp_path))
+    monkeypatch.setattr(core, "repo_health", RepoHealth(dc.Cache(str(tmp_path / "health"))))
+    monkeypatch.setattr(core, "REPO_CATALOG_ENABLED", True)
+
+    issues = core._fetch_github_issues_rest("python", 1, 10, "beginner", incremental=False)
+    assert [issue["repo"] for issue in issues] == ["a/big"]
+    assert requested == ["https://api.github.com/repos/a/big/issues"]
+
+
+def test_thin_catalog_is_topped_up_by_search(monkeypatch, tmp_path):
+    requested = []
+
+    class Resp:
+        status_code = 200
+        links = {}
+        headers = {}
+
+        def __init__(self, payload):
+            self.payload = payload
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.payload
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        requested.append(url)
+        if "search/repositories" in url:
+            return Resp({"items": [{"full_name": name, "stargazers_count": 1} for name in ("a/big", "c/live")]})
+        repo = url.split("/repos/", 1)[1].rsplit("/issues", 1)[0]
+        return Resp([{"title": "t", "body": "", "html_url": f"https://github.com/{repo}/issues/1",
+                      "labels": [{"name": "good first issue"}]}])
+
+    monkeypatch.setattr(core.requests, "get", fake_get)
+    monkeypatch.setattr(core, "repo_catalog", _catalog(tmp_path))
+    monkeypatch.setattr(core, "repo_health", RepoHealth(dc.Cache(str(tmp_path / "health"))))
+    monkeypatch.setattr(core, "REPO_CATALOG_ENABLED", True)
+
+    issues = core._fetch_github_issues_rest("python", 3, 10, "beginner", incremental=False)
+    # Both catalog repos first, then only the search result the catalog did not already cover
+    assert [issue["repo"] for issue in issues] == ["a/big", "a/small", "c/live"]
+    visited = [url for url in requested if "/repos/" in url]
+    assert list(dict.fromkeys(visited)) == [f"https://api.github.com/repos/{name}/issues"
+                                            for name in ("a/big", "a/small", "c/live")]
+    assert visited.index("https://api.github.com/repos/c/live/issues") > max(
+        i for i, url in enumerate(visited) if "/a/" in url)
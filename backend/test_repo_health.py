@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for repo health tracking:
+1. The circuit breaker opens on a high failure ratio, fails fast, and closes
+   again after a successful half-open probe
+2. A 404/410 repo no longer fails the request and, like a repo without
+   matching issues, is skipped on the next cold fetch
+3. A repo whose fetch ran out of time is not recorded as empty
+4. Only the half-open probe's own outcome, whatever it raises, closes or reopens the circuit
+"""
+
+import time
+
+import diskcache as dc
+import pytest
+import requests
+
+import core
+from repo_catalog import RepoCatalog
+from repo_health import CircuitBreaker, CircuitOpenError, RepoHealth
+
+
+class Resp:
+    def __init__(self, payload, status=200):
+        self.payload = payload
+        self.status_code = status
+        self.links = {}
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+    def json(self):
+        return self.payload
+
+
+def test_circuit_opens_and_recovers():
+    breaker = CircuitBreaker("test", failure_ratio=0.5, min_requests=4, window=60, cooldown=0.05)
+    for ok in (True, False, True, False):
+        breaker.record(ok)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    time.sleep(0.06)
+    assert breaker.check()  # the single half-open probe is let through
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    # A slow request sent before the circuit opened does not decide the probe
+    breaker.record(True)
+    assert breaker.state == "half_open"
+    breaker.record(True, probe=True)
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["rejected"] == 2
+
+
+def test_probe_that_raises_reopens_the_circuit():
+    """A non-network error in the probe still resolves it, so later probes are let through."""
+    breaker = CircuitBreaker("test", failure_ratio=0.5, min_requests=2, window=60, cooldown=0.05)
+    breaker.record(False)
+    breaker.record(False)
+    time.sleep(0.06)
+
+    def broken_send(url, **kwargs):
+        raise ValueError("bad url")
+
+    with pytest.raises(ValueError):
+        breaker._send(broken_send, "not a url")
+    assert breaker.state == "open"
+    time.sleep(0.06)
+    assert breaker._send(lambda url, **kwargs: Resp([]), "https://api.github.com") is not None
+    assert breaker.state == "closed"
+
+
+def test_failing_and_empty_repos_are_skipped(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        if "search/repositories" in url:
+            return Resp({"items": [{"full_name": name, "stargazers_count": 1} for name in ("o/gone", "o/empty", "o/ok")]})
+        calls.append(url)
+        if "o/gone" in url:
+            return Resp({"message": "Issues are disabled for this repository"}, status=410)
+        if "o/empty" in url:
+            return Resp([])
+        return Resp([{"title": "t", "body": "", "html_url": "https://github.com/o/ok/issues/1",
+                      "labels": [{"name": "good first issue"}]}])
+
+    monkeypatch.setattr(core.requests, "get", fake_get)
+    monkeypatch.setattr(core, "repo_health", RepoHealth(dc.Cache(str(tmp_path))))
+    monkeypatch.setattr(core, "repo_catalog", RepoCatalog(str(tmp_path / "catalog.db")))
+
+    issues = core._fetch_github_issues_rest("python", 5, 3, "beginner", incremental=False)
+    assert [issue["repo"] for issue in issues] == ["o/ok"]
+    assert any("o/gone" in url for url in calls) and any("o/empty" in url for url in calls)
+
+    calls.clear()
+    core._fetch_github_issues_rest("python", 5, 3, "beginner", incremental=False)
+    assert calls and all("o/ok" in url for url in calls)
+    assert core.repo_health.snapshot()["skipped_errors"] == 1
+    assert core.repo_health.snapshot()["skipped_empty"] == 1
+
+
+def test_timed_out_repo_is_not_recorded_empty(monkeypatch, tmp_path):
+    def fake_get(url, headers=None, params=None, timeout=None):
+        if "search/repositories" in url:
+            return Resp({"items": [{"full_name": "o/slow", "stargazers_count": 1}]})
+        # Page 1 has no match and the budget is gone before any later page
+        time.sleep(0.1)
+        return Resp([])
+
+    monkeypatch.setattr(core.requests, "get", fake_get)
+    monkeypatch.setattr(core, "REPO_TIME_BUDGET", 0.05)
+    monkeypatch.setattr(core, "repo_health", RepoHealth(dc.Cache(str(tmp_path))))
+    monkeypatch.setattr(core, "repo_catalog", RepoCatalog(str(tmp_path / "catalog.db")))
+
+    assert core._fetch_github_issues_rest("python", 5, 1, "beginner", incremental=False) == []
+    assert core.repo_health.skip_reason("o/slow", "beginner") is None
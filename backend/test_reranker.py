@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for two-stage ranking:
+1. Recall keeps the top-k by similarity; the cross-encoder reorders only those
+2. Pair scores are cached and the latency budget leaves the rest in recall order
+3. Diversity is applied after the rerank, not undone by it
+"""
+
+import time
+
+import numpy as np
+
+import core
+from reranker import CrossEncoderReranker, recall_top_k
+
+
+class DictCache(dict):
+    def set(self, key, value, expire=None):
+        self[key] = value
+
+
+class FakeCrossEncoder:
+    """Scores a pair by how often the issue title mentions 'rust'; optionally slow."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.pairs = 0
+
+    def predict(self, pairs, show_progress_bar=False):
+        time.sleep(self.delay)
+        self.pairs += len(pairs)
+        return np.array([text.count("rust") for _, text in pairs], dtype=np.float32)
+
+
+def _candidates(n):
+    issues = [{"title": "rust " * (i % 3) + f"issue {i}", "body": ""} for i in range(n)]
+    return [(issue, 1.0 - i / n) for i, issue in enumerate(issues)]
+
+
+def test_recall_top_k():
+    sims = np.array([0.1, 0.9, 0.5, 0.7])
+    assert list(recall_top_k(sims, 2)) == [1, 3]
+    assert list(recall_top_k(sims, 10)) == [1, 3, 2, 0]
+
+
+def test_rerank_top_k_and_cache():
+    reranker = CrossEncoderReranker("fake", DictCache(), top_k=6, budget_ms=10_000)
+    reranker._model = FakeCrossEncoder()
+    ranked = reranker.rerank("profile", _candidates(10))
+
+    assert [r[2] for r in ranked[:6]] == [2, 2, 1, 1, 0, 0]
+    assert all(r[2] is None for r in ranked[6:])
+    assert reranker._model.pairs == 6
+
+    reranker.rerank("profile", _candidates(10))
+    assert reranker._model.pairs == 6  # every pair served from the cache
+
+
+def test_budget_stops_scoring():
+    reranker = CrossEncoderReranker("fake", DictCache(), top_k=8, budget_ms=30, batch_size=2)
+    reranker._model = FakeCrossEncoder(delay=0.02)
+    ranked = reranker.rerank("profile", _candidates(8))
+
+    scored = [r for r in ranked if r[2] is not None]
+    assert 0 < len(scored) < 8
+    # Unscored candidates keep their recall order after the scored ones
+    unscored = [r[1] for r in ranked[len(scored):]]
+    assert unscored == sorted(unscored, reverse=True)
+
+
+def test_no_budget_skips_model_load():
+    reranker = CrossEncoderReranker("fake", DictCache(), top_k=4)
+
+    def load():
+        raise AssertionError("model loaded without budget")
+
+    reranker._get_model = load
+    ranked = reranker.rerank("profile", _candidates(4), budget_ms=0)
+    assert [r[2] for r in ranked] == [None] * 4
+
+
+def test_diversity_after_rerank(monkeypatch):
+    """The cross-encoder prefers one repo's issues, but the repo quota still holds in the final order."""
+    reranker = CrossEncoderReranker("fake", DictCache(), top_k=8, budget_ms=10_000)
+    reranker._model = FakeCrossEncoder()
+    monkeypatch.setattr(core, "reranker", reranker)
+    monkeypatch.setattr(core, "DIVERSITY_ENABLED", True)
+    issues = [{"title": "rust rust issue", "body": "", "repo": "a/a"} for _ in range(4)]
+    issues += [{"title": "issue", "body": "", "repo": "b/b"} for _ in range(4)]
+    embeddings = np.eye(8, dtype=np.float32)
+    similarities = np.linspace(0.9, 0.5, 8).astype(np.float32)
+
+    ranked = core.rank_and_rerank("profile", issues, similarities, 4, rerank=True, embeddings=embeddings,
+                                  normalized=True)
+    assert len(ranked) == 4
+    assert [issue["repo"] for issue, _, _ in ranked[:3]] == ["a/a"] * 3
+    assert ranked[3][0]["repo"] == "b/b"
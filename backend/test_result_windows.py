@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for cursor pagination on /recommend:
+1. The first call ranks once and returns a cursor; later pages come from the cache
+2. Expired or malformed cursors are rejected with 410
+"""
+
+import tempfile
+
+import diskcache as dc
+from fastapi.testclient import TestClient
+
+import api
+from result_windows import ResultWindowStore, decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor("abc_-1", 40)) == ("abc_-1", 40)
+
+
+def test_recommend_pagination(monkeypatch):
+    calls = []
+
+    def fake_recommend_issues(per_page, window, deadline, **kwargs):
+        calls.append((per_page, window))
+        deadline.mark_partial("test")
+        return [{"title": f"issue {i}", "url": f"u{i}", "repo": "o/r"} for i in range(45)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setattr(api, "recommend_issues", fake_recommend_issues)
+        monkeypatch.setattr(api, "result_windows", ResultWindowStore(dc.Cache(tmp)))
+        client = TestClient(api.app)
+
+        first = client.post("/recommend", json={"student_profile": "python", "per_page": 20}).json()
+        assert [r["title"] for r in first["recommendations"]][:2] == ["issue 0", "issue 1"]
+        assert len(first["recommendations"]) == 20
+
+        second = client.post("/recommend", json={"cursor": first["next_cursor"], "per_page": 20}).json()
+        third = client.post("/recommend", json={"cursor": second["next_cursor"], "per_page": 20}).json()
+        assert second["recommendations"][0]["title"] == "issue 20"
+        assert len(third["recommendations"]) == 5 and third["next_cursor"] is None
+        assert calls == [(20, 20 * api.RESULT_WINDOW_PAGES)]  # one ranking pass for all pages
+        assert first["partial"] and second["partial"] and third["partial"]
+
+        assert client.post("/recommend", json={"cursor": "not-a-cursor"}).status_code == 410
+        expired = encode_cursor("missing", 20)
+        assert client.post("/recommend", json={"cursor": expired}).status_code == 410
+
+
+def test_window_does_not_grow_the_fetch(monkeypatch):
+    import numpy as np
+    import core
+
+    fetched = []
+
+    def fake_fetch(language, per_page, top_n, experience_level, deadline=None):
+        fetched.append(per_page)
+        return [{"title": f"issue {i}", "body": "", "url": f"u{i}", "repo": "o/r", "labels": []} for i in range(per_page)]
+
+    monkeypatch.setattr(core, "create_embedding_model", lambda name="": None)
+    monkeypatch.setattr(core, "analyze_student_profile", lambda *args: {
+        "embedding": np.ones(2), "language": "python", "experience_level": "beginner"})
+    monkeypatch.setattr(core.cohort_registry, "get", lambda *args: None)
+    monkeypatch.setattr(core, "ISSUE_INDEX_ENABLED", False)
+    monkeypatch.setattr(core, "fetch_github_issues", fake_fetch)
+    monkeypatch.setattr(core, "embed_issues_within_deadline",
+                        lambda issues, model, name, deadline: (issues, np.ones((len(issues), 2))))
+
+    results = core.recommend_issues(per_page=20, window=100, student_profile="python", rerank=False)
+    assert fetched == [20] and len(results) == 20
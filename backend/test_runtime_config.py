@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the CPU thread budget:
+1. Cores are divided across workers x concurrent requests
+2. configure_runtime() sets BLAS/tokenizer env vars and torch threads
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from runtime_config import _worker_cores, parse_core_list, thread_budget
+
+PROBE = """
+import json, os
+from runtime_config import configure_runtime, configure_torch
+settings = configure_runtime(workers=2, concurrency=2, intra_threads=0)
+import torch
+configure_torch()
+print(json.dumps({"settings": settings, "omp": os.environ.get("OMP_NUM_THREADS"),
+                  "tokenizers": os.environ.get("TOKENIZERS_PARALLELISM"),
+                  "torch_threads": torch.get_num_threads()}))
+"""
+
+
+def test_thread_budget():
+    assert thread_budget(32, workers=2, concurrency=4) == 4
+    assert thread_budget(4, workers=4, concurrency=4) == 1
+    assert parse_core_list("0-3, 8,10-11") == [0, 1, 2, 3, 8, 10, 11]
+
+
+def test_auto_affinity_needs_worker_index(monkeypatch):
+    """Without WORKER_INDEX a worker is not pinned, so two workers never share a slice by accident."""
+    monkeypatch.delenv("WORKER_INDEX", raising=False)
+    assert _worker_cores(list(range(8)), workers=2) is None
+    monkeypatch.setenv("WORKER_INDEX", "1")
+    assert _worker_cores(list(range(8)), workers=2) == [4, 5, 6, 7]
+
+
+def test_configure_runtime_applies_budget():
+    """The budget reaches the environment and torch in a fresh process."""
+    env = {k: v for k, v in os.environ.items() if k not in ("OMP_NUM_THREADS", "TOKENIZERS_PARALLELISM")}
+    # Shadow scoring adds a background thread to the budget
+    env["SHADOW_SAMPLE_RATE"] = "0.5"
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=os.path.dirname(os.path.abspath(__file__)),
+                         env=env, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    threads = result["settings"]["intra_op_threads"]
+    assert result["settings"]["background_jobs"] == 1
+    assert threads == thread_budget(result["settings"]["cores"], workers=2, concurrency=3)
+    assert result["omp"] == str(threads)
+    assert result["tokenizers"] == "false"
+    assert result["torch_threads"] == threads
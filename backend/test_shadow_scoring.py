@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for shadow scoring:
+1. Kendall tau / top-k overlap on known rankings
+2. Sampled requests are scored by both models in the background; the served
+   results are untouched and jobs beyond capacity are dropped
+"""
+
+import threading
+
+import numpy as np
+
+from shadow_scoring import ShadowScorer, kendall_tau, top_k_overlap
+
+
+class FakeModel:
+    """Embeds text as (occurrences of word, 1): the fewer occurrences, the closer to a word-free profile."""
+
+    def __init__(self, word="rust", gate=None):
+        self.word = word
+        self.gate = gate
+
+    def encode(self, texts, show_progress_bar=False):
+        if self.gate is not None:
+            self.gate.wait(5)
+        return np.array([(t.count(self.word), 1) for t in texts], dtype=np.float32)
+
+
+def _results():
+    return [
+        {"title": "rust rust rust", "url": "a", "similarity": 0.9},
+        {"title": "rust rust go", "url": "b", "similarity": 0.8},
+        {"title": "rust go go", "url": "c", "similarity": 0.5},
+    ]
+
+
+def test_rank_agreement():
+    assert kendall_tau(["a", "b", "c"], ["a", "b", "c"]) == 1.0
+    assert kendall_tau(["a", "b", "c"], ["c", "b", "a"]) == -1.0
+    assert abs(kendall_tau(["a", "b", "c"], ["b", "a", "c"]) - 1 / 3) < 1e-9
+    assert top_k_overlap(["a", "b", "c"], ["b", "c", "a"], 2) == 0.5
+
+
+def test_shadow_job_records_latency_and_agreement():
+    models = {"primary": FakeModel("go"), "candidate": FakeModel("rust")}
+    scorer = ShadowScorer(models.__getitem__, sample_rate=1.0, max_pending=2)
+    results = _results()
+
+    assert scorer.maybe_submit("profile", results, "primary", "candidate")
+    scorer._executor.shutdown(wait=True)
+
+    stats = scorer.snapshot()
+    assert stats["completed"] == 1 and stats["errors"] == 0
+    assert set(stats["latency_ms"]) == {"primary", "candidate"}
+    # The candidate prefers issues with fewer "rust" mentions, the reverse of the served order
+    assert stats["agreement"]["primary -> candidate"]["kendall_tau"] == -1.0
+    assert [r["url"] for r in results] == ["a", "b", "c"]
+
+
+def test_agreement_is_measured_against_the_served_order():
+    """Reranking or diversity can serve results out of similarity order; that order is the baseline."""
+    models = {"primary": FakeModel("go"), "candidate": FakeModel("rust")}
+    scorer = ShadowScorer(models.__getitem__, sample_rate=1.0)
+    results = _results()
+    served = [results[2], results[0], results[1]]
+
+    assert scorer.maybe_submit("profile", served, "primary", "candidate")
+    scorer._executor.shutdown(wait=True)
+    assert abs(scorer.snapshot()["agreement"]["primary -> candidate"]["kendall_tau"] - 1 / 3) < 1e-4
+
+
+def test_unsampled_and_over_capacity_requests_are_skipped():
+    assert not ShadowScorer(lambda name: FakeModel(), sample_rate=0.0).maybe_submit(
+        "profile", _results(), "primary", "candidate")
+    assert not ShadowScorer(lambda name: FakeModel(), sample_rate=1.0).maybe_submit(
+        "profile", _results(), "primary", "primary")
+
+    gate = threading.Event()
+    scorer = ShadowScorer(lambda name: FakeModel(gate=gate), sample_rate=1.0, max_pending=1)
+    assert scorer.maybe_submit("profile", _results(), "primary", "candidate")
+    assert not scorer.maybe_submit("profile", _results(), "primary", "candidate")
+    gate.set()
+    scorer._executor.shutdown(wait=True)
+    assert scorer.snapshot()["dropped"] == 1
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for the backend entry points:
+importing core, api and main must stay fast and must not pull in
+torch, transformers, sentence_transformers or sklearn, or open the disk cache.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+IMPORT_BUDGET_SECONDS = 2.0
+HEAVY_MODULES = ["torch", "transformers", "sentence_transformers", "sklearn"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import core, api, main
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "heavy": [m for m in %r if m in sys.modules],
+    "cache_opened": core.cache._cache is not None,
+}))
+""" % HEAVY_MODULES
+
+
+def _probe() -> dict:
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=backend_dir,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_import_is_lazy_and_fast():
+    """Heavy ML libraries and the disk cache are deferred until first use."""
+    result = _probe()
+    print(f"Import time: {result['elapsed']:.3f}s")
+    assert result["heavy"] == []
+    assert not result["cache_opened"]
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for startup warm-up:
+1. Readiness waits for every step, and only required steps can keep it red
+2. /ready reports progress with 503 until the lifespan warm-up has finished
+"""
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+import api
+from warmup import WarmUp, parse_prefetch
+
+
+def _fail():
+    raise RuntimeError("download failed")
+
+
+def test_optional_failures_do_not_block_readiness():
+    warmup = WarmUp([("model", lambda: None, True), ("prefetch:go/any", _fail, False)])
+    assert not warmup.ready and warmup.snapshot()["progress"] == "0/2"
+    warmup.run()
+    assert warmup.ready
+    assert warmup.snapshot()["steps"]["prefetch:go/any"]["status"] == "failed"
+
+    broken = WarmUp([("model", _fail, True), ("cohorts", lambda: {"loaded": 0}, False)])
+    broken.run()
+    assert not broken.ready
+    assert broken.snapshot()["steps"]["cohorts"]["detail"] == {"loaded": 0}
+
+
+def test_parse_prefetch():
+    assert parse_prefetch(" Python:beginner, go ,") == [("python", "beginner"), ("go", "any")]
+
+
+def test_ready_endpoint_goes_green_after_warmup(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(api, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(api, "default_steps", lambda: [("model", release.wait, True)])
+
+    with TestClient(api.app) as client:
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["steps"]["model"]["status"] in ("pending", "running")
+        assert client.get("/health").status_code == 200
+
+        release.set()
+        for _ in range(100):
+            response = client.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.01)
+        assert response.status_code == 200 and response.json()["progress"] == "1/1"
@@ -0,0 +1,141 @@
+"""
+Startup warm-up and readiness for the API.
+
+Without a warm-up, the first /recommend after a deploy pays for opening the
+disk cache, loading the embedding model and the experience classifier and
+building the level reference embeddings. The API lifespan starts a WarmUp in a
+background thread: it runs each step once (models, reference matrices, cohort
+artifacts and, optionally, prefetching hot issue corpora) and records its
+progress. GET /ready reports that progress and only returns 200 once every
+required step has succeeded, so a rolling deploy only routes traffic to warm
+instances. GET /health keeps answering as a liveness check throughout.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+WARMUP_MODELS = [name.strip() for name in os.getenv("WARMUP_MODELS", "all-MiniLM-L6-v2").split(",") if name.strip()]
+# Hot corpora fetched and embedded at startup, e.g. "python:beginner,javascript:any"
+WARMUP_PREFETCH = os.getenv("WARMUP_PREFETCH", "")
+WARMUP_PREFETCH_TOP_N = int(os.getenv("WARMUP_PREFETCH_TOP_N", "100"))
+
+Step = Tuple[str, Callable[[], object], bool]  # (name, action, required for readiness)
+
+
+class WarmUp:
+    """Runs warm-up steps in order and tracks which have finished."""
+
+    def __init__(self, steps: Optional[List[Step]] = None):
+        self.steps = steps if steps is not None else []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.status: Dict[str, Dict] = {name: {"status": "pending"} for name, _, _ in self.steps}
+
+    def start(self) -> None:
+        """Run the steps in a background thread (once), so the server can report progress meanwhile."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def run(self) -> None:
+        self.started_at = time.time()
+        for name, action, required in self.steps:
+            self.status[name] = {"status": "running"}
+            start = time.perf_counter()
+            try:
+                detail = action()
+                self.status[name] = {"status": "done", "seconds": round(time.perf_counter() - start, 3)}
+                if detail is not None:
+                    self.status[name]["detail"] = detail
+                print(f"✅ Warm-up: {name} ({self.status[name]['seconds']}s)")
+            except Exception as e:
+                self.status[name] = {"status": "failed", "error": str(e), "required": required}
+                print(f"⚠️ Warm-up step {name} failed: {e}")
+        self.finished_at = time.time()
+
+    @property
+    def ready(self) -> bool:
+        """True once every step has run and no required step failed."""
+        if self.finished_at is None:
+            return False
+        return not any(state.get("required") for state in self.status.values() if state["status"] == "failed")
+
+    def snapshot(self) -> Dict:
+        done = sum(1 for state in self.status.values() if state["status"] in ("done", "failed"))
+        return {
+            "ready": self.ready,
+            "progress": f"{done}/{len(self.steps)}",
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": dict(self.status),
+        }
+
+
+def parse_prefetch(spec: str) -> List[Tuple[str, str]]:
+    """Parse "python:beginner,go" into [("python", "beginner"), ("go", "any")]."""
+    corpora = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        language, _, level = part.partition(":")
+        corpora.append((language.strip().lower(), level.strip() or "any"))
+    return corpora
+
+
+def default_steps() -> List[Step]:
+    """Warm-up steps for the configured models and corpora."""
+    import core
+    from phi_predictor import get_phi_model
+    from result_windows import RESULT_WINDOW_PAGES
+    from shadow_scoring import SHADOW_MODEL, SHADOW_SAMPLE_RATE
+
+    def open_cache():
+        core.cache.get("warmup")
+
+    def load_model(name: str):
+        def action():
+            model = core.create_embedding_model(name)
+            # One encode initializes the runtime; scoring it builds and caches the level reference matrices
+            embedding = model.encode("warm-up", show_progress_bar=False)
+            core.experience_level_scores(embedding, model, name)
+        return action
+
+    def load_classifier():
+        get_phi_model()
+
+    def load_shadow_model():
+        core.create_embedding_model(SHADOW_MODEL)
+
+    def prefetch(language: str, level: str):
+        def action():
+            issues = core.fetch_github_issues(language, 20 * RESULT_WINDOW_PAGES, WARMUP_PREFETCH_TOP_N, level)
+            if not issues:
+                return {"issues": 0}
+            # The serving model is listed first
+            model_name = WARMUP_MODELS[0] if WARMUP_MODELS else "all-MiniLM-L6-v2"
+            embeddings = core.get_or_create_issue_embeddings(issues, core.create_embedding_model(model_name), model_name)
+            if core.ISSUE_INDEX_ENABLED:
+                core.issue_index.add_embeddings(model_name, issues, embeddings)
+            return {"issues": len(issues)}
+        return action
+
+    steps: List[Step] = [("disk_cache", open_cache, True)]
+    steps += [(f"model:{name}", load_model(name), True) for name in WARMUP_MODELS]
+    # /recommend detects the experience level with the classifier
+    steps.append(("classifier", load_classifier, True))
+    if core.RERANK_ENABLED:
+        steps.append((f"reranker:{core.reranker.model_name}", core.reranker.load, True))
+    if SHADOW_MODEL and SHADOW_SAMPLE_RATE > 0:
+        steps.append((f"shadow_model:{SHADOW_MODEL}", load_shadow_model, False))
+    steps.append(("cohorts", lambda: {"loaded": core.cohort_registry.load_all()}, False))
+    steps += [(f"prefetch:{language}/{level}", prefetch(language, level), False)
+              for language, level in parse_prefetch(WARMUP_PREFETCH)]
+    return steps
@@ -4,33 +4,54 @@ import './App.css'
 function App() {
   const [profileDescription, setProfileDescription] = useState('');
   const [response, setResponse] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  // Only the fields rendered below, so issue bodies are not sent
+  const fields = ['title', 'repo', 'url', 'similarity'];
+
+  const fetchRecommendations = async (body) => {
+    const res = await fetch('http://localhost:8001/recommend', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(body)
+    });
+
+    if (!res.ok) {
+      throw new Error(`HTTP error! status: ${res.status}`);
+    }
+
+    return res.json();
+  }
 
   const handleSubmit = async () => {
     try {
-      const res = await fetch('http://localhost:8001/recommend', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          student_profile: profileDescription,
-          per_page: 20,
-          top_n: 100,
-        })
+      const data = await fetchRecommendations({
+        student_profile: profileDescription,
+        per_page: 20,
+        top_n: 100,
+        fields,
       });
-      
-      if (!res.ok) {
-        throw new Error(`HTTP error! status: ${res.status}`);
-      }
-      
-      const data = await res.json();
       setResponse(data.recommendations);
+      setNextCursor(data.next_cursor);
     } catch (error) {
       console.error('Error fetching recommendations:', error);
       alert('Failed to fetch recommendations: ' + error.message);
     }
   }
 
+  // Later pages are served from the ranking cached by the first request
+  const handleLoadMore = async () => {
+    try {
+      const data = await fetchRecommendations({ cursor: nextCursor, per_page: 20, fields });
+      setResponse((previous) => [...previous, ...data.recommendations]);
+      setNextCursor(data.next_cursor);
+    } catch (error) {
+      console.error('Error loading more recommendations:', error);
+      alert('Failed to load more recommendations: ' + error.message);
+    }
+  }
+
   return (
     <>
       <div>
@@ -55,6 +76,7 @@ function App() {
             </div>
           ))}
         </div>
+        {nextCursor && <button onClick={handleLoadMore}>Load more</button>}
       </div>
     </>
   )